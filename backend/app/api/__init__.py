@@ -1,4 +1,4 @@
 """API module"""
-from app.api.dependencies import get_current_user, get_db
+from app.api.dependencies import get_current_admin, get_current_user, get_db, get_async_db
 
-__all__ = ["get_current_user", "get_db"]
+__all__ = ["get_current_admin", "get_current_user", "get_db", "get_async_db"]
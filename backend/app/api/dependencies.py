@@ -1,9 +1,12 @@
 """API dependency functions"""
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import SessionLocal
+from app.core.database import SessionLocal, get_async_session_factory
+from app.core.exceptions import ForbiddenException
 from app.core.security import decode_token
+from app.models.user import UserRole
 from typing import Optional
 
 security = HTTPBearer()
@@ -18,8 +21,18 @@ def get_db() -> Session:
         db.close()
 
 
-def get_current_user(credentials: Optional[dict] = Depends(security)) -> dict:
-    """Get current authenticated user"""
+async def get_async_db() -> AsyncSession:
+    """Get async database session"""
+    async with get_async_session_factory()() as db:
+        yield db
+
+
+async def get_current_user(credentials: Optional[dict] = Depends(security)) -> dict:
+    """Get current authenticated user
+
+    Declared async because it never blocks: token checks then run on the
+    event loop instead of taking a threadpool thread per request.
+    """
     if not credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -45,3 +58,10 @@ def get_current_user(credentials: Optional[dict] = Depends(security)) -> dict:
         )
 
     return payload
+
+
+async def get_current_admin(current_user: dict = Depends(get_current_user)) -> dict:
+    """Get current authenticated user, who must be an admin"""
+    if current_user.get("role") != UserRole.ADMIN.value:
+        raise ForbiddenException("Admin access required")
+    return current_user
@@ -1,2 +1,2 @@
 """V1 API routes"""
-__all__ = ["auth", "users", "products", "categories", "customers", "orders", "inventory", "payment", "reports"]
+__all__ = ["auth", "users", "products", "categories", "customers", "orders", "inventory", "payment", "reports", "catalog", "admin"]
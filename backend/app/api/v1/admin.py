@@ -0,0 +1,49 @@
+"""Admin API routes"""
+import os
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import FileResponse
+from app.api.dependencies import get_current_admin
+from app.core.exceptions import NotFoundException
+from app.core.profiler import get_profile_sampling, get_profile_store
+from app.schemas import ProfileSamplingUpdate
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+PROFILE_MEDIA_TYPES = {"speedscope": "application/json", "collapsed": "text/plain"}
+
+
+@router.get("/profiles")
+def list_profiles(current_user: dict = Depends(get_current_admin)):
+    """List recent request profiles, newest first"""
+    return get_profile_store().list()
+
+
+@router.get("/profiles/sampling")
+def get_profile_sampling_rates(current_user: dict = Depends(get_current_admin)):
+    """Get the per-route profiling sample rates in percent"""
+    return get_profile_sampling().rates
+
+
+@router.put("/profiles/sampling")
+def set_profile_sampling_rate(
+    update: ProfileSamplingUpdate,
+    current_user: dict = Depends(get_current_admin),
+):
+    """Profile a share of a route's requests; 0 percent stops sampling it"""
+    sampling = get_profile_sampling()
+    sampling.set(update.route, update.percent)
+    return sampling.rates
+
+
+@router.get("/profiles/{profile_id}")
+def download_profile(
+    profile_id: str,
+    format: str = Query("speedscope", pattern="^(speedscope|collapsed)$"),
+    current_user: dict = Depends(get_current_admin),
+):
+    """Download a profile as speedscope JSON or collapsed stacks"""
+    store = get_profile_store()
+    path = store.path(profile_id, format) if store.get(profile_id) else None
+    if path is None or not os.path.exists(path):
+        raise NotFoundException("Profile not found")
+    return FileResponse(path, media_type=PROFILE_MEDIA_TYPES[format], filename=os.path.basename(path))
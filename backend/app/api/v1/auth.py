@@ -35,7 +35,8 @@ def login(credentials: LoginRequest, db: Session = Depends(get_db)):
         )
 
     # Create tokens
-    access_token = create_access_token(data={"sub": str(user.id), "username": user.username})
+    role = user.role.value if hasattr(user.role, "value") else user.role
+    access_token = create_access_token(data={"sub": str(user.id), "username": user.username, "role": role})
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
 
     return {
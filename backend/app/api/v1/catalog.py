@@ -0,0 +1,34 @@
+"""Catalog sync API routes"""
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.orm import Session
+from app.api.dependencies import get_db
+from app.core.catalog import get_catalog_version
+from app.services import CatalogService
+
+router = APIRouter(prefix="/catalog", tags=["Catalog"])
+
+
+@router.get("/version")
+def get_version(db: Session = Depends(get_db)):
+    """Get the current catalog version"""
+    return {"version": get_catalog_version(db)}
+
+
+@router.get("/snapshot")
+def get_snapshot(request: Request, db: Session = Depends(get_db)):
+    """Get every product and category, gzipped when the client accepts it"""
+    snapshot = CatalogService.get_snapshot(db)
+    headers = {"X-Catalog-Version": str(snapshot.version), "Vary": "Accept-Encoding"}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=snapshot.gzipped, media_type="application/json", headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+@router.get("/changes")
+def get_changes(
+    since: int = Query(..., ge=0),
+    db: Session = Depends(get_db),
+):
+    """Get catalog rows written or deleted after version ``since``"""
+    return CatalogService.get_changes(db, since)
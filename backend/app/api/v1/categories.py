@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 from app.api.dependencies import get_db
 from app.services import CategoryService
+from app.utils.etag import etag_matches, make_etag, not_modified
 
 router = APIRouter(tags=["categories"], prefix="/categories")
 
@@ -19,8 +20,19 @@ def category_to_dict(category):
 
 # ----------------- GET categories -----------------
 @router.get("/")
-def list_categories(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def list_categories(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+):
     """List all categories with pagination"""
+    etag = make_etag("categories", CategoryService.get_list_version(db), skip, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
     categories, total = CategoryService.list_categories(db, skip, limit)
     
     return {
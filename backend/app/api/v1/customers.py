@@ -1,8 +1,8 @@
 """Customers API routes"""
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_current_user, get_db
@@ -30,11 +30,33 @@ def create_customer(
 @router.get("/", response_model=Dict[str, Any])
 def list_customers(
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
     is_active: bool = True,
+    cursor: Optional[str] = None,
+    keyset: bool = False,
+    include_total: bool = False,
     db: Session = Depends(get_db),
 ):
-    """List all customers with pagination"""
+    """List all customers with pagination
+
+    Pass ``keyset=true`` (or a ``cursor`` from a previous page) to page by
+    cursor at constant cost; the total is then only counted on request.
+    """
+    if keyset or cursor:
+        customers, next_cursor, total = CustomerService.list_customers_keyset(
+            db=db,
+            limit=limit,
+            cursor=cursor,
+            is_active=is_active,
+            include_total=include_total,
+        )
+        return {
+            "total": total,
+            "limit": limit,
+            "next_cursor": next_cursor,
+            "data": [CustomerResponse.model_validate(c) for c in customers],
+        }
+
     customers, total = CustomerService.list_customers(
         db=db,
         skip=skip,
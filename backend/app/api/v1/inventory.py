@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+import csv
+import io
+import json
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.schemas.inventory import InventoryLogCreate, InventoryLogResponse
-from app.services.inventory_service import InventoryService
+from app.services.inventory_service import InventoryService, LOG_EXPORT_COLUMNS
 
 
 router = APIRouter(prefix="/inventory", tags=["Inventory"])
@@ -31,12 +36,90 @@ def create_inventory_log(
 
 
 # -------- GET ALL LOGS --------
-@router.get("/logs", response_model=List[InventoryLogResponse])
+@router.get("/logs")
 def list_inventory_logs(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    product_id: Optional[int] = None,
+    action: Optional[str] = None,
+    user_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
-    return InventoryService.get_all_logs(db)
+    try:
+        logs, next_cursor = InventoryService.get_all_logs(
+            db, limit, cursor, product_id, action, user_id, start_date, end_date
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "data": [InventoryLogResponse.model_validate(log) for log in logs],
+    }
+
+
+# -------- EXPORT LOGS (STREAMING) --------
+@router.get("/logs/export")
+def export_inventory_logs(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    product_id: Optional[int] = None,
+    action: Optional[str] = None,
+    user_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    # Validate filters up front so errors surface before streaming starts
+    try:
+        rows = InventoryService.iter_logs(db, product_id, action, user_id, start_date, end_date)
+        first = next(rows, None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def all_rows():
+        if first is not None:
+            yield first
+            yield from rows
+
+    if format == "csv":
+        return StreamingResponse(
+            _csv_lines(all_rows()),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=inventory_logs.csv"},
+        )
+    return StreamingResponse(_ndjson_lines(all_rows()), media_type="application/x-ndjson")
+
+
+def _ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, default=_json_default) + "\n"
+
+
+def _csv_lines(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.key for column in LOG_EXPORT_COLUMNS])
+    for count, row in enumerate(rows, 1):
+        writer.writerow(
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in row.values()
+        )
+        # Flush in chunks rather than per row
+        if count % 500 == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
 
 
 # -------- GET ONE LOG BY ID --------
@@ -53,13 +136,28 @@ def get_inventory_log(
 
 
 # -------- GET PRODUCT INVENTORY HISTORY --------
-@router.get("/product/{product_id}/history", response_model=List[InventoryLogResponse])
+@router.get("/product/{product_id}/history")
 def get_product_inventory_history(
     product_id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    action: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
-    return InventoryService.get_product_history(db, product_id)
+    try:
+        logs, next_cursor = InventoryService.get_product_history(
+            db, product_id, limit, cursor, action, start_date, end_date
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "data": [InventoryLogResponse.model_validate(log) for log in logs],
+    }
 
 
 # -------- INVENTORY SUMMARY --------
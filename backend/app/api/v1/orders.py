@@ -1,35 +1,73 @@
 """Orders API routes"""
+from datetime import date, datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.api.dependencies import get_current_user, get_db
-from app.services import OrderService
-from app.schemas import OrderCreate, OrderUpdate, OrderResponse
+from app.api.dependencies import get_async_db, get_current_user, get_db
+from app.models import OrderStatus
+from app.services import OrderService, InvoiceService
+from app.schemas import OrderCreate, OrderUpdate, OrderResponse, OrderBatchCreate, OrderBatchResponse
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
 
 @router.post("/", response_model=OrderResponse)
-def create_order(
+async def create_order(
     order_create: OrderCreate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Create a new order"""
-    order = OrderService.create_order(db, order_create, int(current_user["sub"]))
+    order = await OrderService.create_order_async(db, order_create, int(current_user["sub"]))
     return OrderResponse.from_orm(order)  # Convert to Pydantic schema
 
 
+@router.post("/batch", response_model=OrderBatchResponse)
+def create_orders_batch(
+    batch: OrderBatchCreate,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Create many orders at once, e.g. when a terminal replays its offline queue"""
+    results = OrderService.create_orders_batch(db, batch.orders, int(current_user["sub"]))
+    created = sum(1 for result in results if result["success"])
+    return {
+        "created": created,
+        "failed": len(results) - created,
+        "results": results,
+    }
+
+
 @router.get("/", response_model=dict)
-def list_orders(
+async def list_orders(
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
     status: Optional[str] = None,
     customer_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    keyset: bool = False,
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """List all orders"""
-    orders, total = OrderService.list_orders(db, skip, limit, status, customer_id)
+    """List all orders
+
+    Pass ``keyset=true`` (or a ``cursor`` from a previous page) to page by
+    cursor at constant cost; the total is then only counted on request.
+    """
+    if keyset or cursor:
+        orders, next_cursor, total = await OrderService.list_orders_keyset_async(
+            db, limit, cursor, status, customer_id, include_total
+        )
+        return {
+            "total": total,
+            "limit": limit,
+            "next_cursor": next_cursor,
+            "data": [OrderResponse.from_orm(order) for order in orders],
+        }
+
+    orders, total = await OrderService.list_orders_async(db, skip, limit, status, customer_id)
     # Convert each order to Pydantic schema
     return {
         "total": total,
@@ -40,14 +78,42 @@ def list_orders(
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
-def get_order(order_id: int, db: Session = Depends(get_db)):
+async def get_order(order_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get order by ID"""
-    order = OrderService.get_order_by_id(db, order_id)
+    order = await OrderService.get_order_by_id_async(db, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     return OrderResponse.from_orm(order)
 
 
+@router.get("/invoices/export")
+def export_invoices(
+    day: Optional[date] = None,
+    status: Optional[OrderStatus] = None,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Stream a ZIP of the invoices for every order of a day (default today, UTC)"""
+    day = day or datetime.utcnow().date()
+    start, end = InvoiceService.day_range(day)
+    return StreamingResponse(
+        InvoiceService.iter_invoice_zip(db, start, end, status),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="invoices-{day.isoformat()}.zip"'},
+    )
+
+
+@router.get("/{order_id}/invoice")
+def get_order_invoice(order_id: int, db: Session = Depends(get_db)):
+    """Render an order's invoice as PDF"""
+    pdf = InvoiceService.render_order_invoice(db, order_id)
+    return Response(
+        content=pdf,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'inline; filename="invoice-{order_id}.pdf"'},
+    )
+
+
 @router.put("/{order_id}", response_model=OrderResponse)
 def update_order(
     order_id: int,
@@ -75,9 +141,9 @@ def cancel_order(
 
 
 @router.get("/number/{order_number}", response_model=OrderResponse)
-def get_order_by_number(order_number: str, db: Session = Depends(get_db)):
+async def get_order_by_number(order_number: str, db: AsyncSession = Depends(get_async_db)):
     """Get order by order number"""
-    order = OrderService.get_order_by_number(db, order_number)
+    order = await OrderService.get_order_by_number_async(db, order_number)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     return OrderResponse.from_orm(order)
@@ -1,7 +1,8 @@
 """Payments API routes"""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.api.dependencies import get_current_user, get_db
+from app.api.dependencies import get_async_db, get_current_user, get_db
 from app.services import PaymentService
 from app.schemas import PaymentCreate, PaymentUpdate, PaymentResponse
 
@@ -9,38 +10,56 @@ router = APIRouter(prefix="/payments", tags=["Payments"])
 
 
 @router.post("/", response_model=PaymentResponse)
-def create_payment(
+async def create_payment(
     payment_create: PaymentCreate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Create a new payment"""
-    payment = PaymentService.create_payment(db, payment_create)
+    payment = await PaymentService.create_payment_async(db, payment_create)
     return payment
 
 
 @router.get("/", response_model=dict)
-def list_payments(
+async def list_payments(
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
     order_id: int = None,
     status: str = None,
-    db: Session = Depends(get_db),
+    cursor: str = None,
+    keyset: bool = False,
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """List all payments"""
-    payments, total = PaymentService.list_payments(db, skip, limit, order_id, status)
+    """List all payments
+
+    Pass ``keyset=true`` (or a ``cursor`` from a previous page) to page by
+    cursor at constant cost; the total is then only counted on request.
+    """
+    if keyset or cursor:
+        payments, next_cursor, total = await PaymentService.list_payments_keyset_async(
+            db, limit, cursor, order_id, status, include_total
+        )
+        return {
+            "total": total,
+            "limit": limit,
+            "next_cursor": next_cursor,
+            "data": [PaymentResponse.model_validate(p) for p in payments],
+        }
+
+    payments, total = await PaymentService.list_payments_async(db, skip, limit, order_id, status)
     return {
         "total": total,
         "skip": skip,
         "limit": limit,
-        "data": payments,
+        "data": [PaymentResponse.model_validate(p) for p in payments],
     }
 
 
 @router.get("/{payment_id}", response_model=PaymentResponse)
-def get_payment(payment_id: int, db: Session = Depends(get_db)):
+async def get_payment(payment_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get payment by ID"""
-    payment = PaymentService.get_payment_by_id(db, payment_id)
+    payment = await PaymentService.get_payment_by_id_async(db, payment_id)
     if not payment:
         raise HTTPException(status_code=404, detail="Payment not found")
     return payment
@@ -1,12 +1,19 @@
 """Products and Categories API routes"""
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.api.dependencies import get_current_user, get_db
-from app.services import ProductService, CategoryService
+from app.api.dependencies import get_async_db, get_current_user, get_db
+from app.core.catalog import get_catalog_cache
+from app.utils.etag import etag_matches, make_etag, not_modified
+from app.services import ProductService, CategoryService, ProductImportService, LabelService
 from app.schemas import (
     ProductCreate,
     ProductUpdate,
     ProductResponse,
+    ProductBulkUpdate,
+    LabelSheetRequest,
     CategoryCreate,
     CategoryUpdate,
     CategoryResponse,
@@ -54,6 +61,35 @@ def product_to_dict(product, include_category=True):
     return result
 
 
+def _encode(payload) -> bytes:
+    """Serialize a payload exactly as FastAPI's JSONResponse would"""
+    return json.dumps(
+        payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def cached_product_response(request: Request, db: Session, kind: str, key, lookup) -> Response:
+    """Serve a single product from the catalog cache, loading it with ``lookup`` on a miss"""
+    def load():
+        product = lookup(db, key)
+        if not product:
+            return None
+        return product, _encode(product_to_dict(product))
+
+    cached = get_catalog_cache().get_or_load(db, kind, key, load)
+    if cached is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    payload, etag = cached
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(content=payload, media_type="application/json", headers={"ETag": etag})
+
+
+async def cached_product_response_async(request: Request, db: AsyncSession, kind: str, key, lookup) -> Response:
+    """Async variant of cached_product_response; cache checks and loads run on the session's sync side"""
+    return await db.run_sync(lambda session: cached_product_response(request, session, kind, key, lookup))
+
+
 # ============= Category Routes =============
 @router.post("/categories")
 def create_category(
@@ -68,11 +104,18 @@ def create_category(
 
 @router.get("/categories")
 def list_categories(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
 ):
     """List all categories"""
+    etag = make_etag("categories", CategoryService.get_list_version(db), skip, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
     categories, total = CategoryService.list_categories(db, skip, limit)
     return {
         "total": total,
@@ -83,11 +126,21 @@ def list_categories(
 
 
 @router.get("/categories/{category_id}")
-def get_category(category_id: int, db: Session = Depends(get_db)):
+def get_category(
+    category_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
     """Get category by ID"""
+    etag = make_etag("category", category_id, CategoryService.get_list_version(db))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     category = CategoryService.get_category_by_id(db, category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
+    response.headers["ETag"] = etag
     return category_to_dict(category)
 
 
@@ -126,8 +179,54 @@ def create_product(
     return product_to_dict(product)
 
 
+@router.post("/products/import")
+def import_products(
+    file: UploadFile = File(...),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Import products from a CSV or XLSX file, upserting by SKU"""
+    rows = ProductImportService.iter_rows(file.file, file.filename)
+    return ProductImportService.import_products(db, rows, int(current_user["sub"]))
+
+
+@router.post("/products/bulk-update")
+def bulk_update_products(
+    bulk_update: ProductBulkUpdate,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Reprice or update every product matching a filter in one statement"""
+    return ProductService.bulk_update_products(db, bulk_update)
+
+
+@router.post("/products/labels")
+def render_labels(
+    label_request: LabelSheetRequest,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Render a barcode label sheet as PDF or PNG and stream it back"""
+    items = LabelService.get_label_items(
+        db, label_request.product_ids, label_request.skus, label_request.category_id
+    )
+    # Release the connection before rendering; the sheet does not need it
+    db.close()
+    sheet = LabelService.render_sheet(
+        items, label_request.format, label_request.barcode_format, label_request.copies
+    )
+    media_type = "application/pdf" if label_request.format == "pdf" else "image/png"
+    return StreamingResponse(
+        LabelService.iter_file(sheet),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="labels.{label_request.format}"'},
+    )
+
+
 @router.get("/products")
 def list_products(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     category_id: int = None,
@@ -135,6 +234,11 @@ def list_products(
     db: Session = Depends(get_db),
 ):
     """List all products"""
+    etag = make_etag("products", ProductService.get_list_version(db), skip, limit, category_id, is_active)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
     products, total = ProductService.list_products(db, skip, limit, category_id, is_active)
     return {
         "total": total,
@@ -155,22 +259,40 @@ def get_low_stock_products(
 
 
 @router.get("/products/search")
-def search_products(
+async def search_products(
     q: str,
-    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Search products by name, SKU, or barcode"""
-    products = ProductService.search_products(db, q)
+    products = await ProductService.search_products_async(db, q, limit)
     return [product_to_dict(p, include_category=False) for p in products]
 
 
+@router.get("/products/cache-stats")
+def get_catalog_cache_stats(
+    current_user: dict = Depends(get_current_user),
+):
+    """Get catalog lookup cache counters"""
+    return get_catalog_cache().stats()
+
+
+@router.get("/products/barcode/{barcode}")
+async def get_product_by_barcode(barcode: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Get product by barcode (scan lookup)"""
+    return await cached_product_response_async(request, db, "barcode", barcode, ProductService.get_product_by_barcode)
+
+
+@router.get("/products/sku/{sku}")
+async def get_product_by_sku(sku: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Get product by SKU"""
+    return await cached_product_response_async(request, db, "sku", sku, ProductService.get_product_by_sku)
+
+
 @router.get("/products/{product_id}")
-def get_product(product_id: int, db: Session = Depends(get_db)):
+async def get_product(product_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get product by ID"""
-    product = ProductService.get_product_by_id(db, product_id)
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
-    return product_to_dict(product)
+    return await cached_product_response_async(request, db, "id", product_id, ProductService.get_product_by_id)
 
 
 @router.put("/products/{product_id}")
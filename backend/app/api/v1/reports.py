@@ -1,79 +1,106 @@
 """Reports API routes"""
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
-from app.api.dependencies import get_current_user, get_db
+from app.api.dependencies import get_current_user, get_async_db
 from app.services import ReportService
+from app.core.cache import get_report_cache
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
 
 @router.get("/sales")
-def get_sales_report(
+async def get_sales_report(
     days: int = 30,
     group_by: str = "day",
+    rollup: bool = True,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Get sales report"""
-    start_date = datetime.utcnow() - timedelta(days=days)
-    end_date = datetime.utcnow()
-    sales = ReportService.get_sales_report(db, start_date, end_date, group_by)
+    """Get sales report
+
+    Reads whole days from the sales_daily rollup by default; pass
+    ``rollup=false`` to aggregate the orders table over the same days.
+    """
+    # Whole-day bounds keep the report cache key stable between requests;
+    # writes invalidate the cache, so the end of today covers new orders
+    today = datetime.utcnow().date()
+    start_date = datetime.combine(today - timedelta(days=days), datetime.min.time())
+    end_date = datetime.combine(today, datetime.max.time())
+    if rollup:
+        sales = await ReportService.get_sales_report_from_rollup_async(
+            db, start_date.date(), end_date.date(), group_by
+        )
+    else:
+        sales = await ReportService.get_sales_report_async(db, start_date, end_date, group_by)
     return {"data": sales, "days": days, "group_by": group_by}
 
 
 @router.get("/products-sales")
-def get_product_sales_report(
+async def get_product_sales_report(
     days: int = 30,
     limit: int = 50,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get top selling products"""
-    products = ReportService.get_product_sales_report(db, days, limit)
+    products = await ReportService.get_product_sales_report_async(db, days, limit)
     return {"data": products, "days": days}
 
 
 @router.get("/payment-methods")
-def get_payment_method_report(
+async def get_payment_method_report(
     days: int = 30,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get payment methods breakdown"""
-    methods = ReportService.get_payment_method_report(db, days)
+    methods = await ReportService.get_payment_method_report_async(db, days)
     return {"data": methods, "days": days}
 
 
 @router.get("/inventory")
-def get_inventory_report(
+async def get_inventory_report(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get inventory report"""
-    inventory = ReportService.get_inventory_report(db)
+    inventory = await ReportService.get_inventory_report_async(db)
     return {"data": inventory}
 
 
 @router.get("/daily-summary")
-def get_daily_summary(
+async def get_daily_summary(
     date: str = None,
+    rollup: bool = True,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get daily sales summary"""
     if date:
         date = datetime.strptime(date, "%Y-%m-%d").date()
-    summary = ReportService.get_daily_summary(db, date)
+    if rollup:
+        summary = await ReportService.get_daily_summary_from_rollup_async(db, date)
+    else:
+        summary = await ReportService.get_daily_summary_async(db, date)
     return {"data": summary}
 
 
 @router.get("/customers")
-def get_customer_report(
+async def get_customer_report(
     limit: int = 20,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get top customers"""
-    customers = ReportService.get_customer_report(db, limit)
+    customers = await ReportService.get_customer_report_async(db, limit)
     return {"data": customers}
+
+
+@router.get("/cache-stats")
+def get_report_cache_stats(
+    current_user: dict = Depends(get_current_user),
+):
+    """Get report cache hit/miss counters"""
+    cache = get_report_cache()
+    return {"backend": cache.backend, "ttl": cache.ttl, **cache.stats.as_dict()}
@@ -0,0 +1,246 @@
+"""Report result cache with TTL, LRU bound and write-driven invalidation"""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+
+# Tables the reports read from; committing a write to any of them
+# invalidates every cached report
+REPORT_SOURCE_TABLES = {
+    "orders",
+    "order_items",
+    "payments",
+    "inventory_logs",
+    "products",
+    "customers",
+    "sales_daily",
+}
+
+_MISSING = object()
+
+
+class CacheStats:
+    """Hit/miss counters shared by all cache backends"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+
+
+class MemoryCache:
+    """In-process LRU cache with a per-entry TTL"""
+
+    backend = "memory"
+
+    def __init__(self, ttl: int = 60, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def generation(self) -> int:
+        """Counter bumped by every invalidation; pass it back to ``set``"""
+        return self._generation
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.stats.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any, generation: Optional[int] = None) -> None:
+        """Store ``value``, unless the cache was invalidated since ``generation`` was read"""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self.stats.invalidations += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache:
+    """Redis-backed cache shared by every worker.
+
+    Keys embed a generation number stored in Redis, so one INCR invalidates
+    all entries for all workers at once; stale generations simply expire.
+    The LRU bound is Redis's own ``maxmemory-policy allkeys-lru``.
+    """
+
+    backend = "redis"
+
+    def __init__(self, url: str, ttl: int = 60, prefix: str = "vayupos:reports"):
+        import redis
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self.stats = CacheStats()
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5)
+        self._generation_key = f"{prefix}:generation"
+
+    def generation(self) -> Optional[int]:
+        """Current generation number; None when Redis cannot be reached"""
+        try:
+            return int(self._client.get(self._generation_key) or 0)
+        except Exception as e:
+            self.stats.errors += 1
+            print(f"Report cache unavailable: {str(e)}")
+            return None
+
+    def _key(self, key: str, generation: Optional[int] = None) -> str:
+        if generation is None:
+            generation = int(self._client.get(self._generation_key) or 0)
+        return f"{self.prefix}:{generation}:{key}"
+
+    def get(self, key: str) -> Any:
+        try:
+            raw = self._client.get(self._key(key))
+        except Exception as e:
+            # A cache outage must never fail the report itself
+            self.stats.errors += 1
+            print(f"Report cache unavailable: {str(e)}")
+            return _MISSING
+        if raw is None:
+            self.stats.misses += 1
+            return _MISSING
+        self.stats.hits += 1
+        return pickle.loads(raw)
+
+    def set(self, key: str, value: Any, generation: Optional[int] = None) -> None:
+        """Store ``value`` under ``generation``, which no reader sees once it is invalidated"""
+        try:
+            self._client.set(self._key(key, generation), pickle.dumps(value), ex=self.ttl)
+        except Exception as e:
+            self.stats.errors += 1
+            print(f"Report cache unavailable: {str(e)}")
+
+    def invalidate(self) -> None:
+        try:
+            self._client.incr(self._generation_key)
+            self.stats.invalidations += 1
+        except Exception as e:
+            self.stats.errors += 1
+            print(f"Report cache unavailable: {str(e)}")
+
+
+_report_cache = None
+_report_cache_lock = threading.Lock()
+
+
+def get_report_cache():
+    """Return the process-wide report cache, built from settings on first use"""
+    global _report_cache
+    if _report_cache is None:
+        with _report_cache_lock:
+            if _report_cache is None:
+                settings = get_settings()
+                if settings.REPORT_CACHE_BACKEND == "redis" and settings.REDIS_URL:
+                    _report_cache = RedisCache(settings.REDIS_URL, ttl=settings.REPORT_CACHE_TTL)
+                else:
+                    _report_cache = MemoryCache(
+                        ttl=settings.REPORT_CACHE_TTL,
+                        max_entries=settings.REPORT_CACHE_MAX_ENTRIES,
+                    )
+    return _report_cache
+
+
+def _make_key(name: str, args: tuple, kwargs: Dict) -> str:
+    parts = [repr(arg) for arg in args]
+    parts += [f"{k}={v!r}" for k, v in sorted(kwargs.items())]
+    return f"{name}({', '.join(parts)})"
+
+
+def cached_report(name: str):
+    """Cache a ``ReportService`` method's result, keyed by name and arguments.
+
+    The wrapped function takes the DB session first; it is not part of the key.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(db: Session, *args, **kwargs):
+            if get_settings().REPORT_CACHE_BACKEND == "none":
+                return func(db, *args, **kwargs)
+
+            cache = get_report_cache()
+            key = _make_key(name, args, kwargs)
+            # Read before computing: a write committed while the report runs
+            # bumps the generation, and the stale result is not stored
+            generation = cache.generation()
+            if generation is None:
+                return func(db, *args, **kwargs)
+            value = cache.get(key)
+            if value is _MISSING:
+                value = func(db, *args, **kwargs)
+                cache.set(key, value, generation)
+            return value
+        return wrapper
+    return decorator
+
+
+# -------- Write-driven invalidation --------
+@event.listens_for(Session, "after_flush")
+def _track_flushed_writes(session, flush_context):
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(instance, "__tablename__", None)
+        if table in REPORT_SOURCE_TABLES:
+            session.info["report_cache_dirty"] = True
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement_writes(orm_execute_state):
+    # Bulk UPDATE/INSERT/DELETE statements bypass the flush
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is not None and getattr(table, "name", None) in REPORT_SOURCE_TABLES:
+        if orm_execute_state.is_update or orm_execute_state.is_insert or orm_execute_state.is_delete:
+            orm_execute_state.session.info["report_cache_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop("report_cache_dirty", False) and _report_cache is not None:
+        _report_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("report_cache_dirty", None)
@@ -0,0 +1,297 @@
+"""Catalog version counter and in-process product lookup cache"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event, insert, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.catalog_state import CatalogState, CatalogTombstone
+from app.models.category import Category
+from app.models.product import Product
+from app.utils.etag import content_etag
+
+# Execution option naming the products whose stock a bulk UPDATE changes.
+# Such statements evict those products locally but leave the catalog
+# version alone, so every sale does not flush every worker's cache.
+STOCK_UPDATE_OPTION = "catalog_stock_ids"
+
+# Columns that may change without bumping the catalog version
+UNVERSIONED_COLUMNS = {"stock_quantity", "updated_at", "catalog_version"}
+
+# Versioned tables and the entity name their tombstones use
+CATALOG_TABLES = {"products": "product", "categories": "category"}
+
+
+# -------- Version counter --------
+def get_catalog_version(db: Session) -> int:
+    """Read the current catalog version"""
+    version = db.execute(select(CatalogState.version).where(CatalogState.id == 1)).scalar()
+    return version or 0
+
+
+def bump_catalog_version(connection) -> int:
+    """Increment the catalog version inside the caller's transaction and return it.
+
+    The row stays locked until commit, so versions become visible in order.
+    """
+    table = CatalogState.__table__
+    connection.execute(
+        update(table)
+        .where(table.c.id == 1)
+        .values(version=table.c.version + 1, updated_at=datetime.utcnow())
+    )
+    return connection.execute(select(table.c.version).where(table.c.id == 1)).scalar()
+
+
+def add_catalog_version_columns(connection) -> None:
+    """Add catalog_version to versioned tables created before it existed.
+
+    create_all never alters existing tables. Existing rows start at version
+    0, so terminals receive them through the snapshot rather than as changes.
+    """
+    inspector = inspect(connection)
+    for model in (Product, Category):
+        table = model.__table__
+        if "catalog_version" in {column["name"] for column in inspector.get_columns(table.name)}:
+            continue
+        connection.exec_driver_sql(
+            f"ALTER TABLE {table.name} ADD COLUMN catalog_version INTEGER NOT NULL DEFAULT 0"
+        )
+        for index in table.indexes:
+            if "catalog_version" in index.columns:
+                index.create(connection, checkfirst=True)
+
+
+# -------- Lookup cache --------
+class CatalogCache:
+    """Bounded LRU of serialized product payloads, keyed by id, SKU and barcode.
+
+    Local writes evict entries at commit. Writes made by other workers are
+    noticed through the catalog version, read at most once per
+    ``check_interval`` seconds; a changed version clears the cache. Stock
+    updates do not bump the version, so a cached ``stock_quantity`` may lag
+    other workers' sales by up to ``ttl`` seconds.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: int = 30, check_interval: float = 1.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._keys: Dict[Tuple[str, str], int] = {}
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._generation = 0  # bumped by every eviction, guards in-flight loads
+        self._lock = threading.Lock()
+
+    def _sync(self, db: Session) -> None:
+        """Drop everything if another worker changed the catalog"""
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.check_interval:
+            return
+        version = get_catalog_version(db)
+        with self._lock:
+            if version != self._version:
+                self._clear()
+                self._version = version
+            self._checked_at = now
+
+    def get_or_load(
+        self,
+        db: Session,
+        kind: str,
+        key: Any,
+        loader: Callable[[], Optional[Tuple[Product, bytes]]],
+    ) -> Optional[Tuple[bytes, str]]:
+        """Return the payload and its ETag for ``kind`` ("id", "sku" or "barcode") and ``key``.
+
+        On a miss ``loader`` is called and must return the product and its
+        serialized payload, or None; misses for unknown keys are not cached.
+        """
+        if self.max_entries <= 0:
+            loaded = loader()
+            return (loaded[1], content_etag(loaded[1])) if loaded else None
+
+        self._sync(db)
+        with self._lock:
+            product_id = key if kind == "id" else self._keys.get((kind, key))
+            entry = self._entries.get(product_id) if product_id is not None else None
+            if entry is not None and entry[0] >= time.monotonic():
+                self._entries.move_to_end(product_id)
+                self.hits += 1
+                return entry[3], entry[4]
+            self.misses += 1
+            generation = self._generation
+
+        loaded = loader()
+        if loaded is None:
+            return None
+        product, payload = loaded
+        etag = content_etag(payload)
+
+        with self._lock:
+            # An eviction during the load may mean the payload is already stale
+            if generation == self._generation:
+                self._put(product, payload, etag)
+        return payload, etag
+
+    def _put(self, product: Product, payload: bytes, etag: str) -> None:
+        self._discard(product.id)
+        self._entries[product.id] = (
+            time.monotonic() + self.ttl, product.sku, product.barcode, payload, etag
+        )
+        self._keys[("sku", product.sku)] = product.id
+        if product.barcode:
+            self._keys[("barcode", product.barcode)] = product.id
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+
+    def _discard(self, product_id: int) -> None:
+        entry = self._entries.pop(product_id, None)
+        if entry is not None:
+            self._keys.pop(("sku", entry[1]), None)
+            self._keys.pop(("barcode", entry[2]), None)
+
+    def _clear(self) -> None:
+        self._entries.clear()
+        self._keys.clear()
+        self._generation += 1
+
+    def evict(self, product_ids: Iterable[int]) -> None:
+        """Drop the given products"""
+        with self._lock:
+            for product_id in product_ids:
+                self._discard(product_id)
+            self._generation += 1
+
+    def invalidate(self) -> None:
+        """Drop everything and re-read the catalog version on next use"""
+        with self._lock:
+            self._clear()
+            self._version = None
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "version": self._version,
+        }
+
+
+_catalog_cache = None
+_catalog_cache_lock = threading.Lock()
+
+
+def get_catalog_cache() -> CatalogCache:
+    """Return the process-wide catalog cache, built from settings on first use"""
+    global _catalog_cache
+    if _catalog_cache is None:
+        with _catalog_cache_lock:
+            if _catalog_cache is None:
+                settings = get_settings()
+                _catalog_cache = CatalogCache(
+                    max_entries=settings.CATALOG_CACHE_MAX_ENTRIES,
+                    ttl=settings.CATALOG_CACHE_TTL,
+                    check_interval=settings.CATALOG_CACHE_CHECK_INTERVAL,
+                )
+    return _catalog_cache
+
+
+# -------- Write tracking --------
+def _versioned_change(instance) -> bool:
+    """Whether a dirty product or category changed a versioned column"""
+    columns = instance.__table__.c
+    return any(
+        attr.history.has_changes()
+        for attr in inspect(instance).attrs
+        if attr.key in columns and attr.key not in UNVERSIONED_COLUMNS
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_catalog_writes(session, flush_context, instances):
+    written = [i for i in session.new if isinstance(i, (Product, Category))]
+    deleted = [i for i in session.deleted if isinstance(i, (Product, Category))]
+    stock_ids = set()
+    for instance in session.dirty:
+        if not isinstance(instance, (Product, Category)):
+            continue
+        if _versioned_change(instance):
+            written.append(instance)
+        elif isinstance(instance, Product):
+            stock_ids.add(instance.id)
+
+    if written or deleted:
+        version = bump_catalog_version(session.connection())
+        for instance in written:
+            instance.catalog_version = version
+        for instance in deleted:
+            session.add(CatalogTombstone(
+                entity=CATALOG_TABLES[instance.__tablename__],
+                entity_id=instance.id,
+                version=version,
+            ))
+        session.info["catalog_dirty"] = True
+    if stock_ids:
+        session.info.setdefault("catalog_stock_ids", set()).update(stock_ids)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _stamp_statement_catalog_writes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_insert or orm_execute_state.is_delete):
+        return
+    statement = orm_execute_state.statement
+    table = getattr(statement, "table", None)
+    entity = CATALOG_TABLES.get(getattr(table, "name", None))
+    if entity is None:
+        return
+
+    session = orm_execute_state.session
+    stock_ids = orm_execute_state.execution_options.get(STOCK_UPDATE_OPTION)
+    if stock_ids is not None:
+        session.info.setdefault("catalog_stock_ids", set()).update(stock_ids)
+        return
+
+    connection = session.connection()
+    version = bump_catalog_version(connection)
+    if orm_execute_state.is_update or orm_execute_state.is_insert:
+        orm_execute_state.statement = statement.values(catalog_version=version)
+    else:
+        query = select(table.c.id)
+        if statement.whereclause is not None:
+            query = query.where(statement.whereclause)
+        ids = connection.execute(query).scalars().all()
+        if ids:
+            connection.execute(
+                insert(CatalogTombstone.__table__),
+                [{"entity": entity, "entity_id": row_id, "version": version, "deleted_at": datetime.utcnow()}
+                 for row_id in ids],
+            )
+    session.info["catalog_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_after_commit(session):
+    dirty = session.info.pop("catalog_dirty", False)
+    stock_ids = session.info.pop("catalog_stock_ids", None)
+    if _catalog_cache is None:
+        return
+    if dirty:
+        _catalog_cache.invalidate()
+    elif stock_ids:
+        _catalog_cache.evict(stock_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog_writes(session):
+    session.info.pop("catalog_dirty", None)
+    session.info.pop("catalog_stock_ids", None)
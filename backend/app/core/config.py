@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
+from typing import Optional
 
 load_dotenv()
 
@@ -8,6 +9,25 @@ class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
     
     DATABASE_URL: str = "sqlite:///./test.db"
+    ASYNC_DATABASE_URL: Optional[str] = None  # default: DATABASE_URL with aiosqlite / asyncpg
+
+    # Connection pool; unset values come from the backend's profile in app/core/db_pool.py
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: Optional[float] = None  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: Optional[int] = None  # seconds before a connection is replaced; -1 = never
+    DB_POOL_PRE_PING: Optional[bool] = None  # test connections on checkout
+
+    # SQLite profile, applied to every connection when DATABASE_URL is SQLite
+    SQLITE_PROFILE_ENABLED: bool = True
+    SQLITE_WAL: bool = True  # readers no longer block on writers; persists in the database file
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # with WAL: durable except on power loss
+    SQLITE_CACHE_SIZE_KB: int = 65536  # page cache per connection
+    SQLITE_MMAP_SIZE: int = 268435456  # bytes of the file read through mmap
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # wait this long for the write lock
+    SQLITE_IMMEDIATE_WRITES: bool = True  # BEGIN IMMEDIATE when a transaction starts with a write
+    SQLITE_CHECKPOINT_INTERVAL: int = 300  # seconds between WAL checkpoints; 0 = SQLite's auto-checkpoint only
+
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION: int = 3600  # 1 hour in seconds
@@ -19,6 +39,36 @@ class Settings(BaseSettings):
     app_name: str = "POS Backend API"
     app_version: str = "1.0.0"
     cors_origins: list = ["*"]
+
+    # Report cache: "memory" (per process), "redis" (shared) or "none"
+    REDIS_URL: Optional[str] = None
+    REPORT_CACHE_BACKEND: str = "memory"
+    REPORT_CACHE_TTL: int = 60  # seconds
+    REPORT_CACHE_MAX_ENTRIES: int = 256
+
+    # Catalog lookup cache (per process; 0 entries disables it)
+    CATALOG_CACHE_MAX_ENTRIES: int = 10000
+    CATALOG_CACHE_TTL: int = 30  # seconds; bounds stock staleness across workers
+    CATALOG_CACHE_CHECK_INTERVAL: float = 1.0  # seconds between catalog version checks
+
+    # Document rendering (barcode labels, invoices)
+    LABEL_CACHE_DIR: str = "./cache/barcodes"  # content-addressed barcode PNGs
+    RENDER_WORKERS: int = 0  # processes in the render pool; 0 = one per CPU
+
+    # Request metrics, served in Prometheus text format on /metrics
+    METRICS_ENABLED: bool = True
+    SERVER_TIMING_ENABLED: bool = True  # Server-Timing header with SQL time and statement count
+    REQUEST_LOG_ENABLED: bool = False  # one line per request with its SQL totals
+    SLOW_QUERY_MS: float = 200  # log statements slower than this with masked params and route; 0 = off
+
+    # On-demand request profiling: admins send PROFILE_HEADER: 1, or routes are
+    # sampled at PROFILE_SAMPLE_RATES percent (route template -> percent)
+    PROFILING_ENABLED: bool = True
+    PROFILE_HEADER: str = "X-Profile"
+    PROFILE_SAMPLE_RATES: dict = {}
+    PROFILE_INTERVAL_MS: float = 5  # sampling period
+    PROFILE_DIR: str = "./logs/profiles"
+    PROFILE_MAX_KEPT: int = 50  # oldest profiles are deleted beyond this
     
     class Config:
         env_file = ".env"
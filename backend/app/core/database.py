@@ -1,7 +1,15 @@
+from functools import wraps
+from typing import Callable
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import get_settings
+from app.core.db_pool import instrument_pool, pool_options, pool_stats
+from app.core.metrics import instrument_queries
+from app.core.sqlite import WalCheckpointer, configure_sqlite_engine
 
 # Get settings which loads .env file
 settings = get_settings()
@@ -10,17 +18,88 @@ settings = get_settings()
 DATABASE_URL = settings.DATABASE_URL
 
 # Create engine
+# Pool sizing follows the backend's profile unless DB_POOL_* settings override it
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    **pool_options(DATABASE_URL, settings),
 )
+instrument_pool(engine)
+instrument_queries(engine, settings)
+
+IS_SQLITE = make_url(DATABASE_URL).get_backend_name() == "sqlite"
+if IS_SQLITE and settings.SQLITE_PROFILE_ENABLED:
+    configure_sqlite_engine(engine, settings)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# asyncio drivers used for each backend by the async engine
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def async_database_url(url: str) -> str:
+    """Return ``url`` with its backend's asyncio driver (aiosqlite / asyncpg)"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+# The async engine is created on first use, so deployments that never hit
+# an async route do not need aiosqlite or asyncpg installed
+_async_engine = None
+_async_session_factory = None
+
+
+def get_async_engine():
+    """Return the asyncio engine, built from settings on first use"""
+    global _async_engine
+    if _async_engine is None:
+        url = settings.ASYNC_DATABASE_URL or async_database_url(DATABASE_URL)
+        _async_engine = create_async_engine(url, **pool_options(url, settings, is_async=True))
+        instrument_pool(_async_engine.sync_engine)
+        instrument_queries(_async_engine.sync_engine, settings)
+        if IS_SQLITE and settings.SQLITE_PROFILE_ENABLED:
+            configure_sqlite_engine(_async_engine.sync_engine, settings)
+    return _async_engine
+
+
+def get_pool_stats() -> dict:
+    """Pool occupancy and checkout metrics for the sync and (if started) async engines"""
+    return {
+        "sync": pool_stats(engine),
+        "async": pool_stats(_async_engine.sync_engine) if _async_engine is not None else None,
+    }
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    """Return the AsyncSession factory bound to the async engine"""
+    global _async_session_factory
+    if _async_session_factory is None:
+        # Objects stay readable after commit; lazy loads would need a greenlet
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(), class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+def async_variant(func: Callable) -> Callable:
+    """Build the AsyncSession variant of a sync service method ``func(db, ...)``.
+
+    The variant runs ``func`` unchanged on the AsyncSession's underlying
+    Session through ``run_sync``: its queries await the asyncio driver
+    instead of holding a threadpool thread for the whole call.
+    """
+    @wraps(func)
+    async def variant(db: AsyncSession, *args, **kwargs):
+        return await db.run_sync(func, *args, **kwargs)
+
+    variant.__doc__ = f"Async variant of {func.__name__}"
+    return variant
+
+
 # Create Base class
 Base = declarative_base()
 
@@ -34,6 +113,9 @@ from app.models.order import Order
 from app.models.order_item import OrderItem
 from app.models.payment import Payment
 from app.models.inventory_log import InventoryLog
+from app.models.sales_daily import SalesDaily
+from app.models.catalog_state import CatalogState, CatalogTombstone
+from app.models.product import create_product_search_index
 
 # Dependency to get DB session
 def get_db():
@@ -44,6 +126,42 @@ def get_db():
         db.close()
 
 
+_checkpointer = None
+
+
+def start_wal_checkpointer():
+    """Start periodic WAL checkpoints when the SQLite profile runs in WAL mode"""
+    global _checkpointer
+    if not (IS_SQLITE and settings.SQLITE_PROFILE_ENABLED and settings.SQLITE_WAL):
+        return None
+    if settings.SQLITE_CHECKPOINT_INTERVAL > 0 and _checkpointer is None:
+        _checkpointer = WalCheckpointer(engine, settings.SQLITE_CHECKPOINT_INTERVAL)
+        _checkpointer.start()
+    return _checkpointer
+
+
+def stop_wal_checkpointer():
+    """Stop periodic WAL checkpoints"""
+    global _checkpointer
+    if _checkpointer is not None:
+        _checkpointer.stop()
+        _checkpointer = None
+
+
 def init_db():
     """Initialize database by creating all tables"""
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    from app.core.catalog import add_catalog_version_columns
+    from app.services.rollup_service import SalesRollupService
+
+    Base.metadata.create_all(bind=engine)
+    # create_all skips existing tables, so upgrade databases created before
+    # catalog versioning and search
+    with engine.begin() as connection:
+        add_catalog_version_columns(connection)
+        create_product_search_index(connection)
+
+    db = SessionLocal()
+    try:
+        SalesRollupService.backfill(db)
+    finally:
+        db.close()
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""Connection pool profiles and checkout metrics"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Defaults per backend, overridden by any DB_POOL_* setting that is set.
+# SQLite is a local file: connections are cheap and never go stale, so
+# there is nothing to ping or recycle, and more than a handful of
+# connections only queues more writers on the single database lock.
+# Servers drop idle connections, so Postgres pings and recycles.
+POOL_PROFILES = {
+    "sqlite": {"pool_size": 5, "max_overflow": 5, "pool_timeout": 10, "pool_recycle": -1, "pool_pre_ping": False},
+    "postgresql": {"pool_size": 10, "max_overflow": 20, "pool_timeout": 30, "pool_recycle": 1800, "pool_pre_ping": True},
+}
+DEFAULT_POOL_PROFILE = POOL_PROFILES["postgresql"]
+
+# Settings fields mapped to create_engine arguments
+POOL_SETTINGS = {
+    "DB_POOL_SIZE": "pool_size",
+    "DB_MAX_OVERFLOW": "max_overflow",
+    "DB_POOL_TIMEOUT": "pool_timeout",
+    "DB_POOL_RECYCLE": "pool_recycle",
+    "DB_POOL_PRE_PING": "pool_pre_ping",
+}
+
+
+class PoolMetrics:
+    """Checkout counters for one pool, kept across pool re-creation"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.peak_checked_out = 0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, waited: float, checked_out: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "peak_checked_out": self.peak_checked_out,
+            "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+class _MeteredPoolMixin:
+    """Times every checkout, including waits for a free slot and new connects"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start, self.checkedout())
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    """QueuePool with checkout metrics"""
+
+
+class MeteredAsyncAdaptedQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout metrics"""
+
+
+def pool_options(url: str, settings, is_async: bool = False) -> Dict[str, Any]:
+    """create_engine pool arguments for ``url``: the backend profile plus overrides"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}  # in-memory SQLite keeps SQLAlchemy's single-connection pool
+
+    options = dict(POOL_PROFILES.get(parsed.get_backend_name(), DEFAULT_POOL_PROFILE))
+    for field, option in POOL_SETTINGS.items():
+        value = getattr(settings, field, None)
+        if value is not None:
+            options[option] = value
+    options["poolclass"] = MeteredAsyncAdaptedQueuePool if is_async else MeteredQueuePool
+    return options
+
+
+def instrument_pool(engine) -> None:
+    """Count connects and invalidations on ``engine``'s metered pool"""
+    pool = engine.pool
+    if not isinstance(pool, _MeteredPoolMixin):
+        return
+
+    @event.listens_for(engine, "connect")
+    def _count_connect(dbapi_connection, connection_record):
+        pool.metrics.connects += 1
+
+    @event.listens_for(engine, "invalidate")
+    def _count_invalidate(dbapi_connection, connection_record, exception):
+        pool.metrics.invalidations += 1
+
+
+def pool_stats(engine) -> Optional[Dict[str, Any]]:
+    """Live occupancy and cumulative checkout metrics for ``engine``'s pool"""
+    if engine is None:
+        return None
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        })
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.as_dict())
+    return stats
+
+
+# Numeric pool_stats fields exported as gauges by /metrics
+POOL_GAUGES = {
+    "checked_out": "Connections currently checked out",
+    "idle": "Idle connections in the pool",
+    "overflow": "Connections open beyond pool_size",
+    "checkouts": "Connection checkouts since start",
+    "timeouts": "Checkouts that timed out waiting for a connection",
+    "wait_max_ms": "Longest checkout wait in milliseconds",
+}
+
+
+def pool_gauges(stats_by_engine: Dict[str, Optional[Dict[str, Any]]]):
+    """``get_pool_stats`` output as metric collector gauges, labelled by engine"""
+    for field, documentation in POOL_GAUGES.items():
+        values = {
+            (("engine", name),): stats[field]
+            for name, stats in stats_by_engine.items()
+            if stats is not None and field in stats
+        }
+        if values:
+            yield f"db_pool_{field}", documentation, values
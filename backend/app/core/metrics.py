@@ -0,0 +1,247 @@
+"""Request metrics: counters, latency histograms, per-request SQL and slow queries"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+
+# Upper bounds in seconds; one extra bucket catches everything slower
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+# -------- Metric types --------
+# Request metrics are only updated by the ASGI middleware, which runs on the
+# event loop thread, so plain dict and list updates need no locks.
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Tuple[str, ...], values: Tuple) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, label_values: Tuple = (), amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        for label_values, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.labels, label_values)} {value}"
+
+
+class Gauge(Counter):
+    """Value that goes up and down per label set"""
+
+    kind = "gauge"
+
+    def dec(self, label_values: Tuple = (), amount: float = 1) -> None:
+        self.inc(label_values, -amount)
+
+
+class Histogram:
+    """Fixed-bucket histogram per label set; buckets are chosen up front"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        # Per label set: one count per bucket, the overflow bucket, then the sum
+        self._series: Dict[Tuple, List[float]] = {}
+
+    def observe(self, label_values: Tuple, value: float) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series.setdefault(label_values, [0] * (len(self.buckets) + 1) + [0.0])
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self) -> Iterable[str]:
+        bucket_labels = self.labels + ("le",)
+        for label_values, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f"{self.name}_bucket{_labels(bucket_labels, label_values + (le,))} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labels, label_values)} {series[-1]}"
+            yield f"{self.name}_count{_labels(self.labels, label_values)} {cumulative}"
+
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template, method and status",
+    ("route", "method", "status"),
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template, method and status",
+    ("route", "method", "status"), LATENCY_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request",
+    ("route", "method"), DB_TIME_BUCKETS,
+)
+REQUEST_DB_STATEMENTS = Counter(
+    "http_request_db_statements_total", "SQL statements executed by requests",
+    ("route", "method"),
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served", ("method",))
+
+REQUEST_METRICS = (REQUESTS, REQUEST_LATENCY, REQUEST_DB_TIME, REQUEST_DB_STATEMENTS, IN_FLIGHT)
+
+# Extra gauges computed at scrape time: callables returning (name, help, {labels: value})
+_collectors: List[Callable[[], Iterable[Tuple[str, str, Dict[Tuple[Tuple[str, str], ...], float]]]]] = []
+
+
+def register_collector(collector: Callable) -> None:
+    """Add a scrape-time gauge collector"""
+    _collectors.append(collector)
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in REQUEST_METRICS:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    for collector in _collectors:
+        try:
+            gauges = list(collector())
+        except Exception as e:
+            print(f"Error collecting metrics: {str(e)}")
+            continue
+        for name, documentation, values in gauges:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in values.items():
+                names = tuple(label for label, _ in labels)
+                lines.append(f"{name}{_labels(names, tuple(v for _, v in labels))} {value}")
+    return "\n".join(lines) + "\n"
+
+
+# -------- Per-request SQL --------
+# Route label for requests no route matched, so 404 scans cannot add series
+UNMATCHED_ROUTE = "unmatched"
+
+# Longest parameter repr written to the slow-query log
+SLOW_QUERY_PARAMS_LIMIT = 500
+
+# Parameters whose bind name contains one of these are masked in the log
+# (hashed_password, email_1, phone, ...)
+SENSITIVE_PARAM_NAMES = ("password", "email", "phone", "token", "secret")
+REDACTED = "***"
+
+
+def route_template(scope) -> str:
+    """The matched route's path template, e.g. /api/v1/orders/{order_id}"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class RequestStats:
+    """SQL executed on behalf of one request"""
+
+    __slots__ = ("scope", "db_time", "db_statements")
+
+    def __init__(self, scope=None):
+        self.scope = scope
+        self.db_time = 0.0
+        self.db_statements = 0
+
+    @property
+    def route(self) -> str:
+        return route_template(self.scope) if self.scope is not None else UNMATCHED_ROUTE
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Stats of the request being served, or None outside a request"""
+    return _request_stats.get()
+
+
+def start_request_stats(scope=None) -> Tuple[RequestStats, object]:
+    """Begin collecting stats for a request; pass the token to ``end_request_stats``"""
+    stats = RequestStats(scope)
+    return stats, _request_stats.set(stats)
+
+
+def end_request_stats(token) -> None:
+    _request_stats.reset(token)
+
+
+def instrument_queries(engine, settings) -> None:
+    """Count statements and DB time per request on ``engine``; log slow statements.
+
+    The request's stats live in a context variable, which is copied into
+    threadpool workers and greenlets, so statements run by a sync route or
+    through AsyncSession.run_sync land on the request that issued them.
+    """
+    slow_query_seconds = settings.SLOW_QUERY_MS / 1000 if settings.SLOW_QUERY_MS > 0 else None
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+        context._stats_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_statement(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_stats_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.db_time += elapsed
+            stats.db_statements += 1
+        if slow_query_seconds is not None and elapsed >= slow_query_seconds:
+            _log_slow_query(stats, statement, redact_parameters(context, parameters, executemany), elapsed)
+
+
+def redact_parameters(context, parameters, executemany: bool = False):
+    """``parameters`` with values bound to sensitive names masked.
+
+    Positional parameters are named through the compiled statement; rows
+    that cannot be matched to names (raw driver SQL) are masked whole.
+    """
+    names = getattr(getattr(context, "compiled", None), "positiontup", None)
+
+    def sensitive(name) -> bool:
+        return any(word in str(name).lower() for word in SENSITIVE_PARAM_NAMES)
+
+    def redact(row):
+        if isinstance(row, dict):
+            return {name: REDACTED if sensitive(name) else value for name, value in row.items()}
+        if names is not None and len(names) == len(row):
+            return tuple(REDACTED if sensitive(name) else value for name, value in zip(names, row))
+        return tuple(REDACTED for _ in row)
+
+    if executemany:
+        return [redact(row) for row in parameters]
+    return redact(parameters)
+
+
+def _log_slow_query(stats: Optional[RequestStats], statement: str, parameters, elapsed: float) -> None:
+    if stats is None:
+        source = "outside a request"
+    else:
+        source = f"{stats.scope['method']} {stats.route}" if stats.scope is not None else stats.route
+    params = repr(parameters)
+    if len(params) > SLOW_QUERY_PARAMS_LIMIT:
+        params = params[:SLOW_QUERY_PARAMS_LIMIT] + "..."
+    print(f"Slow query ({elapsed * 1000:.1f} ms) from {source}: {' '.join(statement.split())} params={params}")
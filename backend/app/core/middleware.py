@@ -0,0 +1,166 @@
+"""ASGI middleware"""
+import time
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import Match
+
+from app.core.metrics import (
+    IN_FLIGHT,
+    REQUESTS,
+    REQUEST_DB_STATEMENTS,
+    REQUEST_DB_TIME,
+    REQUEST_LATENCY,
+    end_request_stats,
+    route_template,
+    start_request_stats,
+)
+from app.core.profiler import (
+    SamplingProfiler,
+    acquire_profile_slot,
+    get_profile_sampling,
+    get_profile_store,
+    release_profile_slot,
+)
+from app.core.security import decode_token
+from app.models.user import UserRole
+
+
+def server_timing_header(stats, elapsed: float) -> str:
+    """Server-Timing header value: DB time and statement count, then total time"""
+    return (
+        f'db;dur={stats.db_time * 1000:.2f};desc="{stats.db_statements} queries", '
+        f"total;dur={elapsed * 1000:.2f}"
+    )
+
+
+class MetricsMiddleware:
+    """Record count, latency, SQL time and in-flight requests for every HTTP request.
+
+    A plain ASGI middleware rather than BaseHTTPMiddleware: it wraps
+    ``send`` instead of buffering responses through a task, and it only
+    runs on the event loop, so the metric updates need no locks.
+    Optionally adds a Server-Timing header with the SQL totals so far and
+    prints one line per request with the final totals.
+    """
+
+    def __init__(self, app, record_metrics: bool = True, server_timing: bool = True, log_requests: bool = False):
+        self.app = app
+        self.record_metrics = record_metrics
+        self.server_timing = server_timing
+        self.log_requests = log_requests
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+        stats, token = start_request_stats(scope)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    # Streamed responses may run more SQL after the headers go out
+                    header = server_timing_header(stats, time.perf_counter() - start)
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", header.encode("latin-1"))
+                    ]
+            await send(message)
+
+        IN_FLIGHT.inc((method,))
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec((method,))
+            end_request_stats(token)
+            elapsed = time.perf_counter() - start
+            route = stats.route
+            if self.record_metrics:
+                REQUESTS.inc((route, method, str(status_code)))
+                REQUEST_LATENCY.observe((route, method, str(status_code)), elapsed)
+                REQUEST_DB_TIME.observe((route, method), stats.db_time)
+                if stats.db_statements:
+                    REQUEST_DB_STATEMENTS.inc((route, method), stats.db_statements)
+            if self.log_requests:
+                print(
+                    f"{method} {scope['path']} {status_code} {elapsed * 1000:.1f} ms"
+                    f" db={stats.db_time * 1000:.1f} ms queries={stats.db_statements} route={route}"
+                )
+
+
+class ProfilingMiddleware:
+    """Run selected requests under the sampling profiler.
+
+    A request is profiled when an admin sends the profiling header, or when
+    its route is picked by the per-route sampling rates. Only one request is
+    profiled at a time; others run normally meanwhile. The profile's id is
+    returned in the X-Profile-Id response header.
+    """
+
+    def __init__(self, app, router, header: str = "X-Profile", interval: float = 0.005):
+        self.app = app
+        self.router = router
+        self.header = header.lower().encode("latin-1")
+        self.interval = interval
+
+    def _requested_by_admin(self, scope) -> bool:
+        headers = dict(scope.get("headers") or [])
+        if headers.get(self.header, b"").lower() not in (b"1", b"true", b"yes"):
+            return False
+        scheme, _, token = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+        payload = decode_token(token) if scheme.lower() == "bearer" and token else None
+        return payload is not None and payload.get("role") == UserRole.ADMIN.value
+
+    def _route_template(self, scope) -> Optional[str]:
+        for route in self.router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", None)
+        return None
+
+    def _should_profile(self, scope) -> bool:
+        if self._requested_by_admin(scope):
+            return True
+        sampling = get_profile_sampling()
+        if not sampling.rates:
+            return False
+        route = self._route_template(scope)
+        return route is not None and sampling.should_profile(route)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope) or not acquire_profile_slot():
+            await self.app(scope, receive, send)
+            return
+
+        store = get_profile_store()
+        profile_id = store.new_id()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        profiler = SamplingProfiler(self.interval)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            release_profile_slot()
+            try:
+                await run_in_threadpool(
+                    store.save, profile_id, profiler, scope["method"], scope["path"],
+                    route_template(scope), status_code,
+                )
+            except Exception as e:
+                print(f"Error saving profile: {str(e)}")
@@ -0,0 +1,225 @@
+"""On-demand sampling profiler for single requests"""
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter as StackCounter, deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app.core.config import get_settings
+
+# Leaf frames of threads that are parked rather than working (idle workers,
+# the event loop waiting on sockets); their samples are dropped
+IDLE_LEAVES = {("threading.py", "wait"), ("selectors.py", "select"), ("queue.py", "get")}
+
+PROFILE_FORMATS = {"speedscope": ".speedscope.json", "collapsed": ".collapsed.txt"}
+
+# A frame as (function, file, line)
+Frame = Tuple[str, str, int]
+
+
+class SamplingProfiler:
+    """Sample every busy thread's Python stack every ``interval`` seconds.
+
+    Sampling reads ``sys._current_frames()`` from a background thread, so the
+    profiled code runs unmodified and the cost is one stack walk per thread
+    per tick. Samples are keyed by thread name: work done for other requests
+    served at the same time shows up under its own threads.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: StackCounter = StackCounter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES:
+                continue
+            stack: List[Frame] = []
+            while frame is not None:
+                stack.append((frame.f_code.co_name, frame.f_code.co_filename, frame.f_lineno))
+                frame = frame.f_back
+            stack.reverse()
+            self.stacks[(names.get(ident, str(ident)),) + tuple(stack)] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed-stack format, one ``thread;a;b;c count`` per line"""
+        lines = []
+        for (thread, *stack), count in sorted(self.stacks.items()):
+            frames = [f"{name} ({os.path.basename(filename)}:{line})" for name, filename, line in stack]
+            lines.append(";".join([thread] + frames) + f" {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str) -> Dict:
+        """A speedscope document with one sampled profile per thread"""
+        frames: List[Dict] = []
+        frame_index: Dict[Frame, int] = {}
+        profiles: Dict[str, Dict] = {}
+        weight = round(self.interval * 1000, 3)
+        for (thread, *stack), count in sorted(self.stacks.items()):
+            indexes = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indexes.append(frame_index[frame])
+            profile = profiles.setdefault(thread, {
+                "type": "sampled", "name": thread, "unit": "milliseconds",
+                "startValue": 0, "endValue": 0, "samples": [], "weights": [],
+            })
+            profile["samples"].append(indexes)
+            profile["weights"].append(weight * count)
+            profile["endValue"] = round(profile["endValue"] + weight * count, 3)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "pos-backend",
+            "shared": {"frames": frames},
+            "profiles": list(profiles.values()),
+        }
+
+
+class ProfileStore:
+    """The most recent profiles, kept on disk under ``directory``.
+
+    A bounded ring per process: saving a profile beyond ``max_profiles``
+    deletes the oldest one's files.
+    """
+
+    def __init__(self, directory: str, max_profiles: int):
+        self.directory = directory
+        self._profiles: Deque[Dict] = deque()
+        self._max_profiles = max_profiles
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_id() -> str:
+        return f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+    def save(
+        self, profile_id: str, profiler: SamplingProfiler, method: str, path: str, route: str, status_code: int
+    ) -> Dict:
+        """Write ``profiler``'s output in every format and record it in the ring"""
+        name = f"{method} {path}"
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path(profile_id, "collapsed"), "w") as f:
+            f.write(profiler.collapsed())
+        with open(self.path(profile_id, "speedscope"), "w") as f:
+            json.dump(profiler.speedscope(name), f)
+
+        record = {
+            "id": profile_id,
+            "created_at": datetime.utcnow().isoformat(),
+            "method": method,
+            "path": path,
+            "route": route,
+            "status": status_code,
+            "duration_ms": round(profiler.duration * 1000, 3),
+            "samples": profiler.samples,
+        }
+        with self._lock:
+            self._profiles.append(record)
+            expired = []
+            while len(self._profiles) > self._max_profiles:
+                expired.append(self._profiles.popleft())
+        for old in expired:
+            for fmt in PROFILE_FORMATS:
+                try:
+                    os.remove(self.path(old["id"], fmt))
+                except OSError:
+                    pass
+        return record
+
+    def list(self) -> List[Dict]:
+        """Recorded profiles, newest first"""
+        with self._lock:
+            return list(reversed(self._profiles))
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        with self._lock:
+            return next((record for record in self._profiles if record["id"] == profile_id), None)
+
+    def path(self, profile_id: str, fmt: str) -> str:
+        return os.path.join(self.directory, profile_id + PROFILE_FORMATS[fmt])
+
+
+class ProfileSampling:
+    """Per-route sampling rates in percent, keyed by route template"""
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        self.rates: Dict[str, float] = dict(rates or {})
+
+    def set(self, route: str, percent: float) -> None:
+        # Replaced rather than mutated so readers never see a dict mid-update
+        rates = dict(self.rates)
+        if percent > 0:
+            rates[route] = percent
+        else:
+            rates.pop(route, None)
+        self.rates = rates
+
+    def should_profile(self, route: str) -> bool:
+        percent = self.rates.get(route)
+        return percent is not None and random.random() * 100 < percent
+
+
+_store: Optional[ProfileStore] = None
+_sampling: Optional[ProfileSampling] = None
+# One profile at a time: overlapping profiles would sample each other's work
+_profile_slot = threading.Lock()
+
+
+def get_profile_store() -> ProfileStore:
+    """Return the process-wide profile ring, configured from settings"""
+    global _store
+    if _store is None:
+        settings = get_settings()
+        _store = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_MAX_KEPT)
+    return _store
+
+
+def get_profile_sampling() -> ProfileSampling:
+    """Return the process-wide per-route sampling rates"""
+    global _sampling
+    if _sampling is None:
+        _sampling = ProfileSampling(get_settings().PROFILE_SAMPLE_RATES)
+    return _sampling
+
+
+def acquire_profile_slot() -> bool:
+    """Claim the single profiling slot without waiting"""
+    return _profile_slot.acquire(blocking=False)
+
+
+def release_profile_slot() -> None:
+    _profile_slot.release()
@@ -0,0 +1,139 @@
+"""SQLite performance profile: WAL, pragmas, immediate write transactions, checkpoints"""
+import re
+import threading
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.orm import Session
+
+# Connection execution option forcing the next transaction to BEGIN IMMEDIATE
+SQLITE_BEGIN_OPTION = "sqlite_begin"
+
+_WRITE_STATEMENT = re.compile(r"^\s*(INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+
+
+def connection_pragmas(settings) -> Dict[str, Any]:
+    """Per-connection pragmas for the configured profile"""
+    pragmas = {
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB,  # negative = KiB rather than pages
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "temp_store": "MEMORY",
+    }
+    if settings.SQLITE_WAL:
+        pragmas = {"journal_mode": "WAL", **pragmas}
+    return pragmas
+
+
+def configure_sqlite_engine(engine, settings) -> None:
+    """Apply the SQLite profile to every connection ``engine`` opens.
+
+    pysqlite's own transaction handling is switched off so transactions
+    can be begun explicitly: a transaction whose first statement writes
+    starts with BEGIN IMMEDIATE, taking the write lock before it reads
+    anything, as does one opened through ``begin_immediate``. Read-only
+    transactions start deferred, and under WAL never block on writers.
+    """
+    pragmas = connection_pragmas(settings)
+    immediate_writes = settings.SQLITE_IMMEDIATE_WRITES
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _defer_begin(conn):
+        conn.info["sqlite_begin_pending"] = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _begin(conn, cursor, statement, parameters, context, executemany):
+        if not conn.info.pop("sqlite_begin_pending", False):
+            return
+        mode = conn.get_execution_options().get(SQLITE_BEGIN_OPTION)
+        if mode is None and immediate_writes and _WRITE_STATEMENT.match(statement):
+            mode = "IMMEDIATE"
+        begin = f"BEGIN {mode}" if mode else "BEGIN"
+        try:
+            cursor.execute(begin)
+        except conn.dialect.loaded_dbapi.Error as e:
+            # Raised outside SQLAlchemy's own handling, so wrap it the same way
+            # (e.g. "database is locked" becomes sqlalchemy.exc.OperationalError)
+            raise exc.DBAPIError.instance(begin, (), e, conn.dialect.loaded_dbapi.Error) from e
+
+    @event.listens_for(engine, "commit")
+    @event.listens_for(engine, "rollback")
+    def _clear_begin(conn):
+        conn.info.pop("sqlite_begin_pending", None)
+
+
+def begin_immediate(db: Session) -> None:
+    """Start ``db``'s transaction with BEGIN IMMEDIATE on SQLite.
+
+    For read-then-write transactions: taking the write lock up front means
+    the transaction waits its turn (busy_timeout) instead of failing when
+    it later upgrades a stale read snapshot. Only effective before the
+    session has run its first statement; a no-op elsewhere.
+    """
+    if db.in_transaction() or db.get_bind().dialect.name != "sqlite":
+        return
+    db.connection(execution_options={SQLITE_BEGIN_OPTION: "IMMEDIATE"})
+
+
+class WalCheckpointer:
+    """Background thread that checkpoints the WAL every ``interval`` seconds.
+
+    SQLite's auto-checkpoint runs inside whichever commit crosses the
+    threshold and gives up while readers hold old snapshots, so a busy
+    store's WAL can keep growing. PASSIVE checkpoints never block; a
+    TRUNCATE is attempted after a pass that caught up completely.
+    """
+
+    def __init__(self, engine, interval: float):
+        self.engine = engine
+        self.interval = interval
+        self.runs = 0
+        self.last_result: Optional[Dict[str, int]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def checkpoint(self, mode: str = "PASSIVE") -> Dict[str, int]:
+        """Run one checkpoint and return SQLite's busy / log / checkpointed page counts"""
+        # A raw connection: checkpoints must run outside any transaction
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"PRAGMA wal_checkpoint({mode})")
+            busy, log, checkpointed = cursor.fetchone()
+            cursor.close()
+        finally:
+            connection.close()
+        self.runs += 1
+        self.last_result = {"busy": busy, "log_pages": log, "checkpointed_pages": checkpointed}
+        return self.last_result
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                result = self.checkpoint()
+                if not result["busy"] and result["log_pages"] == result["checkpointed_pages"] > 0:
+                    self.checkpoint("TRUNCATE")
+            except Exception as e:
+                print(f"Error checkpointing WAL: {str(e)}")
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="wal-checkpoint", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,42 @@
+"""Process pool for CPU-bound document rendering"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.core.config import get_settings
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+_render_pool_lock = threading.Lock()
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    """Return the process-wide render pool, started on first use.
+
+    Workers are spawned rather than forked, so they never inherit the
+    parent's database connections or locks; they only import the
+    rendering function they are handed.
+    """
+    global _render_pool
+    if _render_pool is None:
+        with _render_pool_lock:
+            if _render_pool is None:
+                _render_pool = ProcessPoolExecutor(
+                    max_workers=get_settings().RENDER_WORKERS or None,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _render_pool
+
+
+def render_pool_size() -> int:
+    """Number of worker processes in the render pool"""
+    return get_render_pool()._max_workers
+
+
+def shutdown_render_pool() -> None:
+    """Stop the render pool's workers; the next use starts a new pool"""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown(wait=True, cancel_futures=True)
+            _render_pool = None
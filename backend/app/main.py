@@ -1,13 +1,20 @@
 from fastapi import FastAPI, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.core.database import init_db, get_db
+from app.api.dependencies import get_current_user
+from app.core.database import (
+    init_db, get_db, get_pool_stats, start_wal_checkpointer, stop_wal_checkpointer
+)
+from app.core.db_pool import pool_gauges
+from app.core.metrics import register_collector, render_metrics
+from app.core.middleware import MetricsMiddleware, ProfilingMiddleware
+from app.core.workers import shutdown_render_pool
 from app.api.v1 import (
     auth, users, products, categories,
-    customers, orders, inventory, payment, reports
+    customers, orders, inventory, payment, reports, catalog, admin
 )
 
 settings = get_settings()
@@ -26,11 +33,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        router=app.router,
+        header=settings.PROFILE_HEADER,
+        interval=settings.PROFILE_INTERVAL_MS / 1000,
+    )
+if settings.METRICS_ENABLED or settings.SERVER_TIMING_ENABLED or settings.REQUEST_LOG_ENABLED:
+    # Added last so it wraps everything else and times the whole request
+    app.add_middleware(
+        MetricsMiddleware,
+        record_metrics=settings.METRICS_ENABLED,
+        server_timing=settings.SERVER_TIMING_ENABLED,
+        log_requests=settings.REQUEST_LOG_ENABLED,
+    )
+if settings.METRICS_ENABLED:
+    register_collector(lambda: pool_gauges(get_pool_stats()))
+
 @app.on_event("startup")
 def startup_event():
     init_db()
+    start_wal_checkpointer()
     print("✓ Database initialized")
 
+@app.on_event("shutdown")
+def shutdown_event():
+    stop_wal_checkpointer()
+    shutdown_render_pool()
+
 @app.get("/")
 def root():
     return {"status": "running"}
@@ -40,6 +71,16 @@ def health(db: Session = Depends(get_db)):
     db.execute("SELECT 1")
     return {"database": "connected"}
 
+@app.get("/health/pool")
+def pool_health(current_user: dict = Depends(get_current_user)):
+    """Connection pool occupancy, checkout waits and timeouts per engine"""
+    return get_pool_stats()
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Request and connection pool metrics in Prometheus text format"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 # ROUTERS
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(users.router, prefix="/api/v1")
@@ -50,3 +91,5 @@ app.include_router(orders.router, prefix="/api/v1")
 app.include_router(inventory.router, prefix="/api/v1")
 app.include_router(payment.router, prefix="/api/v1")
 app.include_router(reports.router, prefix="/api/v1")
+app.include_router(catalog.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1")
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, DateTime, event
+from app.core.database import Base
+from datetime import datetime
+
+
+class CatalogState(Base):
+    """Single-row catalog version, bumped whenever products or categories change"""
+    __tablename__ = "catalog_state"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<CatalogState(version={self.version})>"
+
+
+class CatalogTombstone(Base):
+    """Deleted product or category, kept so terminals can sync deletions"""
+    __tablename__ = "catalog_tombstones"
+
+    id = Column(Integer, primary_key=True, index=True)
+    entity = Column(String(20), nullable=False)  # "product" or "category"
+    entity_id = Column(Integer, nullable=False)
+    version = Column(Integer, nullable=False, index=True)  # Catalog version of the delete
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<CatalogTombstone({self.entity}={self.entity_id}, version={self.version})>"
+
+
+@event.listens_for(CatalogState.__table__, "after_create")
+def _seed_catalog_state(target, connection, **kw):
+    # Writers only ever UPDATE the row, so concurrent first writes cannot race
+    connection.execute(target.insert().values(id=1, version=0, updated_at=datetime.utcnow()))
@@ -14,6 +14,7 @@ class Category(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    catalog_version = Column(Integer, default=0, nullable=False, index=True)  # Catalog version of the last write
 
     # Relationships
     products = relationship("Product", back_populates="category", cascade="all, delete-orphan", lazy="select")
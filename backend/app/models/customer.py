@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Numeric, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Numeric, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from datetime import datetime
@@ -7,6 +7,10 @@ from datetime import datetime
 class Customer(Base):
     """Customer model for managing customer information"""
     __tablename__ = "customers"
+    __table_args__ = (
+        # Supports keyset pagination newest first
+        Index("ix_customers_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     first_name = Column(String(50), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 import enum
@@ -18,6 +18,11 @@ class InventoryAction(str, enum.Enum):
 class InventoryLog(Base):
     """Inventory log model for tracking stock movements"""
     __tablename__ = "inventory_logs"
+    __table_args__ = (
+        # Support keyset pagination of the ledger and of one product's history
+        Index("ix_inventory_logs_created_at_id", "created_at", "id"),
+        Index("ix_inventory_logs_product_created_at_id", "product_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
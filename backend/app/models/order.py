@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 import enum
@@ -17,6 +17,10 @@ class OrderStatus(str, enum.Enum):
 class Order(Base):
     """Order model for managing customer orders"""
     __tablename__ = "orders"
+    __table_args__ = (
+        # Supports keyset pagination newest first
+        Index("ix_orders_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     order_number = Column(String(50), unique=True, nullable=False, index=True)
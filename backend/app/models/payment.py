@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 import enum
@@ -28,6 +28,10 @@ class PaymentStatus(str, enum.Enum):
 class Payment(Base):
     """Payment model for managing order payments"""
     __tablename__ = "payments"
+    __table_args__ = (
+        # Supports keyset pagination newest first
+        Index("ix_payments_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), nullable=False)
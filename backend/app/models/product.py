@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, Numeric, Boolean, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Text, Numeric, Boolean, DateTime, ForeignKey, event, func
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from datetime import datetime
@@ -21,7 +22,8 @@ class Product(Base):
     image_url = Column(String(500), nullable=True)
     category_id = Column(Integer, ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)
+    catalog_version = Column(Integer, default=0, nullable=False, index=True)  # Catalog version of the last write
 
     # Relationships
     category = relationship("Category", back_populates="products")
@@ -29,4 +31,84 @@ class Product(Base):
     inventory_logs = relationship("InventoryLog", back_populates="product", cascade="all, delete-orphan")
 
     def __repr__(self):
-        return f"<Product(id={self.id}, sku='{self.sku}', name='{self.name}', stock={self.stock_quantity})>"
\ No newline at end of file
+        return f"<Product(id={self.id}, sku='{self.sku}', name='{self.name}', stock={self.stock_quantity})>"
+
+
+# -------- Full-text search index --------
+# SQLite: an external-content FTS5 table over name/sku/barcode, kept in sync
+# by triggers. PostgreSQL: a GIN index over a tsvector expression, which the
+# database maintains itself. Other dialects fall back to ILIKE scans.
+PRODUCT_SEARCH_TABLE = "products_fts"
+
+PG_SEARCH_VECTOR = (
+    "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(sku, '') "
+    "|| ' ' || coalesce(barcode, ''))"
+)
+
+_SQLITE_SEARCH_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {PRODUCT_SEARCH_TABLE} USING fts5("
+    "name, sku, barcode, content='products', content_rowid='id', prefix='2 3')",
+    # SKU and barcode hits outrank name hits
+    f"INSERT INTO {PRODUCT_SEARCH_TABLE}({PRODUCT_SEARCH_TABLE}, rank) VALUES ('rank', 'bm25(1.0, 4.0, 4.0)')",
+    f"""CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO {PRODUCT_SEARCH_TABLE}(rowid, name, sku, barcode)
+        VALUES (new.id, new.name, new.sku, new.barcode);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO {PRODUCT_SEARCH_TABLE}({PRODUCT_SEARCH_TABLE}, rowid, name, sku, barcode)
+        VALUES ('delete', old.id, old.name, old.sku, old.barcode);
+    END""",
+    # Only searchable columns re-index; stock updates on every sale do not
+    f"""CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF name, sku, barcode ON products BEGIN
+        INSERT INTO {PRODUCT_SEARCH_TABLE}({PRODUCT_SEARCH_TABLE}, rowid, name, sku, barcode)
+        VALUES ('delete', old.id, old.name, old.sku, old.barcode);
+        INSERT INTO {PRODUCT_SEARCH_TABLE}(rowid, name, sku, barcode)
+        VALUES (new.id, new.name, new.sku, new.barcode);
+    END""",
+    f"INSERT INTO {PRODUCT_SEARCH_TABLE}({PRODUCT_SEARCH_TABLE}) VALUES ('rebuild')",
+)
+
+_POSTGRES_SEARCH_DDL = (
+    f"CREATE INDEX IF NOT EXISTS ix_products_search ON products USING gin ({PG_SEARCH_VECTOR})",
+)
+
+
+def create_product_search_index(connection) -> bool:
+    """Create the product search index if the dialect supports one.
+
+    Safe to run against an existing database: a missing SQLite index is
+    built from the products table. Returns False when ILIKE search must be used.
+    """
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (PRODUCT_SEARCH_TABLE,),
+        ).first()
+        if exists:
+            return True
+        statements = _SQLITE_SEARCH_DDL
+    elif dialect == "postgresql":
+        statements = _POSTGRES_SEARCH_DDL
+    else:
+        return False
+
+    try:
+        for statement in statements:
+            connection.exec_driver_sql(statement)
+    except OperationalError as e:
+        # SQLite built without FTS5
+        print(f"Product search index unavailable: {str(e)}")
+        return False
+    return True
+
+
+@event.listens_for(Product.__table__, "after_create")
+def _create_search_index(target, connection, **kw):
+    create_product_search_index(connection)
+
+
+@event.listens_for(Product.__table__, "before_drop")
+def _drop_search_index(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {PRODUCT_SEARCH_TABLE}")
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, Numeric, Date, DateTime, UniqueConstraint
+from app.core.database import Base
+from datetime import datetime
+
+
+class SalesDaily(Base):
+    """Daily sales rollup, maintained incrementally as orders change status"""
+    __tablename__ = "sales_daily"
+    __table_args__ = (
+        UniqueConstraint("sales_date", "user_id", name="uq_sales_daily_date_user"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    sales_date = Column(Date, nullable=False, index=True)  # UTC date the order was placed
+    user_id = Column(Integer, nullable=False)  # Cashier dimension (no FK: rollup outlives users)
+
+    # Every order placed, whatever its status
+    orders_placed = Column(Integer, nullable=False, default=0)
+    sales_placed = Column(Numeric(12, 2), nullable=False, default=0)
+    completed_orders = Column(Integer, nullable=False, default=0)
+
+    # Completed and refunded orders, as counted by the sales report
+    order_count = Column(Integer, nullable=False, default=0)
+    total_sales = Column(Numeric(12, 2), nullable=False, default=0)
+    total_tax = Column(Numeric(12, 2), nullable=False, default=0)
+    total_discount = Column(Numeric(12, 2), nullable=False, default=0)
+
+    refunded_orders = Column(Integer, nullable=False, default=0)
+    refunded_amount = Column(Numeric(12, 2), nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<SalesDaily(date={self.sales_date}, user_id={self.user_id}, orders={self.order_count}, sales={self.total_sales})>"
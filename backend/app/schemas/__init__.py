@@ -17,6 +17,10 @@ __all__ = [
     "ProductCreate",
     "ProductUpdate",
     "ProductResponse",
+    "ProductBulkFilter",
+    "ProductBulkChanges",
+    "ProductBulkUpdate",
+    "LabelSheetRequest",
     # Customer
     "CustomerBase",
     "CustomerCreate",
@@ -28,6 +32,9 @@ __all__ = [
     "OrderResponse",
     "OrderItemCreate",
     "OrderItemResponse",
+    "OrderBatchCreate",
+    "OrderBatchResult",
+    "OrderBatchResponse",
     # Payment
     "PaymentCreate",
     "PaymentUpdate",
@@ -38,6 +45,7 @@ __all__ = [
     # Generic
     "ResponseSchema",
     "PaginationParams",
+    "ProfileSamplingUpdate",
     "LoginRequest",
     "TokenResponse",
 ]
@@ -13,7 +13,7 @@ class InventoryLogCreate(BaseModel):
 class InventoryLogResponse(BaseModel):
     id: int
     product_id: int
-    user_id: int
+    user_id: Optional[int] = None
     action: str
     quantity_change: int
     quantity_before: int
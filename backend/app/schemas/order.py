@@ -5,6 +5,18 @@ from app.schemas.response import (
     OrderResponse,
     OrderItemCreate,
     OrderItemResponse,
+    OrderBatchCreate,
+    OrderBatchResult,
+    OrderBatchResponse,
 )
 
-__all__ = ["OrderCreate", "OrderUpdate", "OrderResponse", "OrderItemCreate", "OrderItemResponse"]
+__all__ = [
+    "OrderCreate",
+    "OrderUpdate",
+    "OrderResponse",
+    "OrderItemCreate",
+    "OrderItemResponse",
+    "OrderBatchCreate",
+    "OrderBatchResult",
+    "OrderBatchResponse",
+]
@@ -4,6 +4,19 @@ from app.schemas.response import (
     ProductCreate,
     ProductUpdate,
     ProductResponse,
+    ProductBulkFilter,
+    ProductBulkChanges,
+    ProductBulkUpdate,
+    LabelSheetRequest,
 )
 
-__all__ = ["ProductBase", "ProductCreate", "ProductUpdate", "ProductResponse"]
+__all__ = [
+    "ProductBase",
+    "ProductCreate",
+    "ProductUpdate",
+    "ProductResponse",
+    "ProductBulkFilter",
+    "ProductBulkChanges",
+    "ProductBulkUpdate",
+    "LabelSheetRequest",
+]
@@ -118,6 +118,42 @@ class ProductUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
+class ProductBulkFilter(BaseModel):
+    """Selects the products a bulk update applies to; criteria are ANDed"""
+    category_id: Optional[int] = None
+    skus: Optional[List[str]] = Field(None, min_length=1, max_length=10000)
+    product_ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+    is_active: Optional[bool] = None
+    all_products: bool = False  # Must be set to update the whole catalog
+
+
+class ProductBulkChanges(BaseModel):
+    """Changes a bulk update applies to every selected product"""
+    price: Optional[Decimal] = Field(None, decimal_places=2, gt=0)  # Set a fixed price
+    price_percent: Optional[Decimal] = Field(None, gt=-100)  # Or change it by a percentage
+    round_to: Optional[Decimal] = Field(None, gt=0)  # Round the new price to a multiple of this
+    cost_price: Optional[Decimal] = Field(None, decimal_places=2, ge=0)
+    min_stock_level: Optional[int] = Field(None, ge=0)
+    category_id: Optional[int] = None
+    is_active: Optional[bool] = None
+
+
+class ProductBulkUpdate(BaseModel):
+    """Bulk product update request"""
+    filter: ProductBulkFilter
+    changes: ProductBulkChanges
+
+
+class LabelSheetRequest(BaseModel):
+    """Barcode label sheet request; with no selection every active product is labelled"""
+    product_ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+    skus: Optional[List[str]] = Field(None, min_length=1, max_length=10000)
+    category_id: Optional[int] = None
+    format: str = Field("pdf", pattern="^(pdf|png)$")
+    barcode_format: str = "code128"
+    copies: int = Field(1, ge=1, le=100)
+
+
 class ProductResponse(ProductBase):
     """Product response schema"""
     id: int
@@ -243,6 +279,29 @@ class OrderResponse(BaseModel):
         from_attributes = True
 
 
+class OrderBatchCreate(BaseModel):
+    """Batch order creation schema for replaying offline terminal queues"""
+    orders: List[OrderCreate] = Field(..., min_length=1, max_length=500)
+
+
+class OrderBatchResult(BaseModel):
+    """Outcome of a single order within a batch"""
+    index: int
+    success: bool
+    order_id: Optional[int] = None
+    order_number: Optional[str] = None
+    total: Optional[Decimal] = None
+    status_code: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class OrderBatchResponse(BaseModel):
+    """Batch order creation response schema"""
+    created: int
+    failed: int
+    results: List[OrderBatchResult]
+
+
 # ============= Payment Schemas =============
 class PaymentCreate(BaseModel):
     """Payment creation schema"""
@@ -319,6 +378,12 @@ class PaginationParams(BaseModel):
     limit: int = Field(default=100, ge=1, le=1000)
 
 
+class ProfileSamplingUpdate(BaseModel):
+    """Share of a route's requests to profile; 0 stops sampling it"""
+    route: str = Field(..., min_length=1)
+    percent: float = Field(..., ge=0, le=100)
+
+
 class LoginRequest(BaseModel):
     """User login request schema"""
     username: str
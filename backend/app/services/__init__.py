@@ -6,6 +6,11 @@ from app.services.inventory_service import InventoryService
 from app.services.order_service import OrderService
 from app.services.payment_service import PaymentService
 from app.services.report_service import ReportService
+from app.services.rollup_service import SalesRollupService
+from app.services.catalog_service import CatalogService
+from app.services.import_service import ProductImportService
+from app.services.label_service import LabelService
+from app.services.invoice_service import InvoiceService
 
 __all__ = [
     "AuthService",
@@ -16,4 +21,9 @@ __all__ = [
     "OrderService",
     "PaymentService",
     "ReportService",
+    "SalesRollupService",
+    "CatalogService",
+    "ProductImportService",
+    "LabelService",
+    "InvoiceService",
 ]
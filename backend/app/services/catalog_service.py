@@ -0,0 +1,118 @@
+"""Catalog snapshot and delta sync service"""
+import gzip
+import json
+import threading
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.catalog import get_catalog_version
+from app.models import Category, CatalogTombstone, Product
+
+# Fields terminals sync. Stock is not versioned, so it is not part of the catalog.
+PRODUCT_SYNC_COLUMNS = (
+    Product.id,
+    Product.sku,
+    Product.name,
+    Product.description,
+    Product.barcode,
+    Product.price,
+    Product.cost_price,
+    Product.min_stock_level,
+    Product.is_active,
+    Product.image_url,
+    Product.category_id,
+    Product.catalog_version,
+    Product.updated_at,
+)
+
+CATEGORY_SYNC_COLUMNS = (
+    Category.id,
+    Category.name,
+    Category.description,
+    Category.is_active,
+    Category.catalog_version,
+    Category.updated_at,
+)
+
+
+class CatalogSnapshot:
+    """A full catalog serialized once, as plain and gzipped JSON"""
+
+    def __init__(self, version: int, body: bytes):
+        self.version = version
+        self.body = body
+        self.gzipped = gzip.compress(body, compresslevel=6, mtime=0)
+
+
+_snapshot: Optional[CatalogSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def _row_to_dict(row) -> Dict:
+    data = dict(row._mapping)
+    for field in ("price", "cost_price"):
+        if field in data:
+            data[field] = float(data[field]) if data[field] is not None else None
+    data["updated_at"] = data["updated_at"].isoformat() if data["updated_at"] else None
+    return data
+
+
+class CatalogService:
+    """Service for terminal catalog sync"""
+
+    @staticmethod
+    def _rows(db: Session, model, columns, since: Optional[int] = None) -> List[Dict]:
+        """Catalog rows, optionally only those written after version ``since``"""
+        query = select(*columns)
+        if since is not None:
+            query = query.where(model.catalog_version > since)
+        return [_row_to_dict(row) for row in db.execute(query.order_by(model.id)).all()]
+
+    @staticmethod
+    def get_snapshot(db: Session) -> CatalogSnapshot:
+        """Return the full catalog, rebuilt only when the catalog version moved"""
+        global _snapshot
+        # Read the version before the rows: a concurrent write may then be
+        # included early, and is harmlessly re-sent by the next delta
+        version = get_catalog_version(db)
+        snapshot = _snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        with _snapshot_lock:
+            if _snapshot is not None and _snapshot.version == version:
+                return _snapshot
+            payload = {
+                "version": version,
+                "categories": CatalogService._rows(db, Category, CATEGORY_SYNC_COLUMNS),
+                "products": CatalogService._rows(db, Product, PRODUCT_SYNC_COLUMNS),
+            }
+            body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+            _snapshot = CatalogSnapshot(version, body)
+            return _snapshot
+
+    @staticmethod
+    def get_changes(db: Session, since: int) -> Dict:
+        """Rows written and deleted after catalog version ``since``.
+
+        Clients apply ``deleted`` first, then upsert ``categories`` and
+        ``products``, and pass the returned ``version`` as the next ``since``.
+        """
+        version = get_catalog_version(db)
+        tombstones = db.query(CatalogTombstone.entity, CatalogTombstone.entity_id).filter(
+            CatalogTombstone.version > since
+        ).order_by(CatalogTombstone.version).all()
+
+        deleted = {"products": [], "categories": []}
+        for entity, entity_id in tombstones:
+            deleted["products" if entity == "product" else "categories"].append(entity_id)
+
+        return {
+            "version": version,
+            "since": since,
+            "categories": CatalogService._rows(db, Category, CATEGORY_SYNC_COLUMNS, since),
+            "products": CatalogService._rows(db, Product, PRODUCT_SYNC_COLUMNS, since),
+            "deleted": deleted,
+        }
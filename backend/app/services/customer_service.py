@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from app.models import Customer
 from app.schemas import CustomerCreate, CustomerUpdate
 from app.core.exceptions import not_found_exception, conflict_exception
+from app.utils.pagination import keyset_page
 from typing import Optional, Tuple
 from decimal import Decimal
 
@@ -91,6 +92,24 @@ class CustomerService:
         customers = query.offset(skip).limit(limit).all()
         return customers, total
 
+    @staticmethod
+    def list_customers_keyset(
+        db: Session,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        is_active: Optional[bool] = True,
+        include_total: bool = False,
+    ) -> Tuple[list[Customer], Optional[str], Optional[int]]:
+        """List customers newest first using cursor pagination"""
+        query = db.query(Customer)
+
+        if is_active is not None:
+            query = query.filter(Customer.is_active == is_active)
+
+        total = query.count() if include_total else None
+        customers, next_cursor = keyset_page(query, Customer, limit, cursor)
+        return customers, next_cursor, total
+
     @staticmethod
     def add_loyalty_points(db: Session, customer_id: int, points: int) -> Customer:
         """Add loyalty points to customer"""
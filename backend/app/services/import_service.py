@@ -0,0 +1,239 @@
+"""Bulk product import service"""
+import csv
+import io
+from datetime import datetime
+from typing import IO, Dict, Iterable, Iterator, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import bad_request_exception
+from app.models import Category, InventoryAction, InventoryLog, Product
+from app.schemas import ProductCreate
+
+IMPORT_CHUNK_SIZE = 1000
+
+# Per-row errors beyond this are counted but not listed
+MAX_REPORTED_ERRORS = 1000
+
+# Columns an import may overwrite on an existing product; stock is only
+# set for new products and otherwise moves through the inventory ledger
+UPSERT_COLUMNS = (
+    "name",
+    "description",
+    "barcode",
+    "price",
+    "cost_price",
+    "min_stock_level",
+    "category_id",
+    "image_url",
+)
+
+
+class ProductImportService:
+    """Service for streaming product imports"""
+
+    @staticmethod
+    def iter_csv_rows(stream: IO[bytes]) -> Iterator[Dict]:
+        """Yield CSV rows as dicts keyed by the header line"""
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        try:
+            yield from csv.DictReader(text)
+        finally:
+            text.detach()  # leave the underlying upload open for its owner
+
+    @staticmethod
+    def iter_xlsx_rows(stream: IO[bytes]) -> Iterator[Dict]:
+        """Yield rows of the first worksheet as dicts keyed by the header row"""
+        try:
+            import openpyxl
+        except ImportError:
+            raise bad_request_exception("XLSX import requires the openpyxl package")
+
+        workbook = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+            for values in rows:
+                yield dict(zip(header, values))
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def iter_rows(stream: IO[bytes], filename: str) -> Iterator[Dict]:
+        """Pick the reader from the file extension"""
+        name = (filename or "").lower()
+        if name.endswith(".xlsx"):
+            return ProductImportService.iter_xlsx_rows(stream)
+        if name.endswith(".csv"):
+            return ProductImportService.iter_csv_rows(stream)
+        raise bad_request_exception("Unsupported file type; upload a .csv or .xlsx file")
+
+    @staticmethod
+    def _clean(row: Dict) -> Dict:
+        """Drop blank cells so schema defaults apply"""
+        cleaned = {}
+        for key, value in row.items():
+            if key is None:
+                continue
+            if isinstance(value, str):
+                value = value.strip()
+            if value is None or value == "":
+                continue
+            cleaned[key.strip()] = value
+        return cleaned
+
+    @staticmethod
+    def import_products(
+        db: Session,
+        rows: Iterable[Dict],
+        user_id: int,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+    ) -> Dict:
+        """Validate and upsert products by SKU, one transaction per chunk.
+
+        New products get their ``stock_quantity`` as initial stock, logged
+        as STOCK_IN; existing products keep their stock. Returns counts and
+        a per-row error report (row numbers count the header as row 1).
+        """
+        report = {"processed": 0, "created": 0, "updated": 0, "failed": 0, "errors": []}
+        category_ids = {row[0] for row in db.query(Category.id).all()}
+        seen_skus: Dict[str, int] = {}
+        seen_barcodes: Dict[str, str] = {}
+
+        chunk: List[Tuple[int, ProductCreate]] = []
+        for row_number, row in enumerate(rows, start=2):
+            report["processed"] += 1
+            try:
+                product = ProductCreate(**ProductImportService._clean(row))
+            except ValidationError as e:
+                messages = [
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                    for error in e.errors()
+                ]
+                ProductImportService._fail(report, row_number, row.get("sku"), messages)
+                continue
+
+            problem = None
+            if product.sku in seen_skus:
+                problem = f"sku: duplicate of row {seen_skus[product.sku]}"
+            elif product.barcode and seen_barcodes.get(product.barcode, product.sku) != product.sku:
+                problem = f"barcode: already used by SKU {seen_barcodes[product.barcode]} in this file"
+            elif product.category_id is not None and product.category_id not in category_ids:
+                problem = f"category_id: category {product.category_id} not found"
+            if problem:
+                ProductImportService._fail(report, row_number, product.sku, [problem])
+                continue
+
+            seen_skus[product.sku] = row_number
+            if product.barcode:
+                seen_barcodes[product.barcode] = product.sku
+            chunk.append((row_number, product))
+            if len(chunk) >= chunk_size:
+                ProductImportService._import_chunk(db, chunk, user_id, report)
+                chunk = []
+
+        if chunk:
+            ProductImportService._import_chunk(db, chunk, user_id, report)
+        return report
+
+    @staticmethod
+    def _fail(report: Dict, row_number: int, sku, messages: List[str]) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"row": row_number, "sku": sku, "errors": messages})
+
+    @staticmethod
+    def _import_chunk(
+        db: Session, chunk: List[Tuple[int, ProductCreate]], user_id: int, report: Dict
+    ) -> None:
+        """Upsert one chunk with a single multi-row statement and commit it"""
+        skus = [product.sku for _, product in chunk]
+        existing = {
+            sku for (sku,) in db.query(Product.sku).filter(Product.sku.in_(skus)).all()
+        }
+
+        # A barcode may only move with its SKU
+        barcodes = [product.barcode for _, product in chunk if product.barcode]
+        barcode_owners = dict(
+            db.query(Product.barcode, Product.sku).filter(Product.barcode.in_(barcodes)).all()
+        ) if barcodes else {}
+
+        valid = []
+        for row_number, product in chunk:
+            owner = barcode_owners.get(product.barcode)
+            if owner is not None and owner != product.sku:
+                ProductImportService._fail(
+                    report, row_number, product.sku, [f"barcode: already used by SKU {owner}"]
+                )
+                continue
+            valid.append((row_number, product))
+        if not valid:
+            return
+
+        now = datetime.utcnow()
+        values = [
+            {
+                **product.model_dump(include={"sku", *UPSERT_COLUMNS}),
+                "stock_quantity": 0 if product.sku in existing else product.stock_quantity,
+                "is_active": True,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for _, product in valid
+        ]
+
+        try:
+            dialect = db.get_bind().dialect.name
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as upsert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as upsert
+
+            # Core statements skip the ORM bulk layer's per-row bookkeeping
+            stmt = upsert(Product.__table__)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["sku"],
+                set_={
+                    **{column: stmt.excluded[column] for column in UPSERT_COLUMNS},
+                    "catalog_version": stmt.excluded.catalog_version,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+            table = Product.__table__
+            ids = dict(
+                (sku, product_id)
+                for product_id, sku in db.execute(stmt.returning(table.c.id, table.c.sku), values)
+            )
+
+            logs = [
+                {
+                    "product_id": ids[product.sku],
+                    "user_id": user_id,
+                    "action": InventoryAction.STOCK_IN,
+                    "quantity_change": product.stock_quantity,
+                    "quantity_before": 0,
+                    "quantity_after": product.stock_quantity,
+                    "reference_number": "INITIAL_STOCK",
+                    "notes": "Product import",
+                    "created_at": now,
+                }
+                for _, product in valid
+                if product.sku not in existing and product.stock_quantity > 0
+            ]
+            if logs:
+                db.execute(insert(InventoryLog.__table__), logs)
+
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            message = str(e.orig) if getattr(e, "orig", None) else str(e)
+            for row_number, product in valid:
+                ProductImportService._fail(report, row_number, product.sku, [f"database: {message}"])
+            return
+
+        created = sum(1 for _, product in valid if product.sku not in existing)
+        report["created"] += created
+        report["updated"] += len(valid) - created
@@ -1,13 +1,159 @@
+from sqlalchemy import case, update
 from sqlalchemy.orm import Session
 from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from app.models.inventory_log import InventoryLog
+from app.core.catalog import STOCK_UPDATE_OPTION
+from app.models.inventory_log import InventoryLog, InventoryAction
 from app.models.product import Product
 from app.schemas.inventory import InventoryLogCreate
+from app.utils.pagination import keyset_page
+
+# Columns written by the streaming export, in output order
+LOG_EXPORT_COLUMNS = (
+    InventoryLog.id,
+    InventoryLog.product_id,
+    InventoryLog.user_id,
+    InventoryLog.action,
+    InventoryLog.quantity_change,
+    InventoryLog.quantity_before,
+    InventoryLog.quantity_after,
+    InventoryLog.reference_number,
+    InventoryLog.notes,
+    InventoryLog.created_at,
+)
+
+
+class InsufficientStockError(ValueError):
+    """Raised when a stock decrement would take a product below zero"""
+
+    def __init__(self, product_ids: List[int]):
+        self.product_ids = product_ids
+        super().__init__("Insufficient stock")
 
 
 class InventoryService:
 
+    @staticmethod
+    def lock_products(db: Session, product_ids: Iterable[int]) -> Dict[int, Product]:
+        """Load products in a single query and hold them locked until commit.
+
+        Postgres takes ``SELECT ... FOR UPDATE`` row locks. SQLite has no row
+        locks, so a no-op UPDATE takes the database write lock up front
+        instead; concurrent writers then queue behind this transaction rather
+        than reading stock that is about to change.
+        """
+        ids = sorted(set(product_ids))  # stable lock order avoids deadlocks
+        if not ids:
+            return {}
+
+        if db.get_bind().dialect.name == "sqlite":
+            db.execute(
+                update(Product)
+                .where(Product.id.in_(ids))
+                .values(stock_quantity=Product.stock_quantity, updated_at=Product.updated_at)
+                .execution_options(synchronize_session=False, **{STOCK_UPDATE_OPTION: ()})
+            )
+
+        products = (
+            db.query(Product)
+            .filter(Product.id.in_(ids))
+            .order_by(Product.id)
+            .with_for_update()
+            .all()
+        )
+        return {product.id: product for product in products}
+
+    @staticmethod
+    def apply_stock_changes(db: Session, quantity_changes: Dict[int, int]) -> Dict[int, int]:
+        """Atomically apply stock deltas and return the new quantity per product.
+
+        All deltas go out as one guarded statement,
+        ``UPDATE products SET stock_quantity = stock_quantity + delta
+        WHERE id IN (...) AND stock_quantity + delta >= 0 RETURNING ...``,
+        so the check and the write cannot interleave with another checkout.
+        If any row fails the guard nothing is committed: the caller's
+        transaction must be rolled back.
+        """
+        changes = {pid: delta for pid, delta in quantity_changes.items() if delta}
+        if not changes:
+            return {}
+
+        delta = case(changes, value=Product.id)
+        rows = db.execute(
+            update(Product)
+            .where(Product.id.in_(sorted(changes)))
+            .where(Product.stock_quantity + delta >= 0)
+            .values(stock_quantity=Product.stock_quantity + delta)
+            .returning(Product.id, Product.stock_quantity)
+            .execution_options(synchronize_session="fetch", **{STOCK_UPDATE_OPTION: sorted(changes)})
+        ).all()
+        new_quantities = {row[0]: row[1] for row in rows}
+
+        failed = [pid for pid in changes if pid not in new_quantities]
+        if failed:
+            existing = {
+                row[0] for row in db.query(Product.id).filter(Product.id.in_(failed)).all()
+            }
+            missing = [pid for pid in failed if pid not in existing]
+            if missing:
+                raise ValueError(f"Product {missing[0]} not found")
+            raise InsufficientStockError(failed)
+
+        return new_quantities
+
+    @staticmethod
+    def log_inventory_changes(
+        db: Session,
+        quantity_changes: Dict[int, int],
+        user_id: Optional[int],
+        action: InventoryAction,
+        reference_number: Optional[str] = None,
+        notes: Optional[str] = None,
+    ) -> List[InventoryLog]:
+        """Apply a batch of stock changes and record them, without committing"""
+        new_quantities = InventoryService.apply_stock_changes(db, quantity_changes)
+        now = datetime.utcnow()
+
+        logs = [
+            InventoryLog(
+                product_id=product_id,
+                user_id=user_id,
+                action=action,
+                quantity_change=quantity_change,
+                quantity_before=new_quantities[product_id] - quantity_change,
+                quantity_after=new_quantities[product_id],
+                reference_number=reference_number,
+                notes=notes,
+                created_at=now,
+            )
+            for product_id, quantity_change in quantity_changes.items()
+            if quantity_change
+        ]
+        db.add_all(logs)
+        return logs
+
+    @staticmethod
+    def log_inventory_change(
+        db: Session,
+        product_id: int,
+        user_id: Optional[int],
+        action: InventoryAction,
+        quantity_change: int,
+        reference_number: Optional[str] = None,
+        notes: Optional[str] = None,
+    ) -> InventoryLog:
+        """Apply a single stock change and record it, without committing"""
+        logs = InventoryService.log_inventory_changes(
+            db,
+            {product_id: quantity_change},
+            user_id=user_id,
+            action=action,
+            reference_number=reference_number,
+            notes=notes,
+        )
+        return logs[0]
+
     @staticmethod
     def create_inventory_log(
         db: Session,
@@ -15,55 +161,114 @@ class InventoryService:
         user_id: int,
         data: InventoryLogCreate,
     ):
-        # 1. Load product
-        product = db.query(Product).filter(Product.id == product_id).first()
-        if not product:
-            raise ValueError("Product not found")
-
-        # 2. Validate action
+        # 1. Validate action
         if data.action not in ["stock_in", "stock_out"]:
             raise ValueError("Invalid action")
 
-        # 3. Current quantity (note: stock_quantity)
-        qty_before = product.stock_quantity
-
-        # 4. Compute after quantity
+        # 2. Signed change: stock_out removes stock
         if data.action == "stock_in":
-            qty_after = qty_before + data.quantity_change
-        else:  # stock_out
-            if qty_before < data.quantity_change:
-                raise ValueError("Insufficient stock")
-            qty_after = qty_before - data.quantity_change
-
-        # 5. Create log row
-        log = InventoryLog(
-            product_id=product_id,
-            user_id=user_id,
-            action=data.action.upper(),  # store as STOCK_IN / STOCK_OUT
-            quantity_change=data.quantity_change,
-            quantity_before=qty_before,
-            quantity_after=qty_after,
-            reference_number=data.reference_number,
-            notes=data.notes,
-            created_at=datetime.utcnow(),
-        )
+            quantity_change = data.quantity_change
+        else:
+            quantity_change = -data.quantity_change
 
-        # 6. Update product stock
-        product.stock_quantity = qty_after
+        # 3. Guarded update and log row in one transaction
+        try:
+            log = InventoryService.log_inventory_change(
+                db=db,
+                product_id=product_id,
+                user_id=user_id,
+                action=InventoryAction(data.action),
+                quantity_change=quantity_change,
+                reference_number=data.reference_number,
+                notes=data.notes,
+            )
+        except ValueError:
+            db.rollback()
+            raise
 
-        db.add(log)
         db.commit()
         db.refresh(log)
 
         return log
 
     @staticmethod
-    def get_all_logs(db: Session):
-        return (
-            db.query(InventoryLog)
-            .order_by(InventoryLog.created_at.desc())
-            .all()
+    def _filtered_logs_query(
+        db: Session,
+        product_id: Optional[int] = None,
+        action: Optional[str] = None,
+        user_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        columns: Optional[tuple] = None,
+    ):
+        """Base query for inventory log listings"""
+        query = db.query(*columns) if columns else db.query(InventoryLog)
+
+        if product_id is not None:
+            query = query.filter(InventoryLog.product_id == product_id)
+
+        if action is not None:
+            try:
+                query = query.filter(InventoryLog.action == InventoryAction(action))
+            except ValueError:
+                raise ValueError(f"Invalid action: {action}")
+
+        if user_id is not None:
+            query = query.filter(InventoryLog.user_id == user_id)
+
+        if start_date is not None:
+            query = query.filter(InventoryLog.created_at >= start_date)
+
+        if end_date is not None:
+            query = query.filter(InventoryLog.created_at <= end_date)
+
+        return query
+
+    @staticmethod
+    def get_all_logs(
+        db: Session,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        product_id: Optional[int] = None,
+        action: Optional[str] = None,
+        user_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Tuple[List[InventoryLog], Optional[str]]:
+        """Page through logs newest first; returns the logs and the next cursor"""
+        query = InventoryService._filtered_logs_query(
+            db, product_id, action, user_id, start_date, end_date
         )
+        return keyset_page(query, InventoryLog, limit, cursor)
+
+    @staticmethod
+    def iter_logs(
+        db: Session,
+        product_id: Optional[int] = None,
+        action: Optional[str] = None,
+        user_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Dict]:
+        """Stream matching logs newest first with bounded memory.
+
+        Plain column rows are fetched ``batch_size`` at a time through a
+        server-side cursor (``yield_per``), so the ledger is never
+        materialized in full.
+        """
+        query = InventoryService._filtered_logs_query(
+            db, product_id, action, user_id, start_date, end_date, columns=LOG_EXPORT_COLUMNS
+        )
+        rows = (
+            query.order_by(InventoryLog.created_at.desc(), InventoryLog.id.desc())
+            .execution_options(stream_results=True)
+            .yield_per(batch_size)
+        )
+        for row in rows:
+            log = row._asdict()
+            log["action"] = log["action"].value
+            yield log
 
     @staticmethod
     def get_log_by_id(db: Session, log_id: int):
@@ -74,12 +279,24 @@ class InventoryService:
         )
 
     @staticmethod
-    def get_product_history(db: Session, product_id: int):
-        return (
-            db.query(InventoryLog)
-            .filter(InventoryLog.product_id == product_id)
-            .order_by(InventoryLog.created_at.desc())
-            .all()
+    def get_product_history(
+        db: Session,
+        product_id: int,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        action: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Tuple[List[InventoryLog], Optional[str]]:
+        """Page through a product's logs newest first"""
+        return InventoryService.get_all_logs(
+            db,
+            limit=limit,
+            cursor=cursor,
+            product_id=product_id,
+            action=action,
+            start_date=start_date,
+            end_date=end_date,
         )
 
     @staticmethod
@@ -0,0 +1,172 @@
+"""Barcode label sheet rendering service"""
+import tempfile
+from typing import Dict, IO, Iterator, List, Optional
+
+import barcode
+from PIL import Image, ImageDraw, ImageFont
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.exceptions import bad_request_exception
+from app.core.workers import get_render_pool, render_pool_size
+from app.models import Product
+from app.utils.barcode_generator import render_barcode_to_cache
+
+# Fewer uncached barcodes than this render inline; a pool round trip costs more
+PARALLEL_RENDER_THRESHOLD = 16
+
+# Letter sheet of 3 x 10 labels, 2.625" x 1" (Avery 5160 layout)
+PDF_COLUMNS, PDF_ROWS = 3, 10
+PDF_LABEL_WIDTH, PDF_LABEL_HEIGHT = 2.625 * inch, 1.0 * inch
+PDF_MARGIN_X, PDF_MARGIN_Y, PDF_GUTTER_X = 0.1875 * inch, 0.5 * inch, 0.125 * inch
+
+# PNG sheets: 3 labels per row at 300 dpi, drawn on one canvas held in
+# memory (about 7 MB per row of three), so they are capped well below PDF
+PNG_COLUMNS = 3
+PNG_LABEL_WIDTH, PNG_LABEL_HEIGHT = 788, 300
+PNG_MAX_LABELS = 60
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+class LabelService:
+    """Service for printing barcode label sheets"""
+
+    @staticmethod
+    def get_label_items(
+        db: Session,
+        product_ids: Optional[List[int]] = None,
+        skus: Optional[List[str]] = None,
+        category_id: Optional[int] = None,
+    ) -> List[Dict]:
+        """Products to label, each with the code to print (barcode, else SKU)"""
+        query = db.query(Product.id, Product.sku, Product.barcode, Product.name, Product.price)
+        if product_ids:
+            query = query.filter(Product.id.in_(product_ids))
+        if skus:
+            query = query.filter(Product.sku.in_(skus))
+        if category_id is not None:
+            query = query.filter(Product.category_id == category_id)
+        if not (product_ids or skus or category_id is not None):
+            query = query.filter(Product.is_active == True)
+
+        return [
+            {"code": row.barcode or row.sku, "name": row.name, "price": row.price}
+            for row in query.order_by(Product.name, Product.id).all()
+        ]
+
+    @staticmethod
+    def render_barcodes(codes: List[str], barcode_format: str = "code128") -> Dict[str, str]:
+        """Return a cached PNG path per code, rendering misses across the process pool"""
+        if barcode_format not in barcode.PROVIDED_BARCODES:
+            raise bad_request_exception(f"Unsupported barcode format: {barcode_format}")
+
+        cache_dir = get_settings().LABEL_CACHE_DIR
+        unique = list(dict.fromkeys(codes))
+        if len(unique) < PARALLEL_RENDER_THRESHOLD:
+            paths = [render_barcode_to_cache(code, barcode_format, cache_dir) for code in unique]
+        else:
+            paths = list(get_render_pool().map(
+                render_barcode_to_cache,
+                unique,
+                [barcode_format] * len(unique),
+                [cache_dir] * len(unique),
+                chunksize=max(1, len(unique) // (render_pool_size() * 4)),
+            ))
+
+        failed = [code for code, path in zip(unique, paths) if path is None]
+        if failed:
+            raise bad_request_exception(
+                f"Cannot encode as {barcode_format}: {', '.join(failed[:10])}"
+            )
+        return dict(zip(unique, paths))
+
+    @staticmethod
+    def render_sheet(
+        items: List[Dict],
+        output: str = "pdf",
+        barcode_format: str = "code128",
+        copies: int = 1,
+    ) -> IO[bytes]:
+        """Render label sheets into a spooled temp file positioned at its start"""
+        if not items:
+            raise bad_request_exception("No products to label")
+        if output not in ("pdf", "png"):
+            raise bad_request_exception("Output must be pdf or png")
+        if output == "png" and len(items) * copies > PNG_MAX_LABELS:
+            raise bad_request_exception(
+                f"PNG sheets hold at most {PNG_MAX_LABELS} labels; use PDF for larger runs"
+            )
+
+        paths = LabelService.render_barcodes([item["code"] for item in items], barcode_format)
+        labels = [item for item in items for _ in range(copies)]
+
+        sheet = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        if output == "pdf":
+            LabelService._draw_pdf(sheet, labels, paths)
+        else:
+            LabelService._draw_png(sheet, labels, paths)
+        sheet.seek(0)
+        return sheet
+
+    @staticmethod
+    def _draw_pdf(sheet: IO[bytes], labels: List[Dict], paths: Dict[str, str]) -> None:
+        pdf = canvas.Canvas(sheet, pagesize=letter)
+        page_height = letter[1]
+        per_page = PDF_COLUMNS * PDF_ROWS
+        for index, label in enumerate(labels):
+            if index and index % per_page == 0:
+                pdf.showPage()
+            column = index % PDF_COLUMNS
+            row = (index % per_page) // PDF_COLUMNS
+            x = PDF_MARGIN_X + column * (PDF_LABEL_WIDTH + PDF_GUTTER_X)
+            y = page_height - PDF_MARGIN_Y - (row + 1) * PDF_LABEL_HEIGHT
+
+            pdf.setFont("Helvetica-Bold", 7)
+            pdf.drawString(x + 4, y + PDF_LABEL_HEIGHT - 10, label["name"][:40])
+            pdf.drawRightString(x + PDF_LABEL_WIDTH - 4, y + PDF_LABEL_HEIGHT - 10, f"${label['price']:.2f}")
+            # Same path, same image XObject: each barcode is embedded once
+            pdf.drawImage(
+                paths[label["code"]], x + 4, y + 2,
+                width=PDF_LABEL_WIDTH - 8, height=PDF_LABEL_HEIGHT - 16,
+                preserveAspectRatio=True,
+            )
+        pdf.save()
+
+    @staticmethod
+    def _draw_png(sheet: IO[bytes], labels: List[Dict], paths: Dict[str, str]) -> None:
+        rows = (len(labels) + PNG_COLUMNS - 1) // PNG_COLUMNS
+        image = Image.new("RGB", (PNG_COLUMNS * PNG_LABEL_WIDTH, rows * PNG_LABEL_HEIGHT), "white")
+        draw = ImageDraw.Draw(image)
+        font = ImageFont.load_default()
+        barcodes: Dict[str, Image.Image] = {}
+
+        for index, label in enumerate(labels):
+            x = (index % PNG_COLUMNS) * PNG_LABEL_WIDTH
+            y = (index // PNG_COLUMNS) * PNG_LABEL_HEIGHT
+            code = label["code"]
+            if code not in barcodes:
+                with Image.open(paths[code]) as rendered:
+                    barcode_image = rendered.convert("RGB")
+                barcode_image.thumbnail((PNG_LABEL_WIDTH - 20, PNG_LABEL_HEIGHT - 40))
+                barcodes[code] = barcode_image
+
+            draw.text((x + 10, y + 8), label["name"][:60], fill="black", font=font)
+            draw.text((x + PNG_LABEL_WIDTH - 80, y + 8), f"${label['price']:.2f}", fill="black", font=font)
+            image.paste(barcodes[code], (x + 10, y + 32))
+
+        image.save(sheet, format="PNG", optimize=False)
+
+    @staticmethod
+    def iter_file(stream: IO[bytes]) -> Iterator[bytes]:
+        """Stream a rendered sheet in chunks, closing it at the end"""
+        try:
+            while True:
+                chunk = stream.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            stream.close()
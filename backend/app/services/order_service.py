@@ -1,15 +1,33 @@
 """Order service"""
-from sqlalchemy.orm import Session
-from app.models import Order, OrderItem, OrderStatus, Product, Customer, InventoryAction
+from fastapi import HTTPException
+from sqlalchemy.orm import Session, joinedload, selectinload
+from app.models import Order, OrderItem, OrderStatus, Customer, Product, InventoryLog, InventoryAction
 from app.schemas import OrderCreate, OrderUpdate
+from app.core.database import async_variant
 from app.core.exceptions import not_found_exception, bad_request_exception
-from app.services.inventory_service import InventoryService
-from typing import Optional, Tuple
+from app.core.sqlite import begin_immediate
+from app.services.inventory_service import InventoryService, InsufficientStockError
+from app.services.rollup_service import SalesRollupService
+from app.utils.pagination import keyset_page
+from typing import Dict, Iterator, List, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime
 import uuid
 
 
+# Named eager-loading profiles. "response" loads everything OrderResponse
+# reads, so serializing a page of orders costs a fixed number of queries.
+ORDER_LOADER_PROFILES = {
+    "response": (
+        selectinload(Order.order_items),
+        joinedload(Order.customer),
+        joinedload(Order.user),
+    ),
+    "items": (selectinload(Order.order_items),),
+    "invoice": (selectinload(Order.order_items), joinedload(Order.customer)),
+}
+
+
 class OrderService:
     """Service for order operations"""
 
@@ -19,45 +37,69 @@ class OrderService:
         return f"ORD-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8].upper()}"
 
     @staticmethod
-    def create_order(db: Session, order_create: OrderCreate, user_id: int) -> Order:
-        """Create a new order"""
-        # Validate customer if provided
-        if order_create.customer_id:
-            customer = db.query(Customer).filter(Customer.id == order_create.customer_id).first()
-            if not customer:
-                raise not_found_exception("Customer not found")
+    def _requested_quantities(order_create: OrderCreate) -> Dict[int, int]:
+        """Total quantity requested per product across all order lines"""
+        requested_quantities = {}
+        for item in order_create.order_items:
+            requested_quantities[item.product_id] = (
+                requested_quantities.get(item.product_id, 0) + item.quantity
+            )
+        return requested_quantities
 
-        # Validate order items
+    @staticmethod
+    def _validate_order(
+        order_create: OrderCreate,
+        products: Dict[int, Product],
+        available: Dict[int, int],
+    ) -> Dict[int, int]:
+        """Check items, product existence and stock; return requested quantities"""
         if not order_create.order_items:
             raise bad_request_exception("Order must have at least one item")
 
-        # Calculate order totals
+        requested_quantities = OrderService._requested_quantities(order_create)
+        for product_id, quantity in requested_quantities.items():
+            product = products.get(product_id)
+            if not product:
+                raise not_found_exception(f"Product {product_id} not found")
+            if available[product_id] < quantity:
+                raise bad_request_exception(
+                    f"Insufficient stock for {product.name}. Available: {available[product_id]}, Requested: {quantity}"
+                )
+        return requested_quantities
+
+    @staticmethod
+    def _build_order(
+        order_create: OrderCreate, user_id: int, products: Dict[int, Product]
+    ) -> Order:
+        """Build an unsaved order with its items priced from the given products"""
         subtotal = Decimal("0")
-        order_items_data = []
+        order_items = []
 
         for item in order_create.order_items:
-            product = db.query(Product).filter(Product.id == item.product_id).first()
-            if not product:
-                raise not_found_exception(f"Product {item.product_id} not found")
+            product = products[item.product_id]
 
             unit_price = item.unit_price or product.price
             item_subtotal = unit_price * item.quantity - item.discount
             subtotal += item_subtotal
 
-            order_items_data.append({
-                "product": product,
-                "item": item,
-                "unit_price": unit_price,
-                "subtotal": item_subtotal,
-            })
+            order_items.append(
+                OrderItem(
+                    product_id=product.id,
+                    product_name=product.name,
+                    product_sku=product.sku,
+                    quantity=item.quantity,
+                    unit_price=unit_price,
+                    discount=item.discount or Decimal("0"),
+                    subtotal=item_subtotal,
+                )
+            )
 
         # Calculate totals
         tax = order_create.tax or Decimal("0")
         discount = order_create.discount or Decimal("0")
         total = subtotal + tax - discount
 
-        # Create order
-        db_order = Order(
+        return Order(
             order_number=OrderService._generate_order_number(),
             customer_id=order_create.customer_id,
             user_id=user_id,
@@ -66,60 +108,172 @@ class OrderService:
             discount=discount,
             total=total,
             notes=order_create.notes,
+            order_items=order_items,
+            created_at=datetime.utcnow(),
         )
 
-        db.add(db_order)
-        db.flush()  # Flush to get the order ID
+    @staticmethod
+    def create_order(db: Session, order_create: OrderCreate, user_id: int) -> Order:
+        """Create a new order"""
+        # Checkout always writes; on SQLite take the write lock before reading
+        begin_immediate(db)
 
-        # Create order items and reduce inventory
-        for item_data in order_items_data:
-            product = item_data["product"]
-            item = item_data["item"]
-            unit_price = item_data["unit_price"]
+        # Validate customer if provided
+        if order_create.customer_id:
+            customer = db.query(Customer).filter(Customer.id == order_create.customer_id).first()
+            if not customer:
+                raise not_found_exception("Customer not found")
 
-            # Check stock
-            if product.stock_quantity < item.quantity:
-                raise bad_request_exception(
-                    f"Insufficient stock for {product.name}. Available: {product.stock_quantity}, Requested: {item.quantity}"
-                )
+        # Resolve every product in one round-trip, locked until commit
+        products = InventoryService.lock_products(
+            db, OrderService._requested_quantities(order_create)
+        )
 
-            order_item = OrderItem(
-                order_id=db_order.id,
-                product_id=product.id,
-                product_name=product.name,
-                product_sku=product.sku,
-                quantity=item.quantity,
-                unit_price=unit_price,
-                discount=item.discount or Decimal("0"),
-                subtotal=item_data["subtotal"],
-            )
+        # Validate existence and stock before anything is written
+        requested_quantities = OrderService._validate_order(
+            order_create,
+            products,
+            {product_id: product.stock_quantity for product_id, product in products.items()},
+        )
 
-            db.add(order_item)
+        db_order = OrderService._build_order(order_create, user_id, products)
+        db.add(db_order)
+        SalesRollupService.record_order_change(db, None, SalesRollupService.snapshot(db_order))
 
-            # Log inventory out
-            InventoryService.log_inventory_change(
+        # Reduce inventory with one guarded decrement for the whole order
+        try:
+            InventoryService.log_inventory_changes(
                 db=db,
-                product_id=product.id,
+                quantity_changes={
+                    product_id: -quantity for product_id, quantity in requested_quantities.items()
+                },
                 user_id=user_id,
                 action=InventoryAction.SALE,
-                quantity_change=-item.quantity,
                 reference_number=db_order.order_number,
                 notes=f"Sold via order {db_order.order_number}",
             )
+        except InsufficientStockError as e:
+            db.rollback()
+            raise bad_request_exception(
+                f"Insufficient stock for {products[e.product_ids[0]].name}"
+            )
 
         db.commit()
         db.refresh(db_order)
         return db_order
 
     @staticmethod
-    def get_order_by_id(db: Session, order_id: int) -> Optional[Order]:
+    def create_orders_batch(
+        db: Session, order_creates: List[OrderCreate], user_id: int
+    ) -> List[Dict]:
+        """Create many orders in one transaction, reporting a result per order.
+
+        Customers and products for the whole batch are resolved with one query
+        each, and products stay locked until commit. Orders are validated in
+        sequence against the stock left by the orders before them; invalid
+        orders are reported and skipped, the rest are inserted together.
+        """
+        begin_immediate(db)
+        customer_ids = {oc.customer_id for oc in order_creates if oc.customer_id}
+        known_customers = set()
+        if customer_ids:
+            known_customers = {
+                row[0] for row in db.query(Customer.id).filter(Customer.id.in_(customer_ids)).all()
+            }
+
+        products = InventoryService.lock_products(
+            db, {item.product_id for oc in order_creates for item in oc.order_items}
+        )
+        available = {product_id: product.stock_quantity for product_id, product in products.items()}
+
+        results = []
+        inventory_logs = []
+        stock_changes = {}
+        now = datetime.utcnow()
+
+        for index, order_create in enumerate(order_creates):
+            try:
+                if order_create.customer_id and order_create.customer_id not in known_customers:
+                    raise not_found_exception("Customer not found")
+                requested_quantities = OrderService._validate_order(
+                    order_create, products, available
+                )
+            except HTTPException as e:
+                results.append({
+                    "index": index,
+                    "success": False,
+                    "status_code": e.status_code,
+                    "detail": e.detail,
+                })
+                continue
+
+            db_order = OrderService._build_order(order_create, user_id, products)
+            db.add(db_order)
+
+            for product_id, quantity in requested_quantities.items():
+                inventory_logs.append(
+                    InventoryLog(
+                        product_id=product_id,
+                        user_id=user_id,
+                        action=InventoryAction.SALE,
+                        quantity_change=-quantity,
+                        quantity_before=available[product_id],
+                        quantity_after=available[product_id] - quantity,
+                        reference_number=db_order.order_number,
+                        notes=f"Sold via order {db_order.order_number}",
+                        created_at=now,
+                    )
+                )
+                available[product_id] -= quantity
+                stock_changes[product_id] = stock_changes.get(product_id, 0) - quantity
+
+            results.append({"index": index, "success": True, "order": db_order})
+
+        SalesRollupService.record_order_changes(
+            db,
+            [(None, SalesRollupService.snapshot(r["order"])) for r in results if r["success"]],
+        )
+
+        if stock_changes:
+            try:
+                InventoryService.apply_stock_changes(db, stock_changes)
+            except InsufficientStockError as e:
+                db.rollback()
+                raise bad_request_exception(
+                    f"Insufficient stock for {products[e.product_ids[0]].name}"
+                )
+            db.add_all(inventory_logs)
+
+        # Read generated IDs before commit expires the instances
+        db.flush()
+        for result in results:
+            order = result.pop("order", None)
+            if order is not None:
+                result.update(order_id=order.id, order_number=order.order_number, total=order.total)
+
+        db.commit()
+        return results
+
+    @staticmethod
+    def _with_profile(query, profile: Optional[str]):
+        """Apply a named eager-loading profile to an order query"""
+        if profile is None:
+            return query
+        return query.options(*ORDER_LOADER_PROFILES[profile])
+
+    @staticmethod
+    def get_order_by_id(db: Session, order_id: int, profile: Optional[str] = "response") -> Optional[Order]:
         """Get order by ID"""
-        return db.query(Order).filter(Order.id == order_id).first()
+        query = db.query(Order).filter(Order.id == order_id)
+        return OrderService._with_profile(query, profile).first()
 
     @staticmethod
-    def get_order_by_number(db: Session, order_number: str) -> Optional[Order]:
+    def get_order_by_number(
+        db: Session, order_number: str, profile: Optional[str] = "response"
+    ) -> Optional[Order]:
         """Get order by order number"""
-        return db.query(Order).filter(Order.order_number == order_number).first()
+        query = db.query(Order).filter(Order.order_number == order_number)
+        return OrderService._with_profile(query, profile).first()
 
     @staticmethod
     def update_order(db: Session, order_id: int, order_update: OrderUpdate) -> Order:
@@ -128,6 +282,7 @@ class OrderService:
         if not order:
             raise not_found_exception("Order not found")
 
+        rollup_before = SalesRollupService.snapshot(order)
         update_data = order_update.dict(exclude_unset=True)
 
         # Only allow updating certain fields
@@ -147,6 +302,8 @@ class OrderService:
         if "tax" in update_data or "discount" in update_data:
             order.total = order.subtotal + order.tax - order.discount
 
+        SalesRollupService.record_order_change(db, rollup_before, SalesRollupService.snapshot(order))
+
         db.commit()
         db.refresh(order)
         return order
@@ -154,6 +311,7 @@ class OrderService:
     @staticmethod
     def cancel_order(db: Session, order_id: int, user_id: int) -> Order:
         """Cancel an order and restore inventory"""
+        begin_immediate(db)
         order = OrderService.get_order_by_id(db, order_id)
         if not order:
             raise not_found_exception("Order not found")
@@ -162,31 +320,38 @@ class OrderService:
             raise bad_request_exception("Order is already cancelled")
 
         # Restore inventory
+        returned_quantities = {}
         for item in order.order_items:
-            InventoryService.log_inventory_change(
-                db=db,
-                product_id=item.product_id,
-                user_id=user_id,
-                action=InventoryAction.RETURN,
-                quantity_change=item.quantity,
-                reference_number=order.order_number,
-                notes=f"Return from cancelled order {order.order_number}",
+            if item.product_id is None:
+                continue  # Product was deleted since the sale
+            returned_quantities[item.product_id] = (
+                returned_quantities.get(item.product_id, 0) + item.quantity
             )
 
+        InventoryService.log_inventory_changes(
+            db=db,
+            quantity_changes=returned_quantities,
+            user_id=user_id,
+            action=InventoryAction.RETURN,
+            reference_number=order.order_number,
+            notes=f"Return from cancelled order {order.order_number}",
+        )
+
+        rollup_before = SalesRollupService.snapshot(order)
         order.status = OrderStatus.CANCELLED
+        SalesRollupService.record_order_change(db, rollup_before, SalesRollupService.snapshot(order))
+
         db.commit()
         db.refresh(order)
         return order
 
     @staticmethod
-    def list_orders(
+    def _filtered_orders_query(
         db: Session,
-        skip: int = 0,
-        limit: int = 100,
         status: Optional[OrderStatus] = None,
         customer_id: Optional[int] = None,
-    ) -> Tuple[list[Order], int]:
-        """List orders with pagination and filters"""
+    ):
+        """Base query for order listings"""
         query = db.query(Order)
 
         if status is not None:
@@ -195,14 +360,85 @@ class OrderService:
         if customer_id is not None:
             query = query.filter(Order.customer_id == customer_id)
 
+        return query
+
+    @staticmethod
+    def list_orders(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[OrderStatus] = None,
+        customer_id: Optional[int] = None,
+        profile: Optional[str] = "response",
+    ) -> Tuple[list[Order], int]:
+        """List orders with pagination and filters"""
+        query = OrderService._filtered_orders_query(db, status, customer_id)
+
         query = query.order_by(Order.created_at.desc())
         total = query.count()
-        orders = query.offset(skip).limit(limit).all()
+        orders = OrderService._with_profile(query, profile).offset(skip).limit(limit).all()
         return orders, total
 
     @staticmethod
-    def get_customer_orders(db: Session, customer_id: int, limit: int = 50) -> list[Order]:
+    def list_orders_keyset(
+        db: Session,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        status: Optional[OrderStatus] = None,
+        customer_id: Optional[int] = None,
+        include_total: bool = False,
+        profile: Optional[str] = "response",
+    ) -> Tuple[list[Order], Optional[str], Optional[int]]:
+        """List orders newest first using cursor pagination"""
+        query = OrderService._filtered_orders_query(db, status, customer_id)
+        total = query.count() if include_total else None
+        orders, next_cursor = keyset_page(
+            OrderService._with_profile(query, profile), Order, limit, cursor
+        )
+        return orders, next_cursor, total
+
+    @staticmethod
+    def iter_orders_between(
+        db: Session,
+        start: datetime,
+        end: datetime,
+        status: Optional[OrderStatus] = None,
+        batch_size: int = 200,
+        profile: Optional[str] = "invoice",
+    ) -> Iterator[List[Order]]:
+        """Yield batches of orders created in [start, end), oldest first"""
+        query = OrderService._filtered_orders_query(db, status).filter(
+            Order.created_at >= start, Order.created_at < end
+        )
+        last_id = 0
+        while True:
+            batch = OrderService._with_profile(
+                query.filter(Order.id > last_id), profile
+            ).order_by(Order.id).limit(batch_size).all()
+            if not batch:
+                return
+            yield batch
+            last_id = batch[-1].id
+
+    @staticmethod
+    def get_customer_orders(
+        db: Session, customer_id: int, limit: int = 50, profile: Optional[str] = "response"
+    ) -> list[Order]:
         """Get all orders for a customer"""
-        return db.query(Order).filter(Order.customer_id == customer_id).order_by(
+        query = db.query(Order).filter(Order.customer_id == customer_id)
+        return OrderService._with_profile(query, profile).order_by(
             Order.created_at.desc()
         ).limit(limit).all()
+
+    @staticmethod
+    def create_order_loaded(db: Session, order_create: OrderCreate, user_id: int) -> Order:
+        """Create an order and return it with its response profile loaded"""
+        order = OrderService.create_order(db, order_create, user_id)
+        return OrderService.get_order_by_id(db, order.id)
+
+    # -------- Async variants --------
+    create_order_async = staticmethod(async_variant(create_order_loaded))
+    get_order_by_id_async = staticmethod(async_variant(get_order_by_id))
+    get_order_by_number_async = staticmethod(async_variant(get_order_by_number))
+    list_orders_async = staticmethod(async_variant(list_orders))
+    list_orders_keyset_async = staticmethod(async_variant(list_orders_keyset))
@@ -7,7 +7,10 @@ from sqlalchemy.orm import Session
 
 from app.models import Payment, PaymentStatus, Order
 from app.schemas import PaymentCreate, PaymentUpdate
+from app.core.database import async_variant
 from app.core.exceptions import not_found_exception, bad_request_exception
+from app.core.sqlite import begin_immediate
+from app.utils.pagination import keyset_page
 
 
 class PaymentService:
@@ -16,6 +19,8 @@ class PaymentService:
     @staticmethod
     def create_payment(db: Session, payment_create: PaymentCreate) -> Payment:
         """Create a new payment"""
+        # Validated against the amount already paid; on SQLite lock before reading it
+        begin_immediate(db)
         order = db.query(Order).filter(Order.id == payment_create.order_id).first()
         if not order:
             raise not_found_exception("Order not found")
@@ -73,6 +78,7 @@ class PaymentService:
         db: Session, payment_id: int, payment_update: PaymentUpdate
     ) -> Payment:
         """Update payment"""
+        begin_immediate(db)
         payment = PaymentService.get_payment_by_id(db, payment_id)
         if not payment:
             raise not_found_exception("Payment not found")
@@ -90,6 +96,7 @@ class PaymentService:
         db: Session, payment_id: int, reason: Optional[str] = None
     ) -> Payment:
         """Refund a payment"""
+        begin_immediate(db)
         payment = PaymentService.get_payment_by_id(db, payment_id)
         if not payment:
             raise not_found_exception("Payment not found")
@@ -106,14 +113,12 @@ class PaymentService:
         return payment
 
     @staticmethod
-    def list_payments(
+    def _filtered_payments_query(
         db: Session,
-        skip: int = 0,
-        limit: int = 100,
         order_id: Optional[int] = None,
         status: Optional[PaymentStatus] = None,
-    ) -> Tuple[list[Payment], int]:
-        """List payments"""
+    ):
+        """Base query for payment listings"""
         query = db.query(Payment)
 
         if order_id is not None:
@@ -122,11 +127,39 @@ class PaymentService:
         if status is not None:
             query = query.filter(Payment.status == status)
 
+        return query
+
+    @staticmethod
+    def list_payments(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        order_id: Optional[int] = None,
+        status: Optional[PaymentStatus] = None,
+    ) -> Tuple[list[Payment], int]:
+        """List payments"""
+        query = PaymentService._filtered_payments_query(db, order_id, status)
+
         query = query.order_by(Payment.created_at.desc())
         total = query.count()
         payments = query.offset(skip).limit(limit).all()
         return payments, total
 
+    @staticmethod
+    def list_payments_keyset(
+        db: Session,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        order_id: Optional[int] = None,
+        status: Optional[PaymentStatus] = None,
+        include_total: bool = False,
+    ) -> Tuple[list[Payment], Optional[str], Optional[int]]:
+        """List payments newest first using cursor pagination"""
+        query = PaymentService._filtered_payments_query(db, order_id, status)
+        total = query.count() if include_total else None
+        payments, next_cursor = keyset_page(query, Payment, limit, cursor)
+        return payments, next_cursor, total
+
     @staticmethod
     def get_order_payment_status(db: Session, order_id: int) -> dict:
         """Get payment status for an order"""
@@ -154,3 +187,9 @@ class PaymentService:
             "remaining_amount": max(remaining, Decimal(0)),
             "is_fully_paid": is_paid,
         }
+
+    # -------- Async variants --------
+    create_payment_async = staticmethod(async_variant(create_payment))
+    get_payment_by_id_async = staticmethod(async_variant(get_payment_by_id))
+    list_payments_async = staticmethod(async_variant(list_payments))
+    list_payments_keyset_async = staticmethod(async_variant(list_payments_keyset))
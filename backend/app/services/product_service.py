@@ -1,10 +1,24 @@
 """Product and Category service"""
+import re
+from sqlalchemy import case, column, func, literal_column, select, table, text, update
 from sqlalchemy.orm import Session
 from app.models import Product, Category, InventoryLog, InventoryAction
-from app.schemas import ProductCreate, ProductUpdate, CategoryCreate, CategoryUpdate
-from app.core.exceptions import not_found_exception, conflict_exception
-from typing import Optional, Tuple
-from decimal import Decimal
+from app.models.product import PG_SEARCH_VECTOR, PRODUCT_SEARCH_TABLE
+from app.schemas import ProductCreate, ProductUpdate, ProductBulkUpdate, CategoryCreate, CategoryUpdate
+from app.core.catalog import get_catalog_version
+from app.core.database import async_variant
+from app.core.exceptions import not_found_exception, conflict_exception, bad_request_exception
+from app.services.inventory_service import InventoryService
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+
+# Matches ranked per search; broad type-ahead prefixes can match most of the
+# catalog, and scoring every hit would dominate the query
+SEARCH_CANDIDATE_LIMIT = 500
+
+# Whether each database has a search index, probed once per database URL
+_search_index_available: Dict[str, bool] = {}
 
 
 class ProductService:
@@ -18,7 +32,7 @@ class ProductService:
         if existing:
             raise conflict_exception("Product with this SKU already exists")
 
-        # Create product
+        # Create product; initial stock goes through the inventory ledger below
         db_product = Product(
             sku=product_create.sku,
             name=product_create.name,
@@ -26,15 +40,14 @@ class ProductService:
             barcode=product_create.barcode,
             price=product_create.price,
             cost_price=product_create.cost_price,
-            stock_quantity=product_create.stock_quantity,
+            stock_quantity=0,
             min_stock_level=product_create.min_stock_level,
             category_id=product_create.category_id,
             image_url=product_create.image_url,
         )
 
         db.add(db_product)
-        db.commit()
-        db.refresh(db_product)
+        db.flush()
 
         # Log initial stock
         if product_create.stock_quantity > 0:
@@ -47,6 +60,8 @@ class ProductService:
                 reference_number="INITIAL_STOCK",
             )
 
+        db.commit()
+        db.refresh(db_product)
         return db_product
 
     @staticmethod
@@ -85,6 +100,57 @@ class ProductService:
         db.refresh(product)
         return product
 
+    @staticmethod
+    def bulk_update_products(db: Session, bulk_update: ProductBulkUpdate) -> Dict:
+        """Apply one set of changes to every matching product in a single UPDATE"""
+        criteria, changes = bulk_update.filter, bulk_update.changes
+
+        conditions = []
+        if criteria.category_id is not None:
+            conditions.append(Product.category_id == criteria.category_id)
+        if criteria.skus:
+            conditions.append(Product.sku.in_(criteria.skus))
+        if criteria.product_ids:
+            conditions.append(Product.id.in_(criteria.product_ids))
+        if criteria.is_active is not None:
+            conditions.append(Product.is_active == criteria.is_active)
+        if not conditions and not criteria.all_products:
+            raise bad_request_exception("Specify a filter, or set all_products to update every product")
+
+        if changes.price is not None and changes.price_percent is not None:
+            raise bad_request_exception("Set either price or price_percent, not both")
+        if changes.category_id is not None and not CategoryService.get_category_by_id(db, changes.category_id):
+            raise not_found_exception("Category not found")
+
+        values = changes.model_dump(
+            include={"cost_price", "min_stock_level", "category_id", "is_active"}, exclude_none=True
+        )
+        step = changes.round_to
+        if changes.price is not None:
+            price = changes.price
+            if step:
+                price = max(step, (price / step).quantize(Decimal("1"), rounding=ROUND_HALF_UP) * step)
+            values["price"] = price.quantize(Decimal("0.01"))
+        elif changes.price_percent is not None or step:
+            price = Product.price
+            if changes.price_percent is not None:
+                price = price * (1 + changes.price_percent / 100)
+            if step:
+                rounded = func.round(price / step) * step
+                price = case((rounded < step, step), else_=rounded)
+            values["price"] = func.round(price, 2)
+        if not values:
+            raise bad_request_exception("Specify at least one change")
+
+        result = db.execute(
+            update(Product)
+            .where(*conditions)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return {"updated": result.rowcount, "catalog_version": get_catalog_version(db)}
+
     @staticmethod
     def delete_product(db: Session, product_id: int) -> bool:
         """Delete product"""
@@ -117,6 +183,16 @@ class ProductService:
         products = query.offset(skip).limit(limit).all()
         return products, total
 
+    @staticmethod
+    def get_list_version(db: Session) -> Tuple[int, Optional[datetime]]:
+        """Cheap validator for product listings.
+
+        The catalog version covers inserts, deletes and attribute changes;
+        the latest ``updated_at`` (indexed) covers stock movements.
+        """
+        latest = db.query(func.max(Product.updated_at)).scalar()
+        return get_catalog_version(db), latest
+
     @staticmethod
     def get_low_stock_products(db: Session) -> list[Product]:
         """Get products with stock below minimum level"""
@@ -125,13 +201,73 @@ class ProductService:
         ).all()
 
     @staticmethod
-    def search_products(db: Session, search_term: str) -> list[Product]:
-        """Search products by name, SKU, or barcode"""
-        return db.query(Product).filter(
-            (Product.name.ilike(f"%{search_term}%"))
-            | (Product.sku.ilike(f"%{search_term}%"))
-            | (Product.barcode.ilike(f"%{search_term}%"))
-        ).filter(Product.is_active == True).all()
+    def _search_terms(search_term: str) -> List[str]:
+        """Split a search box entry into lowercase word tokens"""
+        return re.findall(r"\w+", search_term.lower())
+
+    @staticmethod
+    def _has_search_index(db: Session) -> bool:
+        """Whether the bound database carries the product search index"""
+        bind = db.get_bind()
+        key = str(bind.url)
+        if key not in _search_index_available:
+            dialect = bind.dialect.name
+            if dialect == "sqlite":
+                found = db.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": PRODUCT_SEARCH_TABLE},
+                ).first()
+                _search_index_available[key] = found is not None
+            else:
+                _search_index_available[key] = dialect == "postgresql"
+        return _search_index_available[key]
+
+    @staticmethod
+    def search_products(db: Session, search_term: str, limit: int = 20) -> list[Product]:
+        """Search active products by name, SKU, or barcode, best matches first.
+
+        Every term is matched as a prefix, so partial input works for
+        type-ahead; all terms must match. Only the SEARCH_CANDIDATE_LIMIT
+        best-ranked matches are loaded.
+        """
+        terms = ProductService._search_terms(search_term)
+        if not terms:
+            return []
+
+        query = db.query(Product).filter(Product.is_active == True)
+        dialect = db.get_bind().dialect.name
+
+        if dialect == "sqlite" and ProductService._has_search_index(db):
+            fts = table(PRODUCT_SEARCH_TABLE, column("rowid"), column("rank"))
+            match = " ".join(f'"{term}"*' for term in terms)
+            # FTS5 computes the top candidates by rank without sorting every match
+            hits = select(fts.c.rowid.label("id"), fts.c.rank.label("rank")).where(
+                literal_column(PRODUCT_SEARCH_TABLE).op("MATCH")(match)
+            ).order_by(fts.c.rank).limit(SEARCH_CANDIDATE_LIMIT).subquery()
+            query = query.join(hits, hits.c.id == Product.id).order_by(hits.c.rank, Product.name)
+        elif dialect == "postgresql":
+            vector = literal_column(PG_SEARCH_VECTOR)
+            ts_query = func.to_tsquery(
+                literal_column("'simple'"), " & ".join(f"{term}:*" for term in terms)
+            )
+            rank = func.ts_rank(vector, ts_query).label("rank")
+            hits = select(Product.id, rank).where(
+                vector.op("@@")(ts_query)
+            ).order_by(rank.desc()).limit(SEARCH_CANDIDATE_LIMIT).subquery()
+            query = query.join(hits, hits.c.id == Product.id).order_by(hits.c.rank.desc(), Product.name)
+        else:
+            for term in terms:
+                query = query.filter(
+                    (Product.name.ilike(f"%{term}%"))
+                    | (Product.sku.ilike(f"%{term}%"))
+                    | (Product.barcode.ilike(f"%{term}%"))
+                )
+            query = query.order_by(Product.name)
+
+        return query.limit(limit).all()
+
+    # -------- Async variants --------
+    search_products_async = staticmethod(async_variant(search_products))
 
 
 class CategoryService:
@@ -186,6 +322,11 @@ class CategoryService:
         db.commit()
         return True
 
+    @staticmethod
+    def get_list_version(db: Session) -> int:
+        """Cheap validator for category reads: every category write bumps the catalog version"""
+        return get_catalog_version(db)
+
     @staticmethod
     def list_categories(
         db: Session, skip: int = 0, limit: int = 100
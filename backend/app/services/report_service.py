@@ -1,16 +1,19 @@
 """Report service for business analytics"""
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models import Order, OrderStatus, Payment, PaymentStatus, InventoryLog, Product
-from datetime import datetime, timedelta
+from sqlalchemy import extract, func
+from app.models import Order, OrderStatus, Payment, PaymentStatus, InventoryLog, Product, SalesDaily
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import Optional, Dict, List
+from app.core.cache import cached_report
+from app.core.database import async_variant
 
 
 class ReportService:
     """Service for generating business reports"""
 
     @staticmethod
+    @cached_report("sales")
     def get_sales_report(
         db: Session,
         start_date: Optional[datetime] = None,
@@ -23,43 +26,109 @@ class ReportService:
         if not end_date:
             end_date = datetime.utcnow()
 
-        query = db.query(Order).filter(
-            (Order.created_at >= start_date) & (Order.created_at <= end_date)
-        )
-
-        # Group by date
+        # Bucket columns per grouping; extract() compiles per dialect
+        # (EXTRACT on Postgres, strftime on SQLite)
+        buckets = [extract("year", Order.created_at).label("year")]
+        if group_by in ("day", "month"):
+            buckets.append(extract("month", Order.created_at).label("month"))
         if group_by == "day":
-            query = query.filter(Order.status.in_([OrderStatus.COMPLETED, OrderStatus.REFUNDED]))
+            buckets.append(extract("day", Order.created_at).label("day"))
 
-        orders = query.all()
+        rows = db.query(
+            *buckets,
+            func.count(Order.id).label("total_orders"),
+            func.sum(Order.total).label("total_sales"),
+            func.sum(Order.tax).label("total_tax"),
+            func.sum(Order.discount).label("total_discount"),
+        ).filter(
+            (Order.created_at >= start_date)
+            & (Order.created_at <= end_date)
+            & Order.status.in_([OrderStatus.COMPLETED, OrderStatus.REFUNDED])
+        ).group_by(
+            *buckets
+        ).order_by(
+            *buckets
+        ).all()
 
-        # Aggregate data
-        sales_data = {}
-        for order in orders:
+        sales_data = []
+        for row in rows:
             if group_by == "day":
-                key = order.created_at.date()
+                key = date(int(row.year), int(row.month), int(row.day))
             elif group_by == "month":
-                key = (order.created_at.year, order.created_at.month)
+                key = (int(row.year), int(row.month))
             else:
-                key = order.created_at.year
+                key = int(row.year)
+
+            sales_data.append({
+                "date": key,
+                "total_orders": row.total_orders,
+                "total_sales": Decimal(row.total_sales or 0),
+                "total_tax": Decimal(row.total_tax or 0),
+                "total_discount": Decimal(row.total_discount or 0),
+            })
+
+        return sales_data
+
+    @staticmethod
+    @cached_report("sales_rollup")
+    def get_sales_report_from_rollup(
+        db: Session,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        group_by: str = "day",  # day, month, year
+    ) -> List[Dict]:
+        """Get sales report for whole days from the sales_daily rollup"""
+        if not start_date:
+            start_date = (datetime.utcnow() - timedelta(days=30)).date()
+        if not end_date:
+            end_date = datetime.utcnow().date()
+
+        buckets = [extract("year", SalesDaily.sales_date).label("year")]
+        if group_by in ("day", "month"):
+            buckets.append(extract("month", SalesDaily.sales_date).label("month"))
+        if group_by == "day":
+            buckets.append(extract("day", SalesDaily.sales_date).label("day"))
+
+        rows = db.query(
+            *buckets,
+            func.sum(SalesDaily.order_count).label("total_orders"),
+            func.sum(SalesDaily.total_sales).label("total_sales"),
+            func.sum(SalesDaily.total_tax).label("total_tax"),
+            func.sum(SalesDaily.total_discount).label("total_discount"),
+        ).filter(
+            (SalesDaily.sales_date >= start_date)
+            & (SalesDaily.sales_date <= end_date)
+            & (SalesDaily.order_count != 0)
+        ).group_by(
+            *buckets
+        ).order_by(
+            *buckets
+        ).all()
 
-            if key not in sales_data:
-                sales_data[key] = {
-                    "date": key,
-                    "total_orders": 0,
-                    "total_sales": Decimal(0),
-                    "total_tax": Decimal(0),
-                    "total_discount": Decimal(0),
-                }
+        sales_data = []
+        for row in rows:
+            if not row.total_orders:
+                continue  # Bucket only held orders that were later cancelled
 
-            sales_data[key]["total_orders"] += 1
-            sales_data[key]["total_sales"] += order.total
-            sales_data[key]["total_tax"] += order.tax
-            sales_data[key]["total_discount"] += order.discount
+            if group_by == "day":
+                key = date(int(row.year), int(row.month), int(row.day))
+            elif group_by == "month":
+                key = (int(row.year), int(row.month))
+            else:
+                key = int(row.year)
 
-        return list(sales_data.values())
+            sales_data.append({
+                "date": key,
+                "total_orders": int(row.total_orders),
+                "total_sales": Decimal(row.total_sales or 0),
+                "total_tax": Decimal(row.total_tax or 0),
+                "total_discount": Decimal(row.total_discount or 0),
+            })
+
+        return sales_data
 
     @staticmethod
+    @cached_report("product_sales")
     def get_product_sales_report(db: Session, days: int = 30, limit: int = 50) -> List[Dict]:
         """Get top selling products"""
         start_date = datetime.utcnow() - timedelta(days=days)
@@ -92,6 +161,7 @@ class ReportService:
         ]
 
     @staticmethod
+    @cached_report("payment_methods")
     def get_payment_method_report(db: Session, days: int = 30) -> Dict:
         """Get payment methods breakdown"""
         start_date = datetime.utcnow() - timedelta(days=days)
@@ -116,6 +186,7 @@ class ReportService:
         ]
 
     @staticmethod
+    @cached_report("inventory")
     def get_inventory_report(db: Session) -> Dict:
         """Get current inventory status"""
         total_products = db.query(Product).filter(Product.is_active == True).count()
@@ -140,6 +211,7 @@ class ReportService:
         }
 
     @staticmethod
+    @cached_report("daily_summary")
     def get_daily_summary(db: Session, date: Optional[datetime] = None) -> Dict:
         """Get daily sales summary"""
         if not date:
@@ -174,6 +246,43 @@ class ReportService:
         }
 
     @staticmethod
+    @cached_report("daily_summary_rollup")
+    def get_daily_summary_from_rollup(db: Session, date: Optional[date] = None) -> Dict:
+        """Get daily sales summary, reading order totals from the sales_daily rollup"""
+        if not date:
+            date = datetime.utcnow().date()
+
+        start_of_day = datetime.combine(date, datetime.min.time())
+        end_of_day = datetime.combine(date, datetime.max.time())
+
+        totals = db.query(
+            func.coalesce(func.sum(SalesDaily.orders_placed), 0),
+            func.coalesce(func.sum(SalesDaily.completed_orders), 0),
+            func.coalesce(func.sum(SalesDaily.sales_placed), 0),
+        ).filter(SalesDaily.sales_date == date).one()
+
+        total_received = db.query(
+            func.coalesce(func.sum(Payment.amount), 0)
+        ).filter(
+            (Payment.status == PaymentStatus.COMPLETED) &
+            (Payment.created_at >= start_of_day) &
+            (Payment.created_at <= end_of_day)
+        ).scalar()
+
+        total_sales = Decimal(totals[2] or 0)
+        total_received = Decimal(total_received or 0)
+
+        return {
+            "date": date,
+            "total_orders": int(totals[0]),
+            "completed_orders": int(totals[1]),
+            "total_sales": total_sales,
+            "total_received": total_received,
+            "pending_amount": total_sales - total_received,
+        }
+
+    @staticmethod
+    @cached_report("customers")
     def get_customer_report(db: Session, limit: int = 20) -> List[Dict]:
         """Get top customers by spending"""
         from app.models import Customer
@@ -210,3 +319,14 @@ class ReportService:
             }
             for c in customers
         ]
+
+    # -------- Async variants --------
+    # Cache hits never touch the database
+    get_sales_report_async = staticmethod(async_variant(get_sales_report))
+    get_sales_report_from_rollup_async = staticmethod(async_variant(get_sales_report_from_rollup))
+    get_product_sales_report_async = staticmethod(async_variant(get_product_sales_report))
+    get_payment_method_report_async = staticmethod(async_variant(get_payment_method_report))
+    get_inventory_report_async = staticmethod(async_variant(get_inventory_report))
+    get_daily_summary_async = staticmethod(async_variant(get_daily_summary))
+    get_daily_summary_from_rollup_async = staticmethod(async_variant(get_daily_summary_from_rollup))
+    get_customer_report_async = staticmethod(async_variant(get_customer_report))
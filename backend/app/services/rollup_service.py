@@ -0,0 +1,181 @@
+"""Sales rollup service"""
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from app.models import Order, OrderStatus, SalesDaily
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+
+# Statuses the sales report counts as sales
+COUNTED_STATUSES = (OrderStatus.COMPLETED, OrderStatus.REFUNDED)
+
+ROLLUP_FIELDS = (
+    "orders_placed",
+    "sales_placed",
+    "completed_orders",
+    "order_count",
+    "total_sales",
+    "total_tax",
+    "total_discount",
+    "refunded_orders",
+    "refunded_amount",
+)
+
+
+class SalesRollupService:
+    """Service maintaining the sales_daily rollup table"""
+
+    @staticmethod
+    def snapshot(order: Order) -> Dict:
+        """Capture the order fields the rollup depends on"""
+        return {
+            "sales_date": (order.created_at or datetime.utcnow()).date(),
+            "user_id": order.user_id,
+            "status": order.status or OrderStatus.PENDING,
+            "total": order.total or Decimal("0"),
+            "tax": order.tax or Decimal("0"),
+            "discount": order.discount or Decimal("0"),
+        }
+
+    @staticmethod
+    def _contribution(snapshot: Optional[Dict]) -> Dict:
+        """What a single order in the given state adds to its rollup row"""
+        contribution = dict.fromkeys(ROLLUP_FIELDS, 0)
+        if snapshot is None:
+            return contribution
+
+        status = snapshot["status"]
+        contribution["orders_placed"] = 1
+        contribution["sales_placed"] = snapshot["total"]
+        if status == OrderStatus.COMPLETED:
+            contribution["completed_orders"] = 1
+        if status in COUNTED_STATUSES:
+            contribution["order_count"] = 1
+            contribution["total_sales"] = snapshot["total"]
+            contribution["total_tax"] = snapshot["tax"]
+            contribution["total_discount"] = snapshot["discount"]
+        if status == OrderStatus.REFUNDED:
+            contribution["refunded_orders"] = 1
+            contribution["refunded_amount"] = snapshot["total"]
+        return contribution
+
+    @staticmethod
+    def record_order_changes(
+        db: Session, changes: Iterable[Tuple[Optional[Dict], Optional[Dict]]]
+    ) -> None:
+        """Apply (before, after) order snapshots to the rollup, without committing.
+
+        ``before`` is None for a new order. Deltas are summed per
+        (date, user) first so a batch costs one upsert per touched row.
+        """
+        deltas: Dict[Tuple[date, int], Dict] = {}
+        for before, after in changes:
+            for snapshot, sign in ((before, -1), (after, 1)):
+                if snapshot is None:
+                    continue
+                key = (snapshot["sales_date"], snapshot["user_id"])
+                delta = deltas.setdefault(key, dict.fromkeys(ROLLUP_FIELDS, 0))
+                for field, value in SalesRollupService._contribution(snapshot).items():
+                    delta[field] += sign * value
+
+        for (sales_date, user_id), delta in deltas.items():
+            if any(delta.values()):
+                SalesRollupService._upsert(db, sales_date, user_id, delta)
+
+    @staticmethod
+    def record_order_change(db: Session, before: Optional[Dict], after: Optional[Dict]) -> None:
+        """Apply a single order change to the rollup, without committing"""
+        SalesRollupService.record_order_changes(db, [(before, after)])
+
+    @staticmethod
+    def _upsert(db: Session, sales_date: date, user_id: int, delta: Dict) -> None:
+        """Add ``delta`` to the (sales_date, user_id) row, creating it if needed"""
+        dialect = db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+
+            table = SalesDaily.__table__
+            stmt = insert(table).values(
+                sales_date=sales_date,
+                user_id=user_id,
+                updated_at=datetime.utcnow(),
+                **delta,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["sales_date", "user_id"],
+                set_={
+                    **{field: table.c[field] + stmt.excluded[field] for field in ROLLUP_FIELDS},
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+            db.execute(stmt)
+            return
+
+        row = db.query(SalesDaily).filter(
+            (SalesDaily.sales_date == sales_date) & (SalesDaily.user_id == user_id)
+        ).with_for_update().first()
+        if row is None:
+            row = SalesDaily(sales_date=sales_date, user_id=user_id, **dict.fromkeys(ROLLUP_FIELDS, 0))
+            db.add(row)
+        for field, value in delta.items():
+            setattr(row, field, getattr(row, field) + value)
+
+    @staticmethod
+    def rebuild(
+        db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None
+    ) -> int:
+        """Recompute rollup rows from the orders table; returns rows written"""
+        sales_day = func.date(Order.created_at)
+        counted = Order.status.in_(COUNTED_STATUSES)
+        completed = Order.status == OrderStatus.COMPLETED
+        refunded = Order.status == OrderStatus.REFUNDED
+
+        query = db.query(
+            sales_day.label("sales_date"),
+            Order.user_id,
+            func.count(Order.id),
+            func.sum(Order.total),
+            func.sum(case((completed, 1), else_=0)),
+            func.sum(case((counted, 1), else_=0)),
+            func.sum(case((counted, Order.total), else_=0)),
+            func.sum(case((counted, Order.tax), else_=0)),
+            func.sum(case((counted, Order.discount), else_=0)),
+            func.sum(case((refunded, 1), else_=0)),
+            func.sum(case((refunded, Order.total), else_=0)),
+        )
+        rollup = db.query(SalesDaily)
+
+        if start_date:
+            query = query.filter(Order.created_at >= datetime.combine(start_date, datetime.min.time()))
+            rollup = rollup.filter(SalesDaily.sales_date >= start_date)
+        if end_date:
+            query = query.filter(Order.created_at <= datetime.combine(end_date, datetime.max.time()))
+            rollup = rollup.filter(SalesDaily.sales_date <= end_date)
+
+        rows = query.group_by(sales_day, Order.user_id).all()
+
+        rollup.delete(synchronize_session=False)
+        now = datetime.utcnow()
+        for row in rows:
+            sales_date = row[0]
+            if isinstance(sales_date, str):  # SQLite date() returns text
+                sales_date = date.fromisoformat(sales_date)
+            values = dict(zip(ROLLUP_FIELDS, (value or 0 for value in row[2:])))
+            db.add(SalesDaily(sales_date=sales_date, user_id=row[1], updated_at=now, **values))
+
+        db.commit()
+        return len(rows)
+
+    @staticmethod
+    def backfill(db: Session) -> int:
+        """Build the rollup from history when it is empty but orders exist; returns rows written.
+
+        The rollup is only maintained as orders change, so a database that
+        already had orders when sales_daily was introduced starts out empty.
+        """
+        if db.query(SalesDaily.sales_date).first() is not None or db.query(Order.id).first() is None:
+            return 0
+        return SalesRollupService.rebuild(db)
@@ -1,7 +1,12 @@
 """Barcode generator utility"""
+import hashlib
+import json
+import os
+import tempfile
 import barcode
 from barcode.writer import ImageWriter
 from io import BytesIO
+from typing import Optional
 from PIL import Image
 
 
@@ -34,3 +39,43 @@ def save_barcode(code: str, filepath: str, barcode_format: str = "code128") -> b
 def validate_barcode(code: str) -> bool:
     """Validate barcode format"""
     return len(code) > 0 and len(code) <= 100
+
+
+# -------- Content-addressed render cache --------
+# Writer settings are part of the cache key, so changing them re-renders
+CACHE_WRITER_OPTIONS = {"module_height": 10.0, "font_size": 8, "text_distance": 3.0, "quiet_zone": 2.0, "dpi": 300}
+
+
+def barcode_cache_path(code: str, barcode_format: str, cache_dir: str) -> str:
+    """Path of the cached PNG for ``code`` rendered as ``barcode_format``"""
+    key = json.dumps(
+        [barcode.version, barcode_format, code, CACHE_WRITER_OPTIONS], sort_keys=True
+    ).encode("utf-8")
+    digest = hashlib.sha256(key).hexdigest()
+    return os.path.join(cache_dir, digest[:2], f"{digest}.png")
+
+
+def render_barcode_to_cache(code: str, barcode_format: str, cache_dir: str) -> Optional[str]:
+    """Render a barcode PNG into the cache unless present; returns its path or None.
+
+    Runs in label worker processes, so it only takes picklable arguments.
+    """
+    path = barcode_cache_path(code, barcode_format, cache_dir)
+    if os.path.exists(path):
+        return path
+
+    try:
+        barcode_class = barcode.get_barcode_class(barcode_format)
+        buffer = BytesIO()
+        barcode_class(code, writer=ImageWriter()).write(buffer, options=CACHE_WRITER_OPTIONS)
+    except Exception as e:
+        print(f"Error generating barcode {code!r}: {str(e)}")
+        return None
+
+    # Write then rename, so concurrent renderers never expose a partial file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as tmp:
+        tmp.write(buffer.getvalue())
+    os.replace(tmp_path, path)
+    return path
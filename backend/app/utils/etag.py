@@ -0,0 +1,31 @@
+"""ETag and conditional GET helpers"""
+import hashlib
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag for a response fully determined by ``parts``"""
+    return f'"{hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()}"'
+
+
+def content_etag(content: bytes) -> str:
+    """Strong ETag for an already serialized body"""
+    return f'"{hashlib.sha1(content).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match covers ``etag``"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    candidates = (tag.strip() for tag in header.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    """An empty 304 carrying the current ETag"""
+    return Response(status_code=304, headers={"ETag": etag})
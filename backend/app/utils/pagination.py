@@ -0,0 +1,52 @@
+"""Keyset (cursor) pagination helpers"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+from app.core.exceptions import bad_request_exception
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode a (created_at, id) position as an opaque cursor"""
+    raw = json.dumps([created_at.isoformat(), row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise bad_request_exception("Invalid cursor")
+
+
+def keyset_page(query: Query, model, limit: int, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+    """Fetch one page of ``query`` ordered newest first by (created_at, id).
+
+    Rows after the cursor are located by an index seek on (created_at, id)
+    instead of an OFFSET scan, so every page costs the same however deep it
+    is. Returns the rows and the cursor for the next page (None on the last).
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(
+            or_(
+                model.created_at < created_at,
+                and_(model.created_at == created_at, model.id < row_id),
+            )
+        )
+
+    # One extra row tells us whether another page exists
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    page = rows[:limit]
+    if len(rows) <= limit or not page:
+        return page, None
+
+    last = page[-1]
+    return page, encode_cursor(last.created_at, last.id)
@@ -10,6 +10,53 @@ from io import BytesIO
 from typing import List, Dict, Optional
 
 
+# -------- Invoice styles --------
+# Built once at import; reportlab only reads styles while laying out, so
+# every invoice in a process (and every thread) can share them
+_STYLES = getSampleStyleSheet()
+
+INVOICE_TITLE_STYLE = ParagraphStyle(
+    "CustomTitle",
+    parent=_STYLES["Heading1"],
+    fontSize=24,
+    textColor=colors.HexColor("#1f2937"),
+    spaceAfter=30,
+)
+
+INVOICE_DETAILS_STYLE = TableStyle(
+    [("FONTNAME", (0, 0), (-1, -1), "Helvetica"), ("FONTSIZE", (0, 0), (-1, -1), 10)]
+)
+
+INVOICE_ITEMS_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#e5e7eb")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 11),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+        ("GRID", (0, 0), (-1, -1), 1, colors.black),
+        ("FONTSIZE", (0, 1), (-1, -1), 10),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#f9fafb")]),
+    ]
+)
+
+INVOICE_TOTALS_STYLE = TableStyle(
+    [
+        ("ALIGN", (0, 0), (-1, -1), "RIGHT"),
+        ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
+        ("FONTSIZE", (0, -1), (-1, -1), 12),
+        ("TOPPADDING", (0, 0), (-1, -1), 6),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+        ("LINEABOVE", (0, -1), (-1, -1), 2, colors.black),
+    ]
+)
+
+INVOICE_DETAILS_WIDTHS = [3 * inch, 3 * inch]
+INVOICE_ITEMS_WIDTHS = [2 * inch, 0.8 * inch, 1 * inch, 1 * inch, 1 * inch]
+INVOICE_TOTALS_WIDTHS = [4 * inch, 2 * inch]
+
+
 def generate_order_invoice(
     order_number: str,
     customer_name: str,
@@ -27,27 +74,17 @@ def generate_order_invoice(
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter)
     elements = []
-    styles = getSampleStyleSheet()
 
     # Title
-    title_style = ParagraphStyle(
-        "CustomTitle",
-        parent=styles["Heading1"],
-        fontSize=24,
-        textColor=colors.HexColor("#1f2937"),
-        spaceAfter=30,
-    )
-    elements.append(Paragraph("INVOICE", title_style))
+    elements.append(Paragraph("INVOICE", INVOICE_TITLE_STYLE))
 
     # Order details
     order_details = [
         [f"Order #: {order_number}", f"Date: {date.strftime('%Y-%m-%d %H:%M')}"],
         [f"Customer: {customer_name}", ""],
     ]
-    table = Table(order_details, colWidths=[3 * inch, 3 * inch])
-    table.setStyle(
-        TableStyle([("FONTNAME", (0, 0), (-1, -1), "Helvetica"), ("FONTSIZE", (0, 0), (-1, -1), 10)])
-    )
+    table = Table(order_details, colWidths=INVOICE_DETAILS_WIDTHS)
+    table.setStyle(INVOICE_DETAILS_STYLE)
     elements.append(table)
     elements.append(Spacer(1, 0.3 * inch))
 
@@ -64,22 +101,8 @@ def generate_order_invoice(
             ]
         )
 
-    items_table = Table(item_data, colWidths=[2 * inch, 0.8 * inch, 1 * inch, 1 * inch, 1 * inch])
-    items_table.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#e5e7eb")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, 0), 11),
-                ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ("FONTSIZE", (0, 1), (-1, -1), 10),
-                ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#f9fafb")]),
-            ]
-        )
-    )
+    items_table = Table(item_data, colWidths=INVOICE_ITEMS_WIDTHS)
+    items_table.setStyle(INVOICE_ITEMS_STYLE)
     elements.append(items_table)
     elements.append(Spacer(1, 0.3 * inch))
 
@@ -90,21 +113,18 @@ def generate_order_invoice(
         ["Discount:", f"-${discount:.2f}"],
         ["TOTAL:", f"${total:.2f}"],
     ]
-    totals_table = Table(totals_data, colWidths=[4 * inch, 2 * inch])
-    totals_table.setStyle(
-        TableStyle(
-            [
-                ("ALIGN", (0, 0), (-1, -1), "RIGHT"),
-                ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
-                ("FONTSIZE", (0, -1), (-1, -1), 12),
-                ("TOPPADDING", (0, 0), (-1, -1), 6),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-                ("LINEABOVE", (0, -1), (-1, -1), 2, colors.black),
-            ]
-        )
-    )
+    totals_table = Table(totals_data, colWidths=INVOICE_TOTALS_WIDTHS)
+    totals_table.setStyle(INVOICE_TOTALS_STYLE)
     elements.append(totals_table)
 
     doc.build(elements)
     buffer.seek(0)
     return buffer
+
+
+def render_invoice(invoice: Dict) -> bytes:
+    """Render an invoice from ``generate_order_invoice`` keyword arguments.
+
+    Runs in render worker processes, so it takes and returns plain data.
+    """
+    return generate_order_invoice(**invoice).getvalue()
@@ -0,0 +1,8 @@
+"""Benchmarks: synthetic data, repeatable performance suites and a load harness.
+
+Run from the backend directory::
+
+    python -m benchmarks run --output results.json
+    python -m benchmarks compare baseline.json results.json
+    python -m benchmarks load --terminals 1,2,4,8
+"""
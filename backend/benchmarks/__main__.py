@@ -0,0 +1,195 @@
+"""Run the benchmark suite, compare two result files, or load-test the API"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+# The app's settings are read on import, so the suite and app modules are
+# imported by each command once it has adjusted the environment
+
+
+def _write(document, output) -> None:
+    if output:
+        with open(output, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"✓ Results written to {output}")
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+
+
+def run(args) -> int:
+    from benchmarks.suite import BENCHMARKS, RESULTS_SCHEMA, environment, run_suite
+
+    dataset = {
+        "products": args.products,
+        "customers": args.customers,
+        "months": args.months,
+        "orders_per_day": args.orders_per_day,
+        "seed": args.seed,
+    }
+    only = args.only.split(",") if args.only else None
+    unknown = set(only or ()) - set(BENCHMARKS)
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+        return 2
+
+    urls = []
+    scratch = None
+    if "sqlite" in args.backends:
+        if args.sqlite_url:
+            urls.append(args.sqlite_url)
+        else:
+            scratch = tempfile.TemporaryDirectory()
+            urls.append(f"sqlite:///{os.path.join(scratch.name, 'bench.db')}")
+    if "postgresql" in args.backends:
+        if not args.postgres_url:
+            print("--postgres-url is required for the postgresql backend (its tables are dropped)")
+            return 2
+        urls.append(args.postgres_url)
+
+    now = datetime.utcnow().replace(microsecond=0)
+    runs = []
+    try:
+        for url in urls:
+            print(f"Benchmarking {url.split('://')[0]}")
+            runs.append(run_suite(url, dataset, args.iterations, args.warmup, only, now))
+    finally:
+        if scratch is not None:
+            scratch.cleanup()
+
+    document = {
+        "schema": RESULTS_SCHEMA,
+        "created_at": now.isoformat(),
+        "environment": environment(),
+        "parameters": {"iterations": args.iterations, "warmup": args.warmup, **dataset},
+        "runs": runs,
+    }
+    _write(document, args.output)
+    return 0
+
+
+def compare_results(args) -> int:
+    from benchmarks.suite import compare
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows = compare(baseline, current, args.threshold, args.metric)
+    print(f"{'backend':<11} {'benchmark':<34} {'baseline':>10} {'current':>10} {'change':>9}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['backend']:<11} {row['benchmark']:<34} {row['baseline']:>10.3f}"
+            f" {row['current']:>10.3f} {row['change_pct']:>+8.1f}%{flag}"
+        )
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+async def _load(args, stages) -> dict:
+    import httpx
+    from benchmarks.load import run_load
+
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+    else:
+        from app.core.database import SessionLocal, engine, init_db
+        from app.main import app
+        from benchmarks.datagen import generate_dataset, reset_schema
+
+        if args.generate:
+            print(f"Generating {args.products} products and {args.months} month(s) of history")
+            reset_schema(engine)
+            db = SessionLocal()
+            try:
+                generate_dataset(db, products=args.products, customers=args.customers, months=args.months)
+            finally:
+                db.close()
+        init_db()
+        client = httpx.AsyncClient(
+            # Unhandled app errors become 500s, as they would behind a server
+            transport=httpx.ASGITransport(app=app, raise_app_exceptions=False), base_url="http://loadtest", timeout=args.timeout
+        )
+
+    async with client:
+        return await run_load(client, stages, args.duration, args.think_ms / 1000, args.seed)
+
+
+def load(args) -> int:
+    if args.generate and args.base_url:
+        print("--generate only applies to in-process runs")
+        return 2
+    if not args.base_url:
+        # One printed line per request would swamp the harness's own output
+        os.environ.setdefault("REQUEST_LOG_ENABLED", "false")
+    from benchmarks.suite import RESULTS_SCHEMA, environment
+
+    stages = [int(count) for count in args.terminals.split(",")]
+    result = asyncio.run(_load(args, stages))
+    stock = result["stock"]
+    print(
+        f"Stock check: {stock['inconsistent']} inconsistent, {stock['negative']} negative,"
+        f" {stock['unverifiable']} unverifiable of {stock['checked_products']} products"
+    )
+    _write({
+        "schema": RESULTS_SCHEMA,
+        "created_at": datetime.utcnow().replace(microsecond=0).isoformat(),
+        "environment": environment(),
+        "parameters": {
+            "target": args.base_url or "in-process",
+            "terminals": stages,
+            "duration": args.duration,
+            "think_ms": args.think_ms,
+            "seed": args.seed,
+        },
+        **result,
+    }, args.output)
+    return 1 if stock["inconsistent"] or stock["negative"] else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Generate a dataset and run the benchmarks")
+    run_parser.add_argument("--backends", default="sqlite", help="Comma-separated: sqlite,postgresql")
+    run_parser.add_argument("--sqlite-url", help="Scratch SQLite database (default: a temporary file)")
+    run_parser.add_argument("--postgres-url", help="Scratch Postgres database; its tables are dropped")
+    run_parser.add_argument("--products", type=int, default=2000, help="Products in the catalog")
+    run_parser.add_argument("--customers", type=int, default=1000, help="Customers")
+    run_parser.add_argument("--months", type=int, default=3, help="Months of order history")
+    run_parser.add_argument("--orders-per-day", type=int, default=150, help="Average orders per day")
+    run_parser.add_argument("--seed", type=int, default=42, help="Seed for the data and the inputs")
+    run_parser.add_argument("--iterations", type=int, default=200, help="Timed calls per benchmark")
+    run_parser.add_argument("--warmup", type=int, default=20, help="Untimed calls before timing")
+    run_parser.add_argument("--only", help="Comma-separated subset, e.g. create_order,report.sales")
+    run_parser.add_argument("--output", help="Write results JSON here instead of stdout")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline", help="Results JSON from the reference commit")
+    compare_parser.add_argument("current", help="Results JSON to check")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="Percent slowdown flagged")
+    compare_parser.add_argument("--metric", default="p50_ms", help="Statistic compared, e.g. p95_ms")
+    compare_parser.set_defaults(handler=compare_results)
+
+    load_parser = commands.add_parser("load", help="Drive the API with concurrent simulated terminals")
+    load_parser.add_argument("--terminals", default="1,2,4,8", help="Comma-separated terminal counts, one stage each")
+    load_parser.add_argument("--duration", type=float, default=30, help="Seconds per stage")
+    load_parser.add_argument("--think-ms", type=float, default=0, help="Mean pause between sales")
+    load_parser.add_argument("--base-url", help="Server to load, e.g. http://127.0.0.1:8000 (default: in-process)")
+    load_parser.add_argument("--timeout", type=float, default=30, help="Seconds before a request counts as an error")
+    load_parser.add_argument("--generate", action="store_true", help="In-process: wipe DATABASE_URL and seed it first")
+    load_parser.add_argument("--products", type=int, default=2000, help="Products generated with --generate")
+    load_parser.add_argument("--customers", type=int, default=1000, help="Customers generated with --generate")
+    load_parser.add_argument("--months", type=int, default=1, help="Months of history generated with --generate")
+    load_parser.add_argument("--seed", type=int, default=42, help="Seed for terminal behaviour")
+    load_parser.add_argument("--output", help="Write results JSON here instead of stdout")
+    load_parser.set_defaults(handler=load)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
@@ -0,0 +1,307 @@
+"""Synthetic store history: catalog, customers, orders, payments and inventory logs"""
+import math
+import random
+import string
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.core.security import get_password_hash
+from app.models import (
+    Category, Customer, InventoryAction, InventoryLog, Order, OrderItem, OrderStatus,
+    Payment, PaymentMethod, PaymentStatus, Product, User, UserRole,
+)
+from app.models.product import create_product_search_index
+from app.services.rollup_service import SalesRollupService
+
+# Rows per INSERT ... executemany batch
+CHUNK_SIZE = 5000
+
+# Weights shaping the order history
+HOUR_WEIGHTS = {  # lunch and dinner peaks
+    10: 2, 11: 6, 12: 10, 13: 8, 14: 4, 15: 3, 16: 3, 17: 5, 18: 9, 19: 10, 20: 7, 21: 3,
+}
+WEEKDAY_WEIGHTS = (0.8, 0.85, 0.9, 1.0, 1.3, 1.5, 1.2)  # Monday .. Sunday
+STATUS_WEIGHTS = {OrderStatus.COMPLETED: 0.95, OrderStatus.CANCELLED: 0.03, OrderStatus.REFUNDED: 0.02}
+PAYMENT_WEIGHTS = {
+    PaymentMethod.CASH: 0.35, PaymentMethod.CREDIT_CARD: 0.35,
+    PaymentMethod.DEBIT_CARD: 0.2, PaymentMethod.MOBILE_PAYMENT: 0.1,
+}
+SPLIT_PAYMENT_RATE = 0.1
+CUSTOMER_ORDER_RATE = 0.4  # share of orders with a known customer
+TAX_RATE = Decimal("0.08")
+RESTOCK_DAYS = 7
+
+CATEGORY_NAMES = (
+    "Beverages", "Bakery", "Dairy", "Produce", "Snacks", "Frozen", "Pantry", "Household",
+    "Deli", "Meat", "Seafood", "Desserts", "Breakfast", "Condiments", "Specials", "Merchandise",
+)
+PRODUCT_WORDS = (
+    "classic", "organic", "spicy", "fresh", "smoked", "sweet", "crispy", "golden", "house",
+    "roasted", "garden", "double", "mini", "family", "vanilla", "lemon", "garlic", "honey",
+    "coffee", "tea", "cola", "juice", "bread", "bagel", "muffin", "cheese", "yogurt", "milk",
+    "salad", "burger", "wrap", "soup", "chips", "cookie", "cake", "pizza", "pasta", "rice",
+)
+FIRST_NAMES = ("Ana", "Ben", "Chen", "Dara", "Eli", "Farah", "Gus", "Hana", "Ivan", "Jo", "Kai", "Lena")
+LAST_NAMES = ("Silva", "Okafor", "Nguyen", "Patel", "Smith", "Kowalski", "Garcia", "Kim", "Haddad", "Berg")
+
+
+def _weighted_index(rng: random.Random, cumulative: List[float]) -> int:
+    """Index drawn from a cumulative weight table"""
+    return min(bisect_left(cumulative, rng.random() * cumulative[-1]), len(cumulative) - 1)
+
+
+def _cumulative(weights) -> List[float]:
+    total, table = 0.0, []
+    for weight in weights:
+        total += weight
+        table.append(total)
+    return table
+
+
+def _money(value: float) -> Decimal:
+    return Decimal(str(round(value, 2)))
+
+
+def _ean13(number: int) -> str:
+    """EAN-13 barcode with a valid check digit"""
+    digits = f"20{number:010d}"
+    check = (10 - sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digits)) % 10) % 10
+    return digits + str(check)
+
+
+def _insert(db: Session, table, rows: List[Dict]) -> None:
+    for start in range(0, len(rows), CHUNK_SIZE):
+        db.execute(insert(table), rows[start:start + CHUNK_SIZE])
+
+
+def reset_schema(engine) -> None:
+    """Drop and recreate every table, including the search index"""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        create_product_search_index(connection)
+
+
+def generate_dataset(
+    db: Session,
+    products: int = 2000,
+    customers: int = 1000,
+    months: int = 3,
+    orders_per_day: int = 150,
+    seed: int = 42,
+    now: datetime = None,
+) -> Dict:
+    """Fill an empty database with ``months`` of store history; return row counts.
+
+    The same arguments (including ``now``) produce the same rows. Product
+    popularity follows a Zipf curve and customer loyalty a Pareto-like one;
+    order volume peaks at lunch, dinner and on weekends; stock is replenished
+    weekly and every change is written to the inventory log with running
+    quantities.
+    """
+    rng = random.Random(seed)
+    now = (now or datetime.utcnow()).replace(microsecond=0)
+    start = now - timedelta(days=30 * months)
+    created = start - timedelta(days=1)
+
+    # -------- Users and catalog --------
+    password = get_password_hash("benchmark")
+    users = [{
+        "username": name, "email": f"{name}@bench.example.com", "hashed_password": password,
+        "full_name": name.title(), "role": role, "is_active": True, "is_verified": True,
+        "created_at": created, "updated_at": created,
+    } for name, role in (
+        ("admin", UserRole.ADMIN), ("manager", UserRole.MANAGER),
+        ("cashier1", UserRole.CASHIER), ("cashier2", UserRole.CASHIER), ("cashier3", UserRole.CASHIER),
+    )]
+    _insert(db, User.__table__, users)
+    cashier_ids = [3, 4, 5]
+
+    category_count = max(1, min(len(CATEGORY_NAMES), products // 50))
+    _insert(db, Category.__table__, [{
+        "name": name, "description": f"{name} items", "is_active": True, "catalog_version": 0,
+        "created_at": created, "updated_at": created,
+    } for name in CATEGORY_NAMES[:category_count]])
+
+    catalog = []
+    for i in range(products):
+        price = _money(min(max(rng.lognormvariate(1.6, 0.7), 0.5), 150))
+        words = rng.sample(PRODUCT_WORDS, 3)
+        catalog.append({
+            "sku": f"SKU-{i + 1:06d}",
+            "name": f"{' '.join(words).title()} {i + 1}",
+            "description": None,
+            "barcode": _ean13(i + 1),
+            "price": price,
+            "cost_price": _money(float(price) * rng.uniform(0.35, 0.65)),
+            "stock_quantity": 0,
+            "min_stock_level": rng.choice((5, 10, 20)),
+            "is_active": rng.random() > 0.02,
+            "category_id": rng.randint(1, category_count),
+            "catalog_version": 0,
+            "created_at": created,
+            "updated_at": created,
+        })
+    # Zipf popularity over a shuffled catalog, so ids do not predict sales
+    ranks = list(range(1, products + 1))
+    rng.shuffle(ranks)
+    product_table = _cumulative(1 / rank ** 1.1 for rank in ranks)
+
+    # -------- Customers --------
+    customer_rows = [{
+        "first_name": rng.choice(FIRST_NAMES), "last_name": rng.choice(LAST_NAMES),
+        "email": f"customer{i + 1}@bench.example.com",
+        "phone": "555" + "".join(rng.choice(string.digits) for _ in range(7)),
+        "city": rng.choice(("Springfield", "Riverton", "Lakeside", "Hillview")),
+        "country": "US", "loyalty_points": 0, "total_spent": Decimal("0"), "is_active": True,
+        "created_at": created, "updated_at": created,
+    } for i in range(customers)]
+    customer_table = _cumulative(1 / (i + 1) ** 0.8 for i in range(customers)) if customers else []
+    customer_spend = [Decimal("0")] * customers
+
+    # -------- Orders, items, payments, inventory --------
+    stock = [rng.randint(100, 400) for _ in range(products)]
+    initial_stock = list(stock)
+    orders, items, payments, logs = [], [], [], []
+    hours = list(HOUR_WEIGHTS)
+    hour_table = _cumulative(HOUR_WEIGHTS.values())
+    status_table = _cumulative(STATUS_WEIGHTS.values())
+    statuses = list(STATUS_WEIGHTS)
+    method_table = _cumulative(PAYMENT_WEIGHTS.values())
+    methods = list(PAYMENT_WEIGHTS)
+
+    for index, quantity in enumerate(stock):
+        logs.append({
+            "product_id": index + 1, "user_id": 1, "action": InventoryAction.STOCK_IN,
+            "quantity_change": quantity, "quantity_before": 0, "quantity_after": quantity,
+            "reference_number": "OPENING", "notes": "Opening stock", "created_at": created,
+        })
+
+    day = start.replace(hour=0, minute=0, second=0)
+    day_number = 0
+    while day < now:
+        if day_number and day_number % RESTOCK_DAYS == 0:
+            restock_at = day + timedelta(hours=7)
+            for index, product in enumerate(catalog):
+                target = product["min_stock_level"] * 20
+                if stock[index] < target:
+                    change = target - stock[index]
+                    logs.append({
+                        "product_id": index + 1, "user_id": 2, "action": InventoryAction.STOCK_IN,
+                        "quantity_change": change, "quantity_before": stock[index],
+                        "quantity_after": target, "reference_number": f"PO-{day:%Y%m%d}",
+                        "notes": "Weekly delivery", "created_at": restock_at,
+                    })
+                    stock[index] = target
+
+        expected = orders_per_day * WEEKDAY_WEIGHTS[day.weekday()]
+        count = max(0, int(rng.gauss(expected, math.sqrt(expected))))
+        times = sorted(
+            day + timedelta(hours=hours[_weighted_index(rng, hour_table)], seconds=rng.randrange(3600))
+            for _ in range(count)
+        )
+        for created_at in times:
+            if created_at >= now:
+                break
+            order_id = len(orders) + 1
+            order_number = f"BEN-{created_at:%Y%m%d}-{order_id:08d}"
+            status = statuses[_weighted_index(rng, status_table)]
+            cashier = rng.choice(cashier_ids)
+            customer = _weighted_index(rng, customer_table) if customers and rng.random() < CUSTOMER_ORDER_RATE else None
+
+            lines: Dict[int, int] = {}
+            for _ in range(min(1 + int(rng.expovariate(1 / 2.2)), 15)):
+                product = _weighted_index(rng, product_table)
+                if catalog[product]["is_active"]:
+                    lines[product] = lines.get(product, 0) + (1 if rng.random() < 0.8 else rng.randint(2, 4))
+            lines = {product: quantity for product, quantity in lines.items() if stock[product] >= quantity}
+            if not lines:
+                continue
+
+            subtotal = Decimal("0")
+            for product, quantity in lines.items():
+                line_total = catalog[product]["price"] * quantity
+                subtotal += line_total
+                items.append({
+                    "order_id": order_id, "product_id": product + 1,
+                    "product_name": catalog[product]["name"], "product_sku": catalog[product]["sku"],
+                    "quantity": quantity, "unit_price": catalog[product]["price"], "discount": Decimal("0"),
+                    "subtotal": line_total, "created_at": created_at,
+                })
+                # Cancelled orders had their stock put back; the log records both moves
+                logs.append({
+                    "product_id": product + 1, "user_id": cashier, "action": InventoryAction.SALE,
+                    "quantity_change": -quantity, "quantity_before": stock[product],
+                    "quantity_after": stock[product] - quantity, "reference_number": order_number,
+                    "notes": f"Sold via order {order_number}", "created_at": created_at,
+                })
+                stock[product] -= quantity
+                if status in (OrderStatus.CANCELLED, OrderStatus.REFUNDED):
+                    logs.append({
+                        "product_id": product + 1, "user_id": cashier, "action": InventoryAction.RETURN,
+                        "quantity_change": quantity, "quantity_before": stock[product],
+                        "quantity_after": stock[product] + quantity, "reference_number": order_number,
+                        "notes": f"Returned from order {order_number}", "created_at": created_at + timedelta(minutes=5),
+                    })
+                    stock[product] += quantity
+
+            tax = (subtotal * TAX_RATE).quantize(Decimal("0.01"))
+            total = subtotal + tax
+            orders.append({
+                "order_number": order_number, "customer_id": customer + 1 if customer is not None else None,
+                "user_id": cashier, "status": status, "subtotal": subtotal, "tax": tax,
+                "discount": Decimal("0"), "total": total, "notes": None,
+                "created_at": created_at, "updated_at": created_at,
+                "completed_at": created_at if status != OrderStatus.CANCELLED else None,
+            })
+            if status == OrderStatus.CANCELLED:
+                continue
+            if customer is not None and status == OrderStatus.COMPLETED:
+                customer_spend[customer] += total
+
+            split = rng.random() < SPLIT_PAYMENT_RATE and total > Decimal("1.00")
+            first = (total * Decimal(str(round(rng.uniform(0.3, 0.7), 2)))).quantize(Decimal("0.01")) if split else total
+            for amount in ((first, total - first) if split else (total,)):
+                payments.append({
+                    "order_id": order_id, "payment_method": methods[_weighted_index(rng, method_table)],
+                    "status": PaymentStatus.REFUNDED if status == OrderStatus.REFUNDED else PaymentStatus.COMPLETED,
+                    "amount": amount, "transaction_id": f"TXN-{len(payments) + 1:010d}",
+                    "created_at": created_at, "updated_at": created_at,
+                })
+        day += timedelta(days=1)
+        day_number += 1
+
+    for index, product in enumerate(catalog):
+        product["stock_quantity"] = stock[index]
+    for index, spent in enumerate(customer_spend):
+        customer_rows[index]["total_spent"] = spent
+        customer_rows[index]["loyalty_points"] = int(spent)
+
+    _insert(db, Product.__table__, catalog)
+    _insert(db, Customer.__table__, customer_rows)
+    _insert(db, Order.__table__, orders)
+    _insert(db, OrderItem.__table__, items)
+    _insert(db, Payment.__table__, payments)
+    _insert(db, InventoryLog.__table__, logs)
+    db.commit()
+    rollup_rows = SalesRollupService.rebuild(db)
+
+    return {
+        "seed": seed,
+        "products": products,
+        "customers": customers,
+        "months": months,
+        "orders_per_day": orders_per_day,
+        "orders": len(orders),
+        "order_items": len(items),
+        "payments": len(payments),
+        "inventory_logs": len(logs),
+        "sales_daily": rollup_rows,
+        "opening_stock": sum(initial_stock),
+    }
@@ -0,0 +1,265 @@
+"""Multi-terminal load harness: simulated tills driving the HTTP API concurrently"""
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from decimal import Decimal
+from typing import Dict, List, Optional, Set
+
+import httpx
+
+API = "/api/v1"
+PASSWORD = "loadtest-password"
+
+# Terminal behaviour
+MAX_SCANS = 5  # items scanned per sale, 1..MAX_SCANS
+CANCEL_RATE = 0.05  # sales voided instead of paid
+SPLIT_PAYMENT_RATE = 0.3  # sales paid part cash, part card
+
+
+class OperationStats:
+    """Latencies and outcomes of one kind of request"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.rejected = 0  # 4xx: the API refused, e.g. out of stock
+        self.errors = 0  # 5xx or no response
+
+    def record(self, elapsed: float, status_code: Optional[int]) -> None:
+        self.latencies.append(elapsed)
+        if status_code is None or status_code >= 500:
+            self.errors += 1
+        elif status_code >= 400:
+            self.rejected += 1
+
+    def summary(self) -> Dict:
+        count = len(self.latencies)
+        ms = sorted(t * 1000 for t in self.latencies)
+        percentiles = statistics.quantiles(ms, n=100, method="inclusive") if count > 1 else ms * 99
+        return {
+            "requests": count,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "p50_ms": round(percentiles[49], 2) if count else None,
+            "p95_ms": round(percentiles[94], 2) if count else None,
+            "p99_ms": round(percentiles[98], 2) if count else None,
+            "max_ms": round(ms[-1], 2) if count else None,
+        }
+
+
+class LoadRun:
+    """Shared state of one run: per-operation stats and the stock ledger"""
+
+    def __init__(self):
+        self.operations: Dict[str, OperationStats] = {}
+        self.checkouts = 0
+        self.cancels = 0
+        self.stock_changes: Dict[int, int] = {}
+        # Products touched by a write whose outcome is unknown (5xx, timeout)
+        self.uncertain: Set[int] = set()
+
+    async def request(self, client: httpx.AsyncClient, operation: str, method: str, url: str, **kwargs):
+        """Send a request, timing it under ``operation``; None when no response came back"""
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        self.operations.setdefault(operation, OperationStats()).record(
+            time.perf_counter() - start, response.status_code if response is not None else None
+        )
+        return response
+
+    def record_stock(self, quantities: Dict[int, int], sign: int, response) -> None:
+        if response is not None and response.status_code == 200:
+            for product_id, quantity in quantities.items():
+                self.stock_changes[product_id] = self.stock_changes.get(product_id, 0) + sign * quantity
+        elif response is None or response.status_code >= 500:
+            self.uncertain.update(quantities)
+
+
+async def register_terminal_user(client: httpx.AsyncClient) -> str:
+    """Create a cashier account for one terminal and return its username"""
+    username = f"till_{uuid.uuid4().hex[:10]}"
+    response = await client.post(f"{API}/auth/register", json={
+        "username": username,
+        "email": f"{username}@loadtest.example.com",
+        "password": PASSWORD,
+        "full_name": "Load Test Terminal",
+        "role": "cashier",
+    })
+    response.raise_for_status()
+    return username
+
+
+async def fetch_stock(client: httpx.AsyncClient, page_size: int = 500) -> Dict[int, int]:
+    """Current stock of every product, read through the uncached product listing"""
+    stock: Dict[int, int] = {}
+    skip = 0
+    while True:
+        response = await client.get(f"{API}/products", params={"skip": skip, "limit": page_size})
+        response.raise_for_status()
+        page = response.json()
+        stock.update({product["id"]: product["stock_quantity"] for product in page["data"]})
+        skip += page_size
+        if skip >= page["total"]:
+            return stock
+
+
+async def terminal(
+    client: httpx.AsyncClient,
+    run: LoadRun,
+    username: str,
+    ready: asyncio.Event,
+    started: asyncio.Event,
+    duration: float,
+    think_time: float,
+    seed: int,
+) -> None:
+    """One till: log in, load the catalog, then ring up sales until time is up"""
+    rng = random.Random(seed)
+    login = await run.request(
+        client, "login", "POST", f"{API}/auth/login", json={"username": username, "password": PASSWORD}
+    )
+    if login is None or login.status_code != 200:
+        ready.set()
+        return
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    snapshot = await run.request(
+        client, "catalog_bootstrap", "GET", f"{API}/catalog/snapshot", headers={"Accept-Encoding": "gzip"}
+    )
+    barcodes = [
+        product["barcode"] for product in (snapshot.json()["products"] if snapshot is not None else [])
+        if product["barcode"] and product["is_active"]
+    ]
+    ready.set()
+    await started.wait()
+    if not barcodes:
+        return
+
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        quantities: Dict[int, int] = {}
+        for barcode in rng.sample(barcodes, min(len(barcodes), rng.randint(1, MAX_SCANS))):
+            scan = await run.request(client, "scan", "GET", f"{API}/products/barcode/{barcode}")
+            if scan is not None and scan.status_code == 200 and scan.json()["stock_quantity"] > 0:
+                quantities[scan.json()["id"]] = 1
+        if not quantities:
+            continue
+
+        order = await run.request(client, "create_order", "POST", f"{API}/orders/", headers=headers, json={
+            "order_items": [{"product_id": product_id, "quantity": q} for product_id, q in quantities.items()],
+        })
+        run.record_stock(quantities, -1, order)
+        if order is None or order.status_code != 200:
+            continue
+        order_id = order.json()["id"]
+        total = Decimal(str(order.json()["total"]))
+
+        if rng.random() < CANCEL_RATE:
+            cancel = await run.request(
+                client, "cancel_order", "POST", f"{API}/orders/{order_id}/cancel", headers=headers
+            )
+            run.record_stock(quantities, 1, cancel)
+            if cancel is not None and cancel.status_code == 200:
+                run.cancels += 1
+            continue
+
+        if rng.random() < SPLIT_PAYMENT_RATE and total > Decimal("1.00"):
+            cash = (total / 2).quantize(Decimal("0.01"))
+            payments = [("cash", cash), ("credit_card", total - cash)]
+        else:
+            payments = [(rng.choice(("cash", "credit_card", "debit_card")), total)]
+        for method, amount in payments:
+            await run.request(client, "create_payment", "POST", f"{API}/payments/", headers=headers, json={
+                "order_id": order_id, "payment_method": method, "amount": str(amount),
+            })
+        run.checkouts += 1
+        if think_time:
+            await asyncio.sleep(rng.expovariate(1 / think_time))
+
+
+async def run_stage(
+    client: httpx.AsyncClient, usernames: List[str], duration: float, think_time: float, seed: int
+) -> Dict:
+    """Run one terminal per username for ``duration`` seconds after all have logged in"""
+    run = LoadRun()
+    ready_events = [asyncio.Event() for _ in usernames]
+    started = asyncio.Event()
+    tasks = [
+        asyncio.create_task(terminal(client, run, username, ready, started, duration, think_time, seed + index))
+        for index, (username, ready) in enumerate(zip(usernames, ready_events))
+    ]
+    await asyncio.gather(*(event.wait() for event in ready_events))
+    start = time.perf_counter()
+    started.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    requests = sum(len(stats.latencies) for stats in run.operations.values())
+    errors = sum(stats.errors for stats in run.operations.values())
+    return {
+        "terminals": len(usernames),
+        "seconds": round(elapsed, 2),
+        "checkouts": run.checkouts,
+        "cancels": run.cancels,
+        "checkouts_per_sec": round(run.checkouts / elapsed, 2) if elapsed else 0.0,
+        "requests_per_sec": round(requests / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(errors / requests, 4) if requests else 0.0,
+        "operations": {name: stats.summary() for name, stats in sorted(run.operations.items())},
+        "_run": run,
+    }
+
+
+def stock_inconsistencies(before: Dict[int, int], after: Dict[int, int], runs: List[LoadRun]) -> Dict:
+    """Products whose final stock differs from the starting stock plus confirmed sales and returns"""
+    changes: Dict[int, int] = {}
+    uncertain: Set[int] = set()
+    for run in runs:
+        uncertain |= run.uncertain
+        for product_id, change in run.stock_changes.items():
+            changes[product_id] = changes.get(product_id, 0) + change
+
+    mismatches = []
+    for product_id, start in before.items():
+        expected = start + changes.get(product_id, 0)
+        actual = after.get(product_id)
+        if actual is not None and (actual != expected or actual < 0) and product_id not in uncertain:
+            mismatches.append({"product_id": product_id, "expected": expected, "actual": actual})
+    return {
+        "checked_products": len(before),
+        "inconsistent": len(mismatches),
+        "negative": sum(1 for stock in after.values() if stock < 0),
+        "unverifiable": len(uncertain),
+        "examples": mismatches[:20],
+    }
+
+
+async def run_load(
+    client: httpx.AsyncClient, stages: List[int], duration: float, think_time: float = 0.0, seed: int = 42
+) -> Dict:
+    """Run a stage per terminal count, then reconcile stock against the ledger.
+
+    Stock can only be reconciled when nothing else writes to the store
+    during the run.
+    """
+    usernames = [await register_terminal_user(client) for _ in range(max(stages))]
+    before = await fetch_stock(client)
+
+    results = []
+    for terminals in stages:
+        print(f"Running {terminals} terminal(s) for {duration:g}s")
+        stage = await run_stage(client, usernames[:terminals], duration, think_time, seed)
+        order_stats = stage["operations"].get("create_order", {})
+        print(
+            f"  {stage['checkouts_per_sec']:.1f} checkouts/s, create_order p95"
+            f" {order_stats.get('p95_ms')} ms, error rate {stage['error_rate']:.2%}"
+        )
+        results.append(stage)
+
+    after = await fetch_stock(client)
+    stock = stock_inconsistencies(before, after, [stage.pop("_run") for stage in results])
+    return {"stages": results, "stock": stock}
@@ -0,0 +1,259 @@
+"""Service-level benchmarks for checkout, lookups and reports"""
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import sqlalchemy
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import get_settings
+from app.core.db_pool import pool_options
+from app.core.sqlite import configure_sqlite_engine
+from app.models import PaymentMethod, Product
+from app.schemas import OrderCreate, OrderItemCreate, PaymentCreate
+from app.services.order_service import OrderService
+from app.services.payment_service import PaymentService
+from app.services.product_service import ProductService
+from app.services.report_service import ReportService
+from benchmarks.datagen import PRODUCT_WORDS, generate_dataset, reset_schema
+
+# Version of the results document; bump when its layout changes
+RESULTS_SCHEMA = 1
+
+CASHIER_ID = 3
+
+
+def build_engine(url: str):
+    """An engine configured the way app.core.database configures the app's"""
+    settings = get_settings()
+    is_sqlite = make_url(url).get_backend_name() == "sqlite"
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False} if is_sqlite else {},
+        **pool_options(url, settings),
+    )
+    if is_sqlite and settings.SQLITE_PROFILE_ENABLED:
+        configure_sqlite_engine(engine, settings)
+    return engine
+
+
+class BenchmarkContext:
+    """Inputs the benchmarks draw from, loaded once per database"""
+
+    def __init__(self, db: Session, now: datetime):
+        self.rng = random.Random()
+        self.now = now
+        rows = db.execute(
+            select(Product.id, Product.barcode).where(Product.is_active == True).order_by(Product.id)
+        ).all()
+        self.product_ids = [row.id for row in rows]
+        self.barcodes = [row.barcode for row in rows]
+        self.search_terms = [word[:length] for word in PRODUCT_WORDS for length in (3, 5)]
+        self.search_terms += [f"{a} {b[:3]}" for a, b in zip(PRODUCT_WORDS, reversed(PRODUCT_WORDS))]
+
+    def order(self, lines: int = 3) -> OrderCreate:
+        return OrderCreate(order_items=[
+            OrderItemCreate(product_id=product_id, quantity=1)
+            for product_id in self.rng.sample(self.product_ids, lines)
+        ])
+
+
+# A benchmark takes the session factory and context and returns the timed
+# operation, called with a fresh session on every iteration. Benchmarks that
+# write run last so reads always see the generated dataset.
+def _create_order(factory, ctx: BenchmarkContext, iterations: int):
+    return lambda db: OrderService.create_order(db, ctx.order(), CASHIER_ID)
+
+
+def _create_payment(factory, ctx: BenchmarkContext, iterations: int):
+    # Untimed: one pending order per iteration to pay in full
+    pending = []
+    db = factory()
+    try:
+        for _ in range(iterations):
+            order = OrderService.create_order(db, ctx.order(), CASHIER_ID)
+            pending.append((order.id, order.total))
+    finally:
+        db.close()
+    methods = list(PaymentMethod)
+
+    def pay(db):
+        order_id, total = pending.pop()
+        PaymentService.create_payment(db, PaymentCreate(
+            order_id=order_id, payment_method=ctx.rng.choice(methods), amount=total,
+        ))
+    return pay
+
+
+def _barcode_lookup(factory, ctx: BenchmarkContext, iterations: int):
+    return lambda db: ProductService.get_product_by_barcode(db, ctx.rng.choice(ctx.barcodes))
+
+
+def _product_search(factory, ctx: BenchmarkContext, iterations: int):
+    return lambda db: ProductService.search_products(db, ctx.rng.choice(ctx.search_terms))
+
+
+def _report(method: Callable, *args_for: Callable):
+    def setup(factory, ctx: BenchmarkContext, iterations: int):
+        return lambda db: method(db, *(arg(ctx) for arg in args_for))
+    return setup
+
+
+_month_start = lambda ctx: ctx.now - timedelta(days=30)
+_now = lambda ctx: ctx.now
+_yesterday = lambda ctx: (ctx.now - timedelta(days=1)).date()
+
+BENCHMARKS: Dict[str, Callable] = {
+    "barcode_lookup": _barcode_lookup,
+    "product_search": _product_search,
+    "report.sales": _report(ReportService.get_sales_report, _month_start, _now),
+    "report.sales_from_rollup": _report(
+        ReportService.get_sales_report_from_rollup, lambda ctx: _month_start(ctx).date(), lambda ctx: ctx.now.date()
+    ),
+    "report.product_sales": _report(ReportService.get_product_sales_report),
+    "report.payment_methods": _report(ReportService.get_payment_method_report),
+    "report.inventory": _report(ReportService.get_inventory_report),
+    "report.daily_summary": _report(
+        ReportService.get_daily_summary, lambda ctx: datetime.combine(_yesterday(ctx), datetime.min.time())
+    ),
+    "report.daily_summary_from_rollup": _report(ReportService.get_daily_summary_from_rollup, _yesterday),
+    "report.customers": _report(ReportService.get_customer_report),
+    "create_order": _create_order,
+    "create_payment": _create_payment,
+}
+
+
+def summarize(timings: List[float]) -> Dict:
+    """Latency statistics in milliseconds plus throughput"""
+    ms = sorted(t * 1000 for t in timings)
+    percentiles = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else ms * 99
+    total = sum(timings)
+    return {
+        "iterations": len(ms),
+        "ops_per_sec": round(len(ms) / total, 2) if total else None,
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "stdev_ms": round(statistics.stdev(ms), 4) if len(ms) > 1 else 0.0,
+        "min_ms": round(ms[0], 4),
+        "p50_ms": round(percentiles[49], 4),
+        "p95_ms": round(percentiles[94], 4),
+        "p99_ms": round(percentiles[98], 4),
+        "max_ms": round(ms[-1], 4),
+    }
+
+
+def run_benchmark(factory, setup: Callable, ctx: BenchmarkContext, iterations: int, warmup: int) -> Dict:
+    """Time ``iterations`` calls after ``warmup`` untimed ones, one session each"""
+    operation = setup(factory, ctx, iterations + warmup)
+    timings = []
+    for i in range(iterations + warmup):
+        db = factory()
+        try:
+            start = time.perf_counter()
+            operation(db)
+            elapsed = time.perf_counter() - start
+        finally:
+            db.close()
+        if i >= warmup:
+            timings.append(elapsed)
+    return summarize(timings)
+
+
+def run_suite(
+    url: str,
+    dataset: Dict,
+    iterations: int = 200,
+    warmup: int = 20,
+    only: Optional[List[str]] = None,
+    now: Optional[datetime] = None,
+) -> Dict:
+    """Rebuild ``url``'s schema, generate the dataset and run the benchmarks.
+
+    The database at ``url`` is wiped first, so point it at a scratch database.
+    """
+    now = (now or datetime.utcnow()).replace(microsecond=0)
+    engine = build_engine(url)
+    factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    settings = get_settings()
+    cache_backend = settings.REPORT_CACHE_BACKEND
+    settings.REPORT_CACHE_BACKEND = "none"  # measure the queries, not the cache
+    try:
+        reset_schema(engine)
+        db = factory()
+        try:
+            start = time.perf_counter()
+            summary = generate_dataset(db, now=now, **dataset)
+            summary["generate_seconds"] = round(time.perf_counter() - start, 2)
+            # Checkout benchmarks must not run out of stock partway through
+            db.execute(update(Product).values(stock_quantity=Product.stock_quantity + 10 ** 6))
+            db.commit()
+            ctx = BenchmarkContext(db, now)
+        finally:
+            db.close()
+
+        results = {}
+        for name, setup in BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            # Each benchmark draws its own input sequence, so --only does not shift it
+            ctx.rng = random.Random(f"{dataset.get('seed', 42)}:{name}")
+            results[name] = run_benchmark(factory, setup, ctx, iterations, warmup)
+            print(f"  {name:<34} p50 {results[name]['p50_ms']:>9.3f} ms  p95 {results[name]['p95_ms']:>9.3f} ms")
+        return {
+            "backend": engine.dialect.name,
+            "database": make_url(url).render_as_string(hide_password=True),
+            "dataset": summary,
+            "results": results,
+        }
+    finally:
+        settings.REPORT_CACHE_BACKEND = cache_backend
+        engine.dispose()
+
+
+def environment() -> Dict:
+    """Where the results came from: commit, interpreter and library versions"""
+    def git(*args) -> Optional[str]:
+        try:
+            return subprocess.run(
+                ("git",) + args, capture_output=True, text=True, check=True, timeout=10
+            ).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = 10.0, metric: str = "p50_ms") -> List[Dict]:
+    """Per backend and benchmark change in ``metric``; slower than ``threshold`` percent is a regression"""
+    before = {
+        (run["backend"], name): stats
+        for run in baseline["runs"] for name, stats in run["results"].items()
+    }
+    rows = []
+    for run in current["runs"]:
+        for name, stats in run["results"].items():
+            old = before.get((run["backend"], name))
+            if old is None or not old.get(metric):
+                continue
+            change = (stats[metric] - old[metric]) / old[metric] * 100
+            rows.append({
+                "backend": run["backend"],
+                "benchmark": name,
+                "baseline": old[metric],
+                "current": stats[metric],
+                "change_pct": round(change, 2),
+                "regression": change > threshold,
+            })
+    return rows
@@ -1,6 +1,6 @@
 """Database backup script"""
 import os
-import shutil
+import sqlite3
 from datetime import datetime
 
 
@@ -20,7 +20,15 @@ def backup_database():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     backup_file = os.path.join(backup_dir, f"pos_backup_{timestamp}.db")
     
-    shutil.copy(db_file, backup_file)
+    # The online backup API includes transactions still in the WAL, which a
+    # plain file copy would miss while the app runs
+    source = sqlite3.connect(db_file)
+    target = sqlite3.connect(backup_file)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
     print(f"✓ Database backed up to: {backup_file}")
 
 
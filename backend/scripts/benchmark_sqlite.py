@@ -0,0 +1,138 @@
+"""Compare checkout and report throughput on SQLite with and without the tuned profile"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import get_settings
+from app.core.database import Base
+from app.core.db_pool import pool_options
+from app.core.sqlite import configure_sqlite_engine
+from app.models import Order, OrderStatus, Product, User
+from app.schemas import OrderCreate, OrderItemCreate
+from app.services.order_service import OrderService
+from app.services.report_service import ReportService
+
+
+def _build_store(path: str, tuned: bool, products: int, history: int):
+    """Create and seed a store database; return a session factory and product ids"""
+    url = f"sqlite:///{path}"
+    settings = get_settings()
+    engine = create_engine(url, connect_args={"check_same_thread": False}, **pool_options(url, settings))
+    if tuned:
+        configure_sqlite_engine(engine, settings)
+    Base.metadata.create_all(engine)
+
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(insert(User.__table__), [{
+            "username": "bench", "email": "bench@example.com", "hashed_password": "x",
+            "full_name": "Bench", "role": "ADMIN", "is_active": True, "is_verified": True,
+            "created_at": now, "updated_at": now,
+        }])
+        connection.execute(insert(Product.__table__), [{
+            "sku": f"BENCH-{i}", "name": f"Bench item {i}", "price": Decimal("2.50"),
+            "stock_quantity": 10 ** 9, "min_stock_level": 0, "is_active": True,
+            "catalog_version": 0, "created_at": now, "updated_at": now,
+        } for i in range(products)])
+        connection.execute(insert(Order.__table__), [{
+            "order_number": f"HIST-{i}", "user_id": 1, "status": OrderStatus.COMPLETED,
+            "subtotal": Decimal("5.00"), "tax": 0, "discount": 0, "total": Decimal("5.00"),
+            "created_at": now - timedelta(minutes=i), "updated_at": now,
+        } for i in range(history)])
+
+    ids = list(range(1, products + 1))
+    return engine, sessionmaker(bind=engine, autoflush=False), ids
+
+
+def _run(factory, product_ids, seconds: float, checkout_threads: int, report_threads: int):
+    """Run checkouts and reports concurrently for ``seconds``; return counters"""
+    deadline = time.perf_counter() + seconds
+    results = {"checkouts": [], "reports": [], "errors": 0}
+    lock = threading.Lock()
+
+    def checkout_loop():
+        rng = random.Random()
+        while time.perf_counter() < deadline:
+            items = [OrderItemCreate(product_id=pid, quantity=1) for pid in rng.sample(product_ids, 3)]
+            db = factory()
+            start = time.perf_counter()
+            try:
+                OrderService.create_order(db, OrderCreate(order_items=items), user_id=1)
+                with lock:
+                    results["checkouts"].append(time.perf_counter() - start)
+            except Exception:
+                with lock:
+                    results["errors"] += 1
+            finally:
+                db.close()
+
+    def report_loop():
+        while time.perf_counter() < deadline:
+            db = factory()
+            start = time.perf_counter()
+            try:
+                ReportService.get_sales_report(db, datetime.utcnow() - timedelta(days=30), datetime.utcnow())
+                with lock:
+                    results["reports"].append(time.perf_counter() - start)
+            except Exception:
+                with lock:
+                    results["errors"] += 1
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=checkout_loop) for _ in range(checkout_threads)]
+    threads += [threading.Thread(target=report_loop) for _ in range(report_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def _summary(name: str, results, seconds: float) -> str:
+    def pct(values, q):
+        if not values:
+            return 0.0
+        return statistics.quantiles(values, n=100)[q - 1] * 1000 if len(values) > 1 else values[0] * 1000
+
+    checkouts, reports = results["checkouts"], results["reports"]
+    return (
+        f"{name:<8} {len(checkouts) / seconds:>10.1f} {pct(checkouts, 50):>9.1f} {pct(checkouts, 95):>9.1f}"
+        f" {len(reports) / seconds:>10.1f} {pct(reports, 95):>9.1f} {results['errors']:>7}"
+    )
+
+
+def benchmark(seconds: float, checkout_threads: int, report_threads: int, products: int, history: int):
+    """Benchmark the default journal and the tuned profile on fresh databases"""
+    get_settings().REPORT_CACHE_BACKEND = "none"  # measure the queries, not the cache
+    print(f"{'profile':<8} {'orders/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'reports/s':>10} {'p95 ms':>9} {'errors':>7}")
+    for name, tuned in (("default", False), ("tuned", True)):
+        with tempfile.TemporaryDirectory() as directory:
+            engine, factory, product_ids = _build_store(
+                os.path.join(directory, "store.db"), tuned, products, history
+            )
+            try:
+                results = _run(factory, product_ids, seconds, checkout_threads, report_threads)
+            finally:
+                engine.dispose()
+        print(_summary(name, results, seconds))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10, help="Duration of each run")
+    parser.add_argument("--checkout-threads", type=int, default=8, help="Concurrent checkouts")
+    parser.add_argument("--report-threads", type=int, default=2, help="Concurrent sales reports")
+    parser.add_argument("--products", type=int, default=500, help="Products in the catalog")
+    parser.add_argument("--history", type=int, default=20000, help="Past orders the reports scan")
+    args = parser.parse_args()
+    benchmark(args.seconds, args.checkout_threads, args.report_threads, args.products, args.history)
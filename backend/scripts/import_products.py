@@ -0,0 +1,39 @@
+"""Import products from a CSV or XLSX file, upserting by SKU"""
+import argparse
+
+from app.core.database import SessionLocal, init_db
+from app.services.import_service import IMPORT_CHUNK_SIZE, ProductImportService
+
+
+def import_products(path: str, user_id: int = None, chunk_size: int = IMPORT_CHUNK_SIZE):
+    """Stream the file into the products table and print the row report"""
+    db = SessionLocal()
+
+    try:
+        init_db()
+        with open(path, "rb") as stream:
+            rows = ProductImportService.iter_rows(stream, path)
+            report = ProductImportService.import_products(db, rows, user_id, chunk_size)
+
+        for error in report["errors"]:
+            print(f"Row {error['row']} ({error['sku']}): {'; '.join(error['errors'])}")
+        print(
+            f"✓ Processed {report['processed']} rows: {report['created']} created, "
+            f"{report['updated']} updated, {report['failed']} failed"
+        )
+        return report
+    except Exception as e:
+        db.rollback()
+        print(f"Error importing products: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", help="CSV or XLSX file with a header row of product fields")
+    parser.add_argument("--user-id", type=int, help="User recorded on the STOCK_IN logs")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Rows per transaction")
+    args = parser.parse_args()
+    import_products(args.path, args.user_id, args.chunk_size)
@@ -0,0 +1,30 @@
+"""Rebuild the sales_daily rollup from the orders table"""
+import argparse
+from datetime import date
+
+from app.core.database import SessionLocal, init_db
+from app.services.rollup_service import SalesRollupService
+
+
+def rebuild_sales_daily(start_date: date = None, end_date: date = None):
+    """Backfill or repair rollup rows for the given range (all history by default)"""
+    db = SessionLocal()
+
+    try:
+        init_db()
+        rows = SalesRollupService.rebuild(db, start_date, end_date)
+        print(f"✓ Rebuilt {rows} sales_daily rows")
+    except Exception as e:
+        db.rollback()
+        print(f"Error rebuilding sales_daily: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--start", type=date.fromisoformat, help="First day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last day to rebuild (YYYY-MM-DD)")
+    args = parser.parse_args()
+    rebuild_sales_daily(args.start, args.end)
@@ -0,0 +1,43 @@
+"""Render a barcode label sheet for selected products"""
+import argparse
+import shutil
+
+from app.core.database import SessionLocal, init_db
+from app.services.label_service import LabelService
+
+
+def render_labels(
+    output_path: str,
+    skus=None,
+    category_id: int = None,
+    barcode_format: str = "code128",
+    copies: int = 1,
+):
+    """Write a PDF or PNG label sheet; the format follows the output extension"""
+    db = SessionLocal()
+
+    try:
+        init_db()
+        items = LabelService.get_label_items(db, skus=skus, category_id=category_id)
+        output = "png" if output_path.lower().endswith(".png") else "pdf"
+        sheet = LabelService.render_sheet(items, output, barcode_format, copies)
+        with sheet, open(output_path, "wb") as target:
+            shutil.copyfileobj(sheet, target)
+        print(f"✓ Rendered {len(items) * copies} labels to {output_path}")
+        return output_path
+    except Exception as e:
+        print(f"Error rendering labels: {getattr(e, 'detail', str(e))}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output", help="Output file, .pdf or .png")
+    parser.add_argument("--sku", action="append", dest="skus", help="SKU to label (repeatable)")
+    parser.add_argument("--category-id", type=int, help="Label every product in this category")
+    parser.add_argument("--barcode-format", default="code128", help="python-barcode symbology")
+    parser.add_argument("--copies", type=int, default=1, help="Labels per product")
+    args = parser.parse_args()
+    render_labels(args.output, args.skus, args.category_id, args.barcode_format, args.copies)
@@ -1,6 +1,7 @@
 """Test configuration"""
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
 import sys
@@ -9,7 +10,12 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.main import app
-from app.core.database import Base, get_db
+from app.api import dependencies
+from app.core.config import get_settings
+from app.core.database import Base, async_database_url, get_db
+from app.core.db_pool import pool_options
+from app.core.metrics import instrument_queries
+from app.core.sqlite import configure_sqlite_engine
 from app.core.security import get_password_hash
 
 # Create in-memory SQLite database for testing
@@ -20,8 +26,25 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
 )
 
+instrument_queries(engine, get_settings())
+
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The async routes get their own engine on the same file, configured the way
+# app.core.database configures the app's
+ASYNC_DATABASE_URL = async_database_url(SQLALCHEMY_DATABASE_URL)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **pool_options(ASYNC_DATABASE_URL, get_settings(), is_async=True)
+)
+instrument_queries(async_engine.sync_engine, get_settings())
+if get_settings().SQLITE_PROFILE_ENABLED:
+    configure_sqlite_engine(async_engine.sync_engine, get_settings())
+
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 
 def override_get_db():
     try:
@@ -31,9 +54,16 @@ def override_get_db():
         db.close()
 
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
 Base.metadata.create_all(bind=engine)
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[dependencies.get_db] = override_get_db
+app.dependency_overrides[dependencies.get_async_db] = override_get_async_db
 
 client = TestClient(app)
 
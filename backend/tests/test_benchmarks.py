@@ -0,0 +1,105 @@
+"""Tests for the benchmark data generator, suite and load harness"""
+import asyncio
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import httpx
+
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+
+from tests.conftest import TestingSessionLocal
+from app.models import InventoryLog, Order, OrderStatus, Payment, Product
+from app.main import app
+from benchmarks.datagen import generate_dataset, reset_schema
+from benchmarks.load import run_load
+from benchmarks.suite import build_engine, compare, run_suite
+
+NOW = datetime(2026, 3, 15, 23, 0)
+
+
+def test_generated_history_is_consistent_and_repeatable(tmp_path):
+    """Stock matches the inventory log and paid totals match orders; same seed, same rows"""
+    counts = []
+    for run in range(2):
+        engine = build_engine(f"sqlite:///{tmp_path / f'gen{run}.db'}")
+        reset_schema(engine)
+        db = sessionmaker(bind=engine)()
+        try:
+            summary = generate_dataset(db, products=60, customers=20, months=1, orders_per_day=20, now=NOW)
+            counts.append({key: summary[key] for key in ("orders", "order_items", "payments", "inventory_logs")})
+
+            last_log = (
+                db.query(InventoryLog.product_id, func.max(InventoryLog.id))
+                .group_by(InventoryLog.product_id)
+                .subquery()
+            )
+            logged = dict(
+                db.query(InventoryLog.product_id, InventoryLog.quantity_after)
+                .join(last_log, InventoryLog.id == last_log.c[1])
+                .all()
+            )
+            assert logged == dict(db.query(Product.id, Product.stock_quantity).all())
+
+            paid = db.query(func.sum(Payment.amount)).scalar()
+            billed = db.query(func.sum(Order.total)).filter(Order.status != OrderStatus.CANCELLED).scalar()
+            assert paid == billed
+            assert summary["sales_daily"] > 0
+        finally:
+            db.close()
+            engine.dispose()
+    assert counts[0] == counts[1]
+    assert counts[0]["orders"] > 300
+
+
+def test_suite_reports_latency_and_compare_flags_regressions(tmp_path):
+    """A short run yields statistics per benchmark; slower runs are flagged"""
+    run = run_suite(
+        f"sqlite:///{tmp_path / 'suite.db'}",
+        {"products": 40, "customers": 10, "months": 1, "orders_per_day": 10, "seed": 7},
+        iterations=5,
+        warmup=1,
+        only=["barcode_lookup", "report.sales", "create_order", "create_payment"],
+    )
+    assert set(run["results"]) == {"barcode_lookup", "report.sales", "create_order", "create_payment"}
+    stats = run["results"]["create_payment"]
+    assert stats["iterations"] == 5 and 0 < stats["min_ms"] <= stats["p50_ms"] <= stats["max_ms"]
+
+    baseline = {"runs": [run]}
+    slower = {"runs": [{**run, "results": {
+        name: {**stats, "p50_ms": stats["p50_ms"] * 1.5} for name, stats in run["results"].items()
+    }}]}
+    rows = compare(baseline, slower, threshold=10)
+    assert len(rows) == 4 and all(row["regression"] for row in rows)
+    assert not any(row["regression"] for row in compare(baseline, baseline))
+
+
+def test_load_harness_runs_terminals_and_reconciles_stock():
+    """Concurrent terminals check out, pay and cancel without stock drift"""
+    db = TestingSessionLocal()
+    try:
+        db.add_all([
+            Product(
+                sku=f"LOAD-{uuid.uuid4().hex[:10]}", barcode=f"LD{uuid.uuid4().hex[:10]}",
+                name=f"Load item {i}", price=Decimal("3.25"), stock_quantity=10000,
+            )
+            for i in range(10)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+    async def load():
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            return await run_load(client, [2], duration=1.0)
+
+    result = asyncio.run(load())
+    stage = result["stages"][0]
+    assert stage["terminals"] == 2
+    assert stage["checkouts"] > 0
+    assert stage["operations"]["create_order"]["errors"] == 0
+    assert stage["operations"]["create_payment"]["errors"] == 0
+    assert stage["operations"]["scan"]["p95_ms"] is not None
+    assert result["stock"]["inconsistent"] == 0 and result["stock"]["negative"] == 0
@@ -0,0 +1,76 @@
+"""Tests for catalog sync"""
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import create_engine, inspect
+
+from tests.conftest import client, TestingSessionLocal
+from app.core.catalog import add_catalog_version_columns
+from app.models import Category, Product
+from app.services import InventoryService
+
+
+def _version():
+    return client.get("/api/v1/catalog/version").json()["version"]
+
+
+def test_snapshot_and_changes():
+    """Terminals sync writes and deletes after a snapshot through deltas"""
+    tag = uuid.uuid4().hex[:8]
+    db = TestingSessionLocal()
+    try:
+        category = Category(name=f"Drinks {tag}")
+        product = Product(sku=f"SYNC-{tag}", name="Cola", price=Decimal("1.50"), category=category)
+        doomed = Product(sku=f"SYNC-{tag}-X", name="Retired", price=Decimal("1.00"))
+        db.add_all([category, product, doomed])
+        db.commit()
+        product_id, doomed_id, category_id = product.id, doomed.id, category.id
+
+        response = client.get("/api/v1/catalog/snapshot")
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        snapshot = response.json()
+        assert snapshot["version"] == int(response.headers["x-catalog-version"])
+        assert product_id in {p["id"] for p in snapshot["products"]}
+        assert category_id in {c["id"] for c in snapshot["categories"]}
+        since = snapshot["version"]
+
+        # Stock movements are not catalog changes
+        InventoryService.apply_stock_changes(db, {product_id: 3})
+        db.commit()
+        assert client.get("/api/v1/catalog/changes", params={"since": since}).json()["products"] == []
+
+        db.get(Product, product_id).price = Decimal("1.75")
+        db.delete(db.get(Product, doomed_id))
+        db.commit()
+    finally:
+        db.close()
+
+    changes = client.get("/api/v1/catalog/changes", params={"since": since}).json()
+    assert changes["version"] > since
+    assert [(p["id"], p["price"]) for p in changes["products"]] == [(product_id, 1.75)]
+    assert changes["deleted"]["products"] == [doomed_id]
+    assert changes["categories"] == []
+
+    assert client.get("/api/v1/catalog/snapshot").json()["version"] == changes["version"]
+    empty = client.get("/api/v1/catalog/changes", params={"since": changes["version"]}).json()
+    assert empty["products"] == [] and empty["deleted"]["products"] == []
+
+
+def test_catalog_version_columns_added_to_existing_tables(tmp_path):
+    """Databases created before catalog versioning gain the column on upgrade"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'upgrade.db'}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE categories (id INTEGER PRIMARY KEY, name VARCHAR(100))")
+        connection.exec_driver_sql("INSERT INTO categories (id, name) VALUES (1, 'Legacy')")
+        connection.exec_driver_sql("CREATE TABLE products (id INTEGER PRIMARY KEY, name VARCHAR(200))")
+
+        add_catalog_version_columns(connection)
+        add_catalog_version_columns(connection)
+
+        inspector = inspect(connection)
+        for table in ("products", "categories"):
+            assert "catalog_version" in {column["name"] for column in inspector.get_columns(table)}
+            assert f"ix_{table}_catalog_version" in {index["name"] for index in inspector.get_indexes(table)}
+        assert connection.exec_driver_sql("SELECT catalog_version FROM categories").scalar() == 0
+    engine.dispose()
@@ -0,0 +1,71 @@
+"""Tests for customers"""
+import uuid
+
+from tests.conftest import client
+
+
+def _create_customers(count):
+    """Create customers through the API and return their IDs"""
+    login = f"staff_{uuid.uuid4().hex[:8]}"
+    client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": login,
+            "email": f"{login}@example.com",
+            "password": "testpassword123",
+            "full_name": "Customer Tester",
+        },
+    )
+    token = client.post(
+        "/api/v1/auth/login",
+        json={"username": login, "password": "testpassword123"},
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    ids = []
+    for i in range(count):
+        response = client.post(
+            "/api/v1/customers/",
+            headers=headers,
+            json={"first_name": "Guest", "last_name": f"{i}", "email": f"{uuid.uuid4().hex[:8]}@example.com"},
+        )
+        assert response.status_code == 200
+        ids.append(response.json()["id"])
+    return ids
+
+
+def test_list_customers_keyset():
+    """Test cursor pagination walks every customer exactly once"""
+    created = set(_create_customers(7))
+
+    seen = []
+    response = client.get("/api/v1/customers/", params={"keyset": True, "limit": 3, "include_total": True})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] >= 7
+
+    while True:
+        seen.extend(c["id"] for c in body["data"])
+        if not body["next_cursor"]:
+            break
+        body = client.get(
+            "/api/v1/customers/", params={"cursor": body["next_cursor"], "limit": 3}
+        ).json()
+        assert body["total"] is None
+
+    assert len(seen) == len(set(seen))
+    assert created <= set(seen)
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_list_customers_invalid_cursor():
+    """Test a malformed cursor is rejected"""
+    response = client.get("/api/v1/customers/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_list_customers_limit_is_bounded():
+    """Test page sizes outside 1..1000 are rejected before any query runs"""
+    for limit in (0, -1, 1001):
+        response = client.get("/api/v1/customers/", params={"keyset": True, "limit": limit})
+        assert response.status_code == 422
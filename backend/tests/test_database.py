@@ -0,0 +1,114 @@
+"""Tests for database engine configuration"""
+import threading
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.orm import sessionmaker
+
+from tests.conftest import client
+from tests.test_orders import _auth_headers
+from app.core.db_pool import MeteredQueuePool, instrument_pool, pool_options, pool_stats
+from app.core.sqlite import WalCheckpointer, begin_immediate, configure_sqlite_engine
+
+
+def _settings(**overrides):
+    fields = ("DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_POOL_TIMEOUT", "DB_POOL_RECYCLE", "DB_POOL_PRE_PING")
+    return SimpleNamespace(**{field: overrides.get(field) for field in fields})
+
+
+def test_pool_profiles_follow_backend_and_settings():
+    """Each backend gets its own pool profile; DB_POOL_* settings override it"""
+    sqlite = pool_options("sqlite:///./pos.db", _settings())
+    assert (sqlite["pool_pre_ping"], sqlite["pool_recycle"]) == (False, -1)
+
+    postgres = pool_options("postgresql://u:p@db/pos", _settings(DB_POOL_SIZE=40))
+    assert (postgres["pool_size"], postgres["pool_pre_ping"], postgres["pool_recycle"]) == (40, True, 1800)
+    assert postgres["poolclass"] is MeteredQueuePool
+
+    assert pool_options("sqlite://", _settings(DB_POOL_SIZE=40)) == {}
+
+
+def test_pool_metrics_count_waits_and_timeouts(tmp_path):
+    """Checkouts that wait or time out show up in the pool stats"""
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(
+        url, **pool_options(url, _settings(DB_POOL_SIZE=1, DB_MAX_OVERFLOW=0, DB_POOL_TIMEOUT=0.2))
+    )
+    instrument_pool(engine)
+    try:
+        held = engine.connect()
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+        # A waiter gets the connection once the holder returns it
+        waiter = threading.Thread(target=lambda: engine.connect().close())
+        waiter.start()
+        threading.Timer(0.05, held.close).start()
+        waiter.join()
+
+        stats = pool_stats(engine)
+        assert (stats["size"], stats["checked_out"], stats["timeouts"], stats["connects"]) == (1, 0, 1, 1)
+        assert stats["checkouts"] == 2
+        assert stats["wait_max_ms"] >= 40
+    finally:
+        engine.dispose()
+
+
+def test_pool_health_endpoint():
+    """The pool surface reports the sync engine's pool"""
+    response = client.get("/health/pool", headers=_auth_headers())
+    assert response.status_code == 200
+    assert response.json()["sync"]["pool"] == "MeteredQueuePool"
+
+
+def _sqlite_profile(**overrides):
+    profile = {
+        "SQLITE_WAL": True,
+        "SQLITE_SYNCHRONOUS": "NORMAL",
+        "SQLITE_CACHE_SIZE_KB": 8192,
+        "SQLITE_MMAP_SIZE": 0,
+        "SQLITE_BUSY_TIMEOUT_MS": 50,
+        "SQLITE_IMMEDIATE_WRITES": True,
+    }
+    profile.update(overrides)
+    return SimpleNamespace(**profile)
+
+
+def test_sqlite_profile_pragmas_and_immediate_writes(tmp_path):
+    """Profiled connections run in WAL and writers take the lock at BEGIN"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'store.db'}")
+    configure_sqlite_engine(engine, _sqlite_profile())
+    Session = sessionmaker(bind=engine)
+    try:
+        with engine.begin() as connection:
+            connection.exec_driver_sql("CREATE TABLE stock (id INTEGER PRIMARY KEY, qty INTEGER)")
+            connection.exec_driver_sql("INSERT INTO stock VALUES (1, 5)")
+            assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+            assert connection.exec_driver_sql("PRAGMA busy_timeout").scalar() == 50
+
+        reader, writer, other = Session(), Session(), Session()
+        try:
+            # A read-then-write transaction opened with begin_immediate holds the lock
+            begin_immediate(writer)
+            writer.execute(text("SELECT qty FROM stock"))
+            with pytest.raises(exc.OperationalError, match="locked"):
+                other.execute(text("UPDATE stock SET qty = qty - 1"))
+            other.rollback()
+
+            # Readers are not blocked by the writer under WAL
+            assert reader.execute(text("SELECT qty FROM stock")).scalar() == 5
+            writer.execute(text("UPDATE stock SET qty = 4"))
+            writer.commit()
+            assert reader.execute(text("SELECT qty FROM stock")).scalar() == 5  # snapshot
+            reader.commit()
+            assert reader.execute(text("SELECT qty FROM stock")).scalar() == 4
+        finally:
+            for session in (reader, writer, other):
+                session.close()
+
+        result = WalCheckpointer(engine, interval=60).checkpoint()
+        assert result["busy"] == 0 and result["log_pages"] == result["checkpointed_pages"]
+    finally:
+        engine.dispose()
@@ -0,0 +1,63 @@
+"""Tests for inventory logs"""
+import csv
+import io
+import json
+
+from tests.conftest import client
+from tests.test_orders import _create_products
+
+
+def _stock_in(product_id, quantity):
+    response = client.post(
+        f"/api/v1/inventory/logs?product_id={product_id}",
+        json={"action": "stock_in", "quantity_change": quantity},
+    )
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def test_list_logs_paginates_and_filters():
+    """Test cursor pagination and the product/action filters"""
+    product_id, other_id = _create_products(2, stock=0)
+    created = [_stock_in(product_id, q) for q in range(1, 6)]
+    _stock_in(other_id, 1)
+
+    seen = []
+    params = {"product_id": product_id, "action": "stock_in", "limit": 2}
+    while True:
+        body = client.get("/api/v1/inventory/logs", params=params).json()
+        assert len(body["data"]) <= 2
+        seen.extend(log["id"] for log in body["data"])
+        if not body["next_cursor"]:
+            break
+        params["cursor"] = body["next_cursor"]
+
+    assert seen == sorted(created, reverse=True)
+
+    history = client.get(f"/api/v1/inventory/product/{product_id}/history", params={"limit": 3}).json()
+    assert [log["id"] for log in history["data"]] == sorted(created, reverse=True)[:3]
+    assert history["next_cursor"]
+
+    response = client.get("/api/v1/inventory/logs", params={"action": "teleport"})
+    assert response.status_code == 400
+
+
+def test_export_logs_streams_ndjson_and_csv():
+    """Test the streaming export in both formats"""
+    (product_id,) = _create_products(1, stock=0)
+    created = [_stock_in(product_id, q) for q in (3, 4)]
+
+    response = client.get("/api/v1/inventory/logs/export", params={"product_id": product_id})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == sorted(created, reverse=True)
+    assert rows[0]["action"] == "stock_in"
+    assert rows[0]["quantity_after"] == 7
+
+    response = client.get(
+        "/api/v1/inventory/logs/export", params={"product_id": product_id, "format": "csv"}
+    )
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == sorted(created, reverse=True)
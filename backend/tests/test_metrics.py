@@ -0,0 +1,153 @@
+"""Tests for request metrics and profiling"""
+import os
+import re
+import time
+import uuid
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, text
+
+from tests.conftest import client
+from tests.test_orders import _auth_headers
+from app.core import profiler
+from app.core.metrics import Histogram, end_request_stats, instrument_queries, start_request_stats
+
+
+def test_histogram_buckets_are_cumulative():
+    """Observations land in their bucket and are reported cumulatively"""
+    histogram = Histogram("latency_seconds", "Latency", ("route",), (0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(("/a",), value)
+
+    samples = list(histogram.samples())
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in samples
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 3' in samples
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in samples
+    assert 'latency_seconds_count{route="/a"} 4' in samples
+
+
+def test_metrics_endpoint_reports_route_templates_and_db_time():
+    """Requests are labelled by route template, not raw path, and carry DB time"""
+    headers = _auth_headers()
+    client.get("/api/v1/orders/999999", headers=headers)
+    client.get("/no/such/path")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+
+    assert 'http_requests_total{route="/api/v1/orders/{order_id}",method="GET",status="404"}' in body
+    assert 'http_requests_total{route="unmatched",method="GET",status="404"}' in body
+    assert "/orders/999999" not in body
+    assert 'http_request_duration_seconds_bucket{route="/api/v1/auth/login",method="POST",status="200",le="+Inf"}' in body
+    assert 'http_request_db_statements_total{route="/api/v1/orders/{order_id}",method="GET"}' in body
+    assert 'http_requests_in_flight{method="GET"} 1' in body  # the scrape itself
+    assert 'db_pool_checkouts{engine="sync"}' in body
+
+
+def test_server_timing_reports_sql_per_request():
+    """Responses carry the request's statement count and DB time"""
+    headers = _auth_headers()
+    response = client.get("/api/v1/orders/", headers=headers)
+    assert response.status_code == 200
+
+    timing = re.match(r'db;dur=([\d.]+);desc="(\d+) queries", total;dur=([\d.]+)', response.headers["server-timing"])
+    assert timing is not None
+    assert int(timing.group(2)) >= 2  # the user lookup and the order list
+    assert float(timing.group(1)) <= float(timing.group(3))
+
+
+def test_slow_queries_are_logged_with_params_and_route(capsys):
+    """Statements over SLOW_QUERY_MS are printed with their parameters and route"""
+    engine = create_engine("sqlite://")
+    instrument_queries(engine, SimpleNamespace(SLOW_QUERY_MS=0.000001))
+    scope = {"method": "GET", "route": SimpleNamespace(path="/api/v1/reports/sales")}
+    stats, token = start_request_stats(scope)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT :value"), {"value": 42})
+            connection.execute(
+                text("SELECT :hashed_password, :email"), {"hashed_password": "h4sh", "email": "a@example.com"}
+            )
+    finally:
+        end_request_stats(token)
+
+    output = capsys.readouterr().out
+    assert "Slow query" in output
+    assert "from GET /api/v1/reports/sales: SELECT ?" in output
+    assert "42" in output
+    assert "h4sh" not in output and "a@example.com" not in output
+    assert "params=('***', '***')" in output
+    assert stats.db_statements == 2
+
+
+def _admin_headers():
+    """Register a throwaway admin and return bearer headers"""
+    username = f"admin_{uuid.uuid4().hex[:8]}"
+    client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": "testpassword123",
+            "full_name": "Profile Admin",
+            "role": "admin",
+        },
+    )
+    response = client.post("/api/v1/auth/login", json={"username": username, "password": "testpassword123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_admins_can_profile_requests_and_download_them(tmp_path, monkeypatch):
+    """The profiling header from an admin saves a profile; the ring keeps the newest"""
+    monkeypatch.setattr(profiler, "_store", profiler.ProfileStore(str(tmp_path), max_profiles=2))
+    admin = _admin_headers()
+    cashier = _auth_headers()
+
+    response = client.get("/api/v1/orders/", headers={**cashier, "X-Profile": "1"})
+    assert "x-profile-id" not in response.headers  # only admins can switch profiling on
+    assert client.get("/api/v1/admin/profiles", headers=cashier).status_code == 403
+
+    ids = [
+        client.get("/api/v1/orders/", headers={**admin, "X-Profile": "1"}).headers["x-profile-id"]
+        for _ in range(3)
+    ]
+    listed = client.get("/api/v1/admin/profiles", headers=admin).json()
+    assert [profile["id"] for profile in listed] == ids[:0:-1]
+    assert listed[0]["route"] == "/api/v1/orders/"
+    assert len(os.listdir(tmp_path)) == 4  # two profiles, two formats each
+
+    speedscope = client.get(f"/api/v1/admin/profiles/{ids[-1]}", headers=admin)
+    assert speedscope.json()["$schema"] == "https://www.speedscope.app/file-format-schema.json"
+    collapsed = client.get(f"/api/v1/admin/profiles/{ids[-1]}?format=collapsed", headers=admin)
+    assert collapsed.status_code == 200
+    assert client.get(f"/api/v1/admin/profiles/{ids[0]}", headers=admin).status_code == 404
+
+
+def test_routes_can_be_sampled_for_profiling(tmp_path, monkeypatch):
+    """A route sampled at 100 percent is profiled without the header"""
+    monkeypatch.setattr(profiler, "_store", profiler.ProfileStore(str(tmp_path), max_profiles=5))
+    monkeypatch.setattr(profiler, "_sampling", profiler.ProfileSampling())
+    admin = _admin_headers()
+
+    rates = client.put(
+        "/api/v1/admin/profiles/sampling", json={"route": "/api/v1/catalog/version", "percent": 100}, headers=admin
+    )
+    assert rates.json() == {"/api/v1/catalog/version": 100}
+    assert "x-profile-id" in client.get("/api/v1/catalog/version").headers
+    assert "x-profile-id" not in client.get("/api/v1/catalog/changes?since=0").headers
+
+
+def test_sampling_profiler_renders_collapsed_stacks():
+    """Busy threads are sampled into thread;frame;frame count lines"""
+    sampler = profiler.SamplingProfiler(interval=0.001)
+    sampler.start()
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+    sampler.stop()
+
+    lines = sampler.collapsed().splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("test_sampling_profiler_renders_collapsed_stacks" in line for line in lines)
@@ -0,0 +1,426 @@
+"""Tests for orders"""
+import asyncio
+import io
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from decimal import Decimal
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+from tests.conftest import async_engine, client, engine, TestingSessionLocal
+from app.core.database import async_database_url
+from app.main import app
+from app.models import Product, Order, InventoryLog
+from app.schemas import OrderCreate, OrderItemCreate
+from app.services import InvoiceService, OrderService, InventoryService
+from app.services.inventory_service import InsufficientStockError
+
+
+def _auth_headers():
+    """Register a throwaway user and return bearer headers"""
+    username = f"cashier_{uuid.uuid4().hex[:8]}"
+    client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": "testpassword123",
+            "full_name": "Order Tester",
+        },
+    )
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"username": username, "password": "testpassword123"},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _create_products(count, stock=10, price="2.50"):
+    """Insert products directly and return their IDs"""
+    db = TestingSessionLocal()
+    try:
+        products = [
+            Product(
+                sku=f"SKU-{uuid.uuid4().hex[:10]}",
+                name=f"Item {i}",
+                price=Decimal(price),
+                stock_quantity=stock,
+            )
+            for i in range(count)
+        ]
+        db.add_all(products)
+        db.commit()
+        return [p.id for p in products]
+    finally:
+        db.close()
+
+
+def _stock(product_id):
+    db = TestingSessionLocal()
+    try:
+        return db.get(Product, product_id).stock_quantity
+    finally:
+        db.close()
+
+
+def test_create_order():
+    """Test creating an order reduces stock"""
+    headers = _auth_headers()
+    product_ids = _create_products(2, stock=5)
+
+    response = client.post(
+        "/api/v1/orders/",
+        headers=headers,
+        json={
+            "order_items": [
+                {"product_id": product_ids[0], "quantity": 2},
+                {"product_id": product_ids[1], "quantity": 1},
+            ],
+            "tax": "1.00",
+        },
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert Decimal(body["subtotal"]) == Decimal("7.50")
+    assert Decimal(body["total"]) == Decimal("8.50")
+    assert len(body["order_items"]) == 2
+    assert _stock(product_ids[0]) == 3
+    assert _stock(product_ids[1]) == 4
+
+
+def test_create_order_insufficient_stock_writes_nothing():
+    """Test stock is validated before the order row is written"""
+    headers = _auth_headers()
+    product_ids = _create_products(2, stock=3)
+
+    db = TestingSessionLocal()
+    orders_before = db.query(Order).count()
+    db.close()
+
+    # Duplicate lines are validated against their combined quantity
+    response = client.post(
+        "/api/v1/orders/",
+        headers=headers,
+        json={
+            "order_items": [
+                {"product_id": product_ids[0], "quantity": 1},
+                {"product_id": product_ids[1], "quantity": 2},
+                {"product_id": product_ids[1], "quantity": 2},
+            ],
+        },
+    )
+    assert response.status_code == 400
+
+    db = TestingSessionLocal()
+    assert db.query(Order).count() == orders_before
+    db.close()
+    assert _stock(product_ids[0]) == 3
+    assert _stock(product_ids[1]) == 3
+
+
+def test_create_order_unknown_product():
+    """Test ordering a missing product returns 404"""
+    headers = _auth_headers()
+    response = client.post(
+        "/api/v1/orders/",
+        headers=headers,
+        json={"order_items": [{"product_id": 999999, "quantity": 1}]},
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("item_count", [1, 40])
+def test_create_order_resolves_products_in_one_query(item_count):
+    """Test product lookups do not grow with the number of line items"""
+    product_ids = _create_products(item_count)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    db = TestingSessionLocal()
+    try:
+        OrderService.create_order(
+            db,
+            OrderCreate(
+                order_items=[OrderItemCreate(product_id=pid, quantity=1) for pid in product_ids]
+            ),
+            user_id=1,
+        )
+    finally:
+        db.close()
+        event.remove(engine, "before_cursor_execute", record)
+
+    product_selects = [
+        s for s in statements if s.lstrip().upper().startswith("SELECT") and "FROM products" in s
+    ]
+    assert len(product_selects) == 1
+
+
+def test_apply_stock_changes_is_guarded():
+    """Test a batch decrement is all-or-nothing"""
+    product_ids = _create_products(2, stock=3)
+    db = TestingSessionLocal()
+    try:
+        with pytest.raises(InsufficientStockError) as exc_info:
+            InventoryService.apply_stock_changes(db, {product_ids[0]: -1, product_ids[1]: -4})
+        assert exc_info.value.product_ids == [product_ids[1]]
+        db.rollback()
+
+        new_quantities = InventoryService.apply_stock_changes(
+            db, {product_ids[0]: -3, product_ids[1]: 2}
+        )
+        db.commit()
+        assert new_quantities == {product_ids[0]: 0, product_ids[1]: 5}
+    finally:
+        db.close()
+
+
+def test_concurrent_checkout_never_oversells():
+    """Test many parallel checkouts of the same item sell exactly the stock"""
+    stock = 20
+    attempts = 60
+    (product_id,) = _create_products(1, stock=stock)
+
+    def checkout(_):
+        db = TestingSessionLocal()
+        try:
+            OrderService.create_order(
+                db,
+                OrderCreate(order_items=[OrderItemCreate(product_id=product_id, quantity=1)]),
+                user_id=1,
+            )
+            return "sold"
+        except Exception as e:  # HTTPException from the service layer
+            return getattr(e, "status_code", repr(e))
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(checkout, range(attempts)))
+
+    sold = results.count("sold")
+    assert sold == stock
+    assert all(r == 400 for r in results if r != "sold")
+    assert _stock(product_id) == 0
+
+    db = TestingSessionLocal()
+    try:
+        logs = db.query(InventoryLog).filter(InventoryLog.product_id == product_id).all()
+        assert sum(log.quantity_change for log in logs) == -stock
+    finally:
+        db.close()
+
+
+def test_concurrent_stock_out_never_oversells():
+    """Test the guarded decrement holds without the checkout row lock"""
+    stock = 25
+    (product_id,) = _create_products(1, stock=stock)
+
+    def stock_out(_):
+        db = TestingSessionLocal()
+        try:
+            InventoryService.apply_stock_changes(db, {product_id: -1})
+            db.commit()
+            return "ok"
+        except InsufficientStockError:
+            db.rollback()
+            return "rejected"
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(stock_out, range(80)))
+
+    assert results.count("ok") == stock
+    assert results.count("rejected") == 80 - stock
+    assert _stock(product_id) == 0
+
+
+def test_create_orders_batch():
+    """Test batch ingestion reports per-order results and tracks stock across orders"""
+    headers = _auth_headers()
+    product_ids = _create_products(2, stock=4)
+
+    response = client.post(
+        "/api/v1/orders/batch",
+        headers=headers,
+        json={
+            "orders": [
+                {"order_items": [{"product_id": product_ids[0], "quantity": 3}]},
+                # Only one unit left after the first order
+                {"order_items": [{"product_id": product_ids[0], "quantity": 2}]},
+                {"order_items": [{"product_id": 999999, "quantity": 1}]},
+                {
+                    "order_items": [
+                        {"product_id": product_ids[0], "quantity": 1},
+                        {"product_id": product_ids[1], "quantity": 4},
+                    ],
+                    "tax": "0.50",
+                },
+            ]
+        },
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 2
+    assert body["failed"] == 2
+
+    results = body["results"]
+    assert [r["success"] for r in results] == [True, False, False, True]
+    assert results[1]["status_code"] == 400
+    assert results[2]["status_code"] == 404
+    assert Decimal(results[3]["total"]) == Decimal("13.00")
+
+    assert _stock(product_ids[0]) == 0
+    assert _stock(product_ids[1]) == 0
+
+    db = TestingSessionLocal()
+    try:
+        logs = (
+            db.query(InventoryLog)
+            .filter(InventoryLog.product_id == product_ids[0])
+            .order_by(InventoryLog.id)
+            .all()
+        )
+        assert [(log.quantity_before, log.quantity_after) for log in logs] == [(4, 1), (1, 0)]
+        order = db.query(Order).filter(Order.id == results[3]["order_id"]).one()
+        assert len(order.order_items) == 2
+    finally:
+        db.close()
+
+
+def test_list_orders_keyset():
+    """Test cursor pagination over orders matches offset pagination"""
+    headers = _auth_headers()
+    (product_id,) = _create_products(1, stock=10)
+    for _ in range(5):
+        client.post(
+            "/api/v1/orders/",
+            headers=headers,
+            json={"order_items": [{"product_id": product_id, "quantity": 1}]},
+        )
+
+    offset_ids = [o["id"] for o in client.get("/api/v1/orders/", params={"limit": 1000}).json()["data"]]
+
+    keyset_ids = []
+    params = {"keyset": True, "limit": 2}
+    while True:
+        body = client.get("/api/v1/orders/", params=params).json()
+        keyset_ids.extend(o["id"] for o in body["data"])
+        if not body["next_cursor"]:
+            break
+        params = {"cursor": body["next_cursor"], "limit": 2}
+
+    assert keyset_ids == sorted(offset_ids, reverse=True)
+
+
+def _count_queries(request):
+    """Run a request against the async routes and return how many SQL statements it issued"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = request()
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    return len(statements)
+
+
+def test_order_listing_query_count_is_fixed():
+    """Test serializing orders does not lazy-load per order"""
+    headers = _auth_headers()
+    product_ids = _create_products(2, stock=50)
+    for _ in range(8):
+        client.post(
+            "/api/v1/orders/",
+            headers=headers,
+            json={
+                "order_items": [
+                    {"product_id": product_ids[0], "quantity": 1},
+                    {"product_id": product_ids[1], "quantity": 1},
+                ]
+            },
+        )
+
+    small = _count_queries(lambda: client.get("/api/v1/orders/", params={"limit": 2}))
+    large = _count_queries(lambda: client.get("/api/v1/orders/", params={"limit": 8}))
+    assert 0 < small == large <= 3
+
+    keyset = _count_queries(lambda: client.get("/api/v1/orders/", params={"keyset": True, "limit": 8}))
+    assert 0 < keyset <= 2
+
+
+def test_invoice_pdf_and_daily_zip_export():
+    """Invoices render as PDF alone or streamed into a day's ZIP export"""
+    headers = _auth_headers()
+    product_ids = _create_products(1, stock=10)
+    order_numbers = []
+    for _ in range(3):
+        response = client.post(
+            "/api/v1/orders/",
+            headers=headers,
+            json={"order_items": [{"product_id": product_ids[0], "quantity": 1}]},
+        )
+        order_numbers.append(response.json()["order_number"])
+    order_id = response.json()["id"]
+
+    invoice = client.get(f"/api/v1/orders/{order_id}/invoice")
+    assert invoice.status_code == 200
+    assert invoice.headers["content-type"] == "application/pdf"
+    assert invoice.content.startswith(b"%PDF")
+    assert client.get("/api/v1/orders/999999999/invoice").status_code == 404
+
+    export = client.get("/api/v1/orders/invoices/export", headers=headers)
+    assert export.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(export.content))
+    names = archive.namelist()
+    assert {f"{number}.pdf" for number in order_numbers} <= set(names)
+    assert all(archive.read(name).startswith(b"%PDF") for name in names)
+
+    # Small batches pipeline rendering with loading and give the same archive
+    db = TestingSessionLocal()
+    try:
+        start, end = InvoiceService.day_range(datetime.utcnow().date())
+        chunks = list(InvoiceService.iter_invoice_zip(db, start, end, batch_size=2))
+    finally:
+        db.close()
+    assert len(chunks) > 2
+    assert zipfile.ZipFile(io.BytesIO(b"".join(chunks))).namelist() == names
+
+
+def test_async_routes_handle_concurrent_checkouts():
+    """Concurrent checkouts through the async routes still never oversell"""
+    headers = _auth_headers()
+    (product_id,) = _create_products(1, stock=5)
+
+    async def checkout_all():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as async_client:
+            return await asyncio.gather(*[
+                async_client.post(
+                    "/api/v1/orders/",
+                    headers=headers,
+                    json={"order_items": [{"product_id": product_id, "quantity": 1}]},
+                )
+                for _ in range(12)
+            ])
+
+    responses = asyncio.run(checkout_all())
+    assert sorted(r.status_code for r in responses) == [200] * 5 + [400] * 7
+    assert _stock(product_id) == 0
+    assert client.get(f"/api/v1/products/{product_id}").json()["stock_quantity"] == 0
+
+
+def test_async_database_url():
+    """The async engine swaps in the asyncio driver for the configured backend"""
+    assert async_database_url("sqlite:///./pos.db") == "sqlite+aiosqlite:///./pos.db"
+    assert async_database_url("postgresql+psycopg2://u:p@db/pos") == "postgresql+asyncpg://u:p@db/pos"
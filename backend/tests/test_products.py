@@ -0,0 +1,308 @@
+"""Tests for products"""
+import os
+import uuid
+from decimal import Decimal
+
+from tests.conftest import client, TestingSessionLocal
+from tests.test_orders import _auth_headers
+from app.core.config import get_settings
+from app.core.catalog import CatalogCache, get_catalog_cache, get_catalog_version
+from app.models import Category, InventoryLog, Product
+from app.schemas import ProductUpdate
+from app.services import InventoryService, LabelService, ProductService
+from app.utils.barcode_generator import barcode_cache_path
+
+
+def _add_product(name, sku=None, barcode=None, is_active=True):
+    db = TestingSessionLocal()
+    try:
+        product = Product(
+            sku=sku or f"SKU-{uuid.uuid4().hex[:10]}",
+            name=name,
+            barcode=barcode,
+            price=Decimal("1.00"),
+            is_active=is_active,
+        )
+        db.add(product)
+        db.commit()
+        return product.id
+    finally:
+        db.close()
+
+
+def test_search_products_prefix_and_ranking():
+    """Search matches term prefixes and ranks SKU hits above name hits"""
+    tag = uuid.uuid4().hex[:8]
+    by_name = _add_product(f"Zqx{tag} Espresso Beans")
+    by_sku = _add_product("Grinder", sku=f"ZQX{tag}-01")
+    _add_product(f"Zqx{tag} Espresso Retired", is_active=False)
+
+    response = client.get("/api/v1/products/search", params={"q": f"zqx{tag[:4]}"})
+    assert response.status_code == 200
+    assert [p["id"] for p in response.json()] == [by_sku, by_name]
+
+    response = client.get("/api/v1/products/search", params={"q": f"zqx{tag} espr"})
+    assert [p["id"] for p in response.json()] == [by_name]
+
+    response = client.get("/api/v1/products/search", params={"q": f"zqx{tag}", "limit": 1})
+    assert len(response.json()) == 1
+
+
+def test_search_ranks_before_capping_candidates(monkeypatch):
+    """An exact SKU hit added after many name hits still comes first"""
+    monkeypatch.setattr("app.services.product_service.SEARCH_CANDIDATE_LIMIT", 3)
+    tag = uuid.uuid4().hex[:8]
+    for i in range(5):
+        _add_product(f"Vrb{tag} Crate {i}")
+    by_sku = _add_product("Pallet", sku=f"VRB{tag}")
+
+    db = TestingSessionLocal()
+    try:
+        assert [p.id for p in ProductService.search_products(db, f"vrb{tag}", limit=1)] == [by_sku]
+    finally:
+        db.close()
+
+
+def test_search_index_follows_updates_and_deletes():
+    """Renamed and deleted products leave the search index"""
+    tag = uuid.uuid4().hex[:8]
+    product_id = _add_product(f"Kettle{tag}")
+
+    db = TestingSessionLocal()
+    try:
+        assert [p.id for p in ProductService.search_products(db, f"kettle{tag}")] == [product_id]
+
+        product = db.get(Product, product_id)
+        product.name = f"Teapot{tag}"
+        db.commit()
+        assert ProductService.search_products(db, f"kettle{tag}") == []
+        assert [p.id for p in ProductService.search_products(db, f"teapot{tag}")] == [product_id]
+
+        db.delete(product)
+        db.commit()
+        assert ProductService.search_products(db, f"teapot{tag}") == []
+        assert ProductService.search_products(db, "--") == []
+    finally:
+        db.close()
+
+
+def test_barcode_lookup_is_cached_and_invalidated():
+    """Scans are served from the catalog cache until the product changes"""
+    tag = uuid.uuid4().hex[:8]
+    barcode = f"BC{tag}"
+    product_id = _add_product(f"Scanner{tag}", barcode=barcode)
+    cache = get_catalog_cache()
+
+    first = client.get(f"/api/v1/products/barcode/{barcode}")
+    assert first.status_code == 200
+    assert first.json()["id"] == product_id
+
+    hits = cache.hits
+    second = client.get(f"/api/v1/products/barcode/{barcode}")
+    assert second.content == first.content
+    assert cache.hits == hits + 1
+    assert client.get(f"/api/v1/products/{product_id}").json()["barcode"] == barcode
+
+    db = TestingSessionLocal()
+    try:
+        ProductService.update_product(db, product_id, ProductUpdate(price=Decimal("3.75")))
+    finally:
+        db.close()
+    assert client.get(f"/api/v1/products/barcode/{barcode}").json()["price"] == 3.75
+    assert client.get(f"/api/v1/products/barcode/missing-{tag}").status_code == 404
+
+
+def test_catalog_cache_follows_other_workers():
+    """A cache notices writes from other processes through the catalog version"""
+    tag = uuid.uuid4().hex[:8]
+    product_id = _add_product(f"Mug{tag}")
+    worker_cache = CatalogCache(check_interval=0)
+
+    db = TestingSessionLocal()
+    try:
+        def load():
+            product = ProductService.get_product_by_id(db, product_id)
+            return product, product.name.encode()
+
+        version = get_catalog_version(db)
+        assert worker_cache.get_or_load(db, "id", product_id, load)[0] == f"Mug{tag}".encode()
+
+        # Stock movements leave the catalog version alone
+        InventoryService.apply_stock_changes(db, {product_id: 5})
+        db.commit()
+        assert get_catalog_version(db) == version
+
+        other = TestingSessionLocal()
+        try:
+            other.get(Product, product_id).name = f"Cup{tag}"
+            other.commit()
+        finally:
+            other.close()
+
+        assert get_catalog_version(db) == version + 1
+        assert worker_cache.get_or_load(db, "id", product_id, load)[0] == f"Cup{tag}".encode()
+    finally:
+        db.close()
+
+
+def test_conditional_get_on_catalog_reads():
+    """Unchanged catalog reads answer 304; stock and price changes move the ETag"""
+    product_id = _add_product(f"Etag{uuid.uuid4().hex[:8]}")
+
+    listing = client.get("/api/v1/products", params={"limit": 5})
+    etag = listing.headers["etag"]
+    cached = client.get("/api/v1/products", params={"limit": 5}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    other_page = client.get("/api/v1/products", params={"limit": 6}, headers={"If-None-Match": etag})
+    assert other_page.status_code == 200
+
+    single = client.get(f"/api/v1/products/{product_id}")
+    product_etag = single.headers["etag"]
+    assert client.get(
+        f"/api/v1/products/{product_id}", headers={"If-None-Match": f"W/{product_etag}"}
+    ).status_code == 304
+
+    db = TestingSessionLocal()
+    try:
+        InventoryService.apply_stock_changes(db, {product_id: 2})
+        db.commit()
+    finally:
+        db.close()
+    assert client.get(
+        "/api/v1/products", params={"limit": 5}, headers={"If-None-Match": etag}
+    ).status_code == 200
+    refreshed = client.get(f"/api/v1/products/{product_id}", headers={"If-None-Match": product_etag})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["stock_quantity"] == 2
+
+    categories = client.get("/api/v1/categories")
+    assert client.get(
+        "/api/v1/categories", headers={"If-None-Match": categories.headers["etag"]}
+    ).status_code == 304
+
+
+def test_import_products_csv():
+    """CSV import upserts by SKU, logs initial stock and reports bad rows"""
+    tag = uuid.uuid4().hex[:8]
+    existing_id = _add_product("Old name", sku=f"IMP-{tag}-1")
+    csv_body = "\n".join([
+        "sku,name,price,stock_quantity,barcode",
+        f"IMP-{tag}-1,Renamed,4.00,9,",
+        f"IMP-{tag}-2,Fresh,2.50,7,BC-IMP-{tag}",
+        f"IMP-{tag}-3,Free,0,1,",
+        f"IMP-{tag}-2,Duplicate,2.50,1,",
+    ])
+    headers = _auth_headers()
+
+    response = client.post(
+        "/api/v1/products/import",
+        headers=headers,
+        files={"file": ("catalog.csv", csv_body.encode(), "text/csv")},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["processed"], report["created"], report["updated"], report["failed"]) == (4, 1, 1, 2)
+    assert [(error["row"], error["sku"]) for error in report["errors"]] == [
+        (4, f"IMP-{tag}-3"),
+        (5, f"IMP-{tag}-2"),
+    ]
+
+    db = TestingSessionLocal()
+    try:
+        renamed = db.get(Product, existing_id)
+        assert (renamed.name, renamed.price, renamed.stock_quantity) == ("Renamed", Decimal("4.00"), 0)
+        fresh = db.query(Product).filter(Product.sku == f"IMP-{tag}-2").one()
+        assert fresh.stock_quantity == 7
+        logs = db.query(InventoryLog).filter(InventoryLog.product_id == fresh.id).all()
+        assert [(log.quantity_before, log.quantity_after) for log in logs] == [(0, 7)]
+    finally:
+        db.close()
+
+    unsupported = client.post(
+        "/api/v1/products/import",
+        headers=headers,
+        files={"file": ("catalog.txt", b"sku,name", "text/plain")},
+    )
+    assert unsupported.status_code == 400
+
+
+def test_bulk_reprice_category():
+    """A bulk update reprices a category in one statement and refreshes caches"""
+    tag = uuid.uuid4().hex[:8]
+    db = TestingSessionLocal()
+    try:
+        category = Category(name=f"Bulk {tag}")
+        db.add(category)
+        db.commit()
+        category_id = category.id
+    finally:
+        db.close()
+
+    prices = ("2.00", "1.00", "10.00")
+    product_ids = []
+    for price in prices:
+        product_id = _add_product(f"Bulk{tag}")
+        db = TestingSessionLocal()
+        try:
+            product = db.get(Product, product_id)
+            product.price, product.category_id = Decimal(price), category_id
+            db.commit()
+        finally:
+            db.close()
+        product_ids.append(product_id)
+    outsider = _add_product(f"Outside{tag}")
+    assert client.get(f"/api/v1/products/{product_ids[0]}").json()["price"] == 2.0
+    headers = _auth_headers()
+
+    response = client.post(
+        "/api/v1/products/bulk-update",
+        headers=headers,
+        json={"filter": {"category_id": category_id}, "changes": {"price_percent": "5", "round_to": "0.25"}},
+    )
+    assert response.status_code == 200
+    assert response.json()["updated"] == 3
+
+    assert [client.get(f"/api/v1/products/{pid}").json()["price"] for pid in product_ids] == [2.0, 1.0, 10.5]
+    assert client.get(f"/api/v1/products/{outsider}").json()["price"] == 1.0
+
+    unfiltered = client.post(
+        "/api/v1/products/bulk-update",
+        headers=headers,
+        json={"filter": {}, "changes": {"price": "1.00"}},
+    )
+    assert unfiltered.status_code == 400
+
+
+def test_render_label_sheets():
+    """Label sheets stream as PDF or PNG, reusing cached barcode images"""
+    tag = uuid.uuid4().hex[:8]
+    skus = [f"LBL-{tag}-{n}" for n in range(20)]
+    for sku in skus:
+        _add_product(f"Label {sku}", sku=sku)
+    headers = _auth_headers()
+
+    response = client.post("/api/v1/products/labels", headers=headers, json={"skus": skus})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+
+    paths = LabelService.render_barcodes(skus)
+    assert all(os.path.exists(paths[sku]) for sku in skus)
+    assert paths[skus[0]] == barcode_cache_path(skus[0], "code128", get_settings().LABEL_CACHE_DIR)
+
+    png = client.post(
+        "/api/v1/products/labels", headers=headers, json={"skus": skus[:2], "format": "png", "copies": 2}
+    )
+    assert png.content.startswith(b"\x89PNG")
+
+    too_large = client.post(
+        "/api/v1/products/labels", headers=headers, json={"skus": skus, "format": "png", "copies": 4}
+    )
+    assert too_large.status_code == 400
+
+    invalid = client.post(
+        "/api/v1/products/labels", headers=headers, json={"skus": skus[:1], "barcode_format": "ean13"}
+    )
+    assert invalid.status_code == 400
+    assert skus[0] in invalid.json()["detail"]
@@ -0,0 +1,222 @@
+"""Tests for reports"""
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from tests.conftest import TestingSessionLocal, client
+from tests.test_orders import _auth_headers
+from app.core.database import Base
+from app.core.cache import MemoryCache, cached_report, get_report_cache, _MISSING
+from app.models import Order, OrderStatus, SalesDaily
+from app.schemas import OrderUpdate
+from app.services import OrderService, ReportService, SalesRollupService
+from app.services.rollup_service import ROLLUP_FIELDS
+
+
+def _add_order(db, created_at, total, status=OrderStatus.COMPLETED, tax="0", discount="0"):
+    db.add(
+        Order(
+            order_number=f"ORD-TEST-{uuid.uuid4().hex[:10]}",
+            user_id=1,
+            status=status,
+            subtotal=Decimal(total),
+            tax=Decimal(tax),
+            discount=Decimal(discount),
+            total=Decimal(total),
+            created_at=created_at,
+        )
+    )
+
+
+def test_sales_report_groups_in_sql():
+    """Test day, month and year grouping with the status filter on every grouping"""
+    db = TestingSessionLocal()
+    try:
+        _add_order(db, datetime(2001, 3, 1, 9), "10.00", tax="1.00")
+        _add_order(db, datetime(2001, 3, 1, 18), "5.50", discount="0.50")
+        _add_order(db, datetime(2001, 3, 2, 12), "7.00", status=OrderStatus.REFUNDED)
+        _add_order(db, datetime(2001, 4, 9, 12), "3.00")
+        _add_order(db, datetime(2001, 4, 9, 13), "99.00", status=OrderStatus.CANCELLED)
+        _add_order(db, datetime(2001, 4, 10, 8), "50.00", status=OrderStatus.PENDING)
+        db.commit()
+
+        start, end = datetime(2001, 1, 1), datetime(2001, 12, 31, 23, 59)
+
+        by_day = ReportService.get_sales_report(db, start, end, "day")
+        assert [row["date"] for row in by_day] == [date(2001, 3, 1), date(2001, 3, 2), date(2001, 4, 9)]
+        assert by_day[0]["total_orders"] == 2
+        assert by_day[0]["total_sales"] == Decimal("15.50")
+        assert by_day[0]["total_tax"] == Decimal("1.00")
+        assert by_day[0]["total_discount"] == Decimal("0.50")
+
+        by_month = ReportService.get_sales_report(db, start, end, "month")
+        assert [(row["date"], row["total_orders"]) for row in by_month] == [((2001, 3), 3), ((2001, 4), 1)]
+        assert by_month[1]["total_sales"] == Decimal("3.00")
+
+        by_year = ReportService.get_sales_report(db, start, end, "year")
+        assert by_year == [
+            {
+                "date": 2001,
+                "total_orders": 4,
+                "total_sales": Decimal("25.50"),
+                "total_tax": Decimal("1.00"),
+                "total_discount": Decimal("0.50"),
+            }
+        ]
+    finally:
+        db.close()
+
+
+def _rollup_orders(db, created_at, totals, user_id):
+    """Create pending orders through the rollup hooks and return them"""
+    orders = []
+    for total in totals:
+        order = Order(
+            order_number=f"ORD-TEST-{uuid.uuid4().hex[:10]}",
+            user_id=user_id,
+            subtotal=Decimal(total),
+            total=Decimal(total),
+            created_at=created_at,
+        )
+        db.add(order)
+        SalesRollupService.record_order_change(db, None, SalesRollupService.snapshot(order))
+        orders.append(order)
+    db.commit()
+    return orders
+
+
+def test_sales_daily_rollup_tracks_status_changes():
+    """Test the rollup follows completion, refund and cancellation and matches a rebuild"""
+    db = TestingSessionLocal()
+    try:
+        day = datetime(2002, 6, 15, 12)
+        first, second, third = _rollup_orders(db, day, ["10.00", "20.00", "5.00"], user_id=77)
+
+        OrderService.update_order(db, first.id, OrderUpdate(status=OrderStatus.COMPLETED))
+        OrderService.update_order(db, second.id, OrderUpdate(status=OrderStatus.COMPLETED, tax=Decimal("2.00")))
+        OrderService.update_order(db, second.id, OrderUpdate(status=OrderStatus.REFUNDED))
+        OrderService.update_order(db, third.id, OrderUpdate(status=OrderStatus.COMPLETED))
+        OrderService.cancel_order(db, third.id, user_id=77)
+
+        def rollup_row():
+            db.expire_all()
+            row = db.query(SalesDaily).filter(
+                (SalesDaily.sales_date == date(2002, 6, 15)) & (SalesDaily.user_id == 77)
+            ).one()
+            return {field: getattr(row, field) for field in ROLLUP_FIELDS}
+
+        incremental = rollup_row()
+        assert incremental["orders_placed"] == 3
+        assert incremental["completed_orders"] == 1
+        assert incremental["order_count"] == 2
+        assert incremental["total_sales"] == Decimal("32.00")
+        assert incremental["total_tax"] == Decimal("2.00")
+        assert incremental["refunded_orders"] == 1
+        assert incremental["refunded_amount"] == Decimal("22.00")
+
+        SalesRollupService.rebuild(db, date(2002, 6, 15), date(2002, 6, 15))
+        assert rollup_row() == incremental
+
+        report = ReportService.get_sales_report_from_rollup(db, date(2002, 6, 1), date(2002, 6, 30))
+        raw = ReportService.get_sales_report(db, datetime(2002, 6, 1), datetime(2002, 6, 30, 23, 59))
+        assert report == raw
+
+        summary = ReportService.get_daily_summary_from_rollup(db, date(2002, 6, 15))
+        assert summary == ReportService.get_daily_summary(db, date(2002, 6, 15))
+    finally:
+        db.close()
+
+
+def test_rollup_backfills_existing_history_once(tmp_path):
+    """Test an empty rollup is built from orders that predate it, and only then"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'upgrade.db'}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        assert SalesRollupService.backfill(db) == 0
+
+        _add_order(db, datetime(2003, 5, 1, 10), "12.00")
+        _add_order(db, datetime(2003, 5, 2, 10), "8.00")
+        db.commit()
+        assert SalesRollupService.backfill(db) == 2
+        report = ReportService.get_sales_report_from_rollup(db, date(2003, 5, 1), date(2003, 5, 31))
+        assert [row["total_sales"] for row in report] == [Decimal("12.00"), Decimal("8.00")]
+
+        _add_order(db, datetime(2003, 5, 3, 10), "1.00")
+        db.commit()
+        assert SalesRollupService.backfill(db) == 0
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def test_memory_cache_ttl_and_lru():
+    """Test entries expire and the least recently used entry is evicted"""
+    cache = MemoryCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is _MISSING
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+    cache.ttl = -1
+    cache.set("d", 4)
+    assert cache.get("d") is _MISSING
+    assert cache.stats.as_dict()["hits"] == 2
+
+
+def test_report_computed_across_a_write_is_not_cached():
+    """Test a result computed while a write commits is not stored under the new state"""
+    runs = []
+
+    @cached_report("race_probe")
+    def report(db, tag):
+        runs.append(tag)
+        if len(runs) == 1:
+            get_report_cache().invalidate()  # a write commits mid-report
+        return len(runs)
+
+    tag = uuid.uuid4().hex
+    assert report(None, tag) == 1
+    assert report(None, tag) == 2
+    assert report(None, tag) == 2
+    assert len(runs) == 2
+
+
+def test_report_cache_invalidated_by_writes():
+    """Test cached reports are served until an order write commits"""
+    cache = get_report_cache()
+    db = TestingSessionLocal()
+    try:
+        start, end = datetime(2003, 1, 1), datetime(2003, 12, 31)
+        assert ReportService.get_sales_report(db, start, end, "year") == []
+
+        hits = cache.stats.hits
+        assert ReportService.get_sales_report(db, start, end, "year") == []
+        assert cache.stats.hits == hits + 1
+
+        _add_order(db, datetime(2003, 5, 5), "12.00")
+        db.commit()
+
+        report = ReportService.get_sales_report(db, start, end, "year")
+        assert report[0]["total_sales"] == Decimal("12.00")
+    finally:
+        db.close()
+
+
+def test_raw_sales_report_endpoint_hits_cache():
+    """Test repeated rollup=false requests share one cache entry"""
+    headers = _auth_headers()
+    cache = get_report_cache()
+    params = {"days": 7, "rollup": False}
+    assert client.get("/api/v1/reports/sales", headers=headers, params=params).status_code == 200
+
+    hits = cache.stats.hits
+    for _ in range(2):
+        assert client.get("/api/v1/reports/sales", headers=headers, params=params).status_code == 200
+    assert cache.stats.hits == hits + 2